@@ -1,20 +1,38 @@
 import os
 import json
+import time
 import re
-from PyPDF2 import PdfReader
-from docx import Document
+import argparse
 import openai
+import tracing
+from doc_parsing import parse_document, parse_files, PARSE_WORKERS, PARSE_TIMEOUT
+from phrase_matcher import get_matcher
+from llm_cache import LLMCache, make_key
+from manifest import Manifest, config_fingerprint
+from kb_writer import KnowledgeBaseWriter, GroupedEntries, export_json
+from kb_index import KnowledgeIndex
+from sharding import add_shard_arguments, in_shard, shard_dir, shard_dirs, merge_jsonl, iter_sources, walk_order_key
 
 # --- USER CONFIGURATION ---
 PARENT_DIRECTORY = "./"  # Replace with your main folder path
 OUTPUT_DIR = "./extracted_data"          # Where to save results
+MANIFEST_FILE = "ism_data_hunt_manifest.jsonl"  # Per-file hashes + chunks, for incremental reruns
+KB_INDEX_FILE = "ism_knowledge_index.sqlite"    # Full-text index shared with extractorv2, read by script.py
 # Hardcode your API key here for local use. Replace the placeholder with your real key.
 OPENAI_API_KEY = "API_KEY"
+# Relevance gatekeeping: obvious files are settled by local rules, the rest are sent
+# to the LLM this many paths per request (0 = one request per file, the old behaviour).
+RELEVANCE_BATCH_SIZE = 50
 # Use a Gemini model name here. Change if you have a different variant.
 GEMINI_MODEL = "gemini-1.5"
+# Leave unset for the default endpoint, or point at a local stub to run offline.
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")
 
 # Initialize OpenAI client (uses `openai` package's OpenAI client wrapper)
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
+client = openai.OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+
+# Relevance decisions are cached on disk, keyed by model + prompt + parameters.
+LLM_CACHE = LLMCache()
 
 # --- 1. ENHANCED CONTEXT (Loaded from your JSON structure) ---
 # We combine keywords AND the specific semantic phrases for better matching.
@@ -79,24 +97,94 @@ def read_file_content(file_path):
     """Reads content from PDF, DOCX, or TXT."""
     text = ""
     try:
-        if file_path.endswith('.pdf'):
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                t = page.extract_text()
-                if t: text += t + "\n"
-        elif file_path.endswith('.docx'):
-            doc = Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-        elif file_path.endswith('.txt'):
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                text = f.read()
+        text = parse_document(file_path, separator="\n")
     except Exception as e:
         print(f"   [Error] Could not read {file_path}: {e}")
     return text
 
 # --- 3. INTELLIGENT FILTERING ---
 
+# Filenames/folders that are obviously administrative noise or obviously on-topic.
+# Checked against "folder/filename" with _ and - read as spaces, case-insensitively.
+IGNORE_PATTERNS = [
+    r"\bmess\s*menu", r"\bmenu\b", r"\bleave\s*(form|application)", r"\bno\s*dues\b",
+    r"\bfee\s*(receipt|structure|payment)", r"\badmit\s*card\b", r"\breimbursement\b",
+    r"\btime\s*table\b", r"\btender\b", r"\bquotation\b", r"\bhostel\s*allotment\b"
+]
+KEEP_PATTERNS = [
+    r"\bhistor", r"\bcentenary\b", r"\bjubilee\b", r"\bheritage\b", r"\bannual\s*report\b",
+    r"\bconvocation\b", r"\balumni\b", r"\bfounding\b", r"\bfoundation\s*day\b"
+]
+IGNORE_RE = re.compile("|".join(IGNORE_PATTERNS), re.IGNORECASE)
+KEEP_RE = re.compile("|".join(KEEP_PATTERNS), re.IGNORECASE)
+
+
+def rule_check_relevance(filename, folder_name):
+    """
+    Settles obvious cases from the path alone, without any network call.
+    Returns a decision dict, or None if the LLM has to decide.
+    """
+    path = re.sub(r"[_\-]+", " ", f"{folder_name}/{filename}")
+
+    match = IGNORE_RE.search(path)
+    if match:
+        return {"decision": "IGNORE", "reason": f"Rule: administrative ('{match.group(0)}')", "source": "rule"}
+
+    match = KEEP_RE.search(path)
+    if match:
+        return {"decision": "KEEP", "reason": f"Rule: on-topic ('{match.group(0)}')", "source": "rule"}
+
+    tags = get_matcher(SEARCH_CONTEXT['categories']).match(path)
+    if tags:
+        return {"decision": "KEEP", "reason": f"Rule: names '{tags[0]['matched_terms'][0]}'", "source": "rule"}
+
+    return None
+
+
+def response_text(resp):
+    """Extract text output robustly from a Responses API object."""
+    output_text = ""
+    if hasattr(resp, 'output_text') and resp.output_text:
+        output_text = resp.output_text
+    else:
+        # Fallback: inspect `resp.output` which is often a list of content blocks
+        out = getattr(resp, 'output', None)
+        if isinstance(out, list):
+            for block in out:
+                if isinstance(block, dict) and 'content' in block:
+                    for c in block['content']:
+                        # content items sometimes have 'text' keys
+                        text_piece = c.get('text') if isinstance(c, dict) else None
+                        if text_piece:
+                            output_text += text_piece
+        # If still empty, as last resort stringify the response
+        if not output_text:
+            output_text = str(resp)
+    return output_text
+
+
+def create_response(prompt):
+    """
+    One Responses API call, traced as an "llm.request" span carrying the
+    HTTP status, the SDK's retry count and the token usage.
+    """
+    # Use the Responses API with a Gemini model. We instruct the model to output
+    # a JSON string which we then parse. This keeps the call generic and avoids
+    # depending on chat-specific response structures.
+    with tracing.span("llm.request", api="responses", model=GEMINI_MODEL) as span:
+        raw = client.responses.with_raw_response.create(
+            model=GEMINI_MODEL,
+            input=prompt,
+            temperature=0
+        )
+        span.set(status=raw.status_code, retries=getattr(raw, "retries_taken", 0))
+        resp = raw.parse()
+        usage = getattr(resp, "usage", None)
+        span.set(prompt_tokens=getattr(usage, "input_tokens", None),
+                 completion_tokens=getattr(usage, "output_tokens", None))
+    return resp
+
+
 def llm_check_relevance(filename, folder_name, context_summary):
     """
     Decides if a file is relevant based on its Name AND Folder location.
@@ -112,41 +200,95 @@ def llm_check_relevance(filename, folder_name, context_summary):
     Rule: IGNORE generic administrative docs (mess menus, leave forms). KEEP anything historical, academic, or cultural.
     """
     
+    key = make_key(GEMINI_MODEL, prompt, api="responses", temperature=0)
+    cached = LLM_CACHE.get(key)
+    if cached is not None:
+        return json.loads(cached)
+
     try:
-        # Use the Responses API with a Gemini model. We instruct the model to output
-        # a JSON string which we then parse. This keeps the call generic and avoids
-        # depending on chat-specific response structures.
-        resp = client.responses.create(
-            model=GEMINI_MODEL,
-            input=prompt,
-            temperature=0
-        )
+        resp = create_response(prompt)
+        output_text = response_text(resp)
 
-        # Extract text output robustly from the responses object
-        output_text = ""
-        if hasattr(resp, 'output_text') and resp.output_text:
-            output_text = resp.output_text
-        else:
-            # Fallback: inspect `resp.output` which is often a list of content blocks
-            out = getattr(resp, 'output', None)
-            if isinstance(out, list):
-                for block in out:
-                    if isinstance(block, dict) and 'content' in block:
-                        for c in block['content']:
-                            # content items sometimes have 'text' keys
-                            text_piece = c.get('text') if isinstance(c, dict) else None
-                            if text_piece:
-                                output_text += text_piece
-            # If still empty, as last resort stringify the response
-            if not output_text:
-                output_text = str(resp)
-
-        # Parse JSON result returned by the model
-        return json.loads(output_text)
+        # Parse JSON result returned by the model; only parseable answers are cached
+        decision = json.loads(output_text)
+        LLM_CACHE.put(key, output_text)
+        return decision
     except Exception as e:
         print(f"   [LLM Error] llm_check_relevance failed: {e}")
         return {"decision": "KEEP", "reason": "Error safe-guard"}
 
+
+def llm_check_relevance_batch(paths, context_summary):
+    """
+    Decides many files in one request. `paths` is a list of (folder_name, filename).
+    Returns a list parallel to `paths`; items the model skipped or mangled are None.
+    """
+    listing = "\n".join(f"    {i}. {folder}/{name}" for i, (folder, name) in enumerate(paths, 1))
+    prompt = f"""
+    Context: We are mining data for a documentary on the history of IIT (ISM) Dhanbad.
+    
+    File Paths:
+{listing}
+    
+    Target Topics: {context_summary}
+    
+    Task: Return JSON {{ "decisions": [ {{ "id": <number>, "decision": "KEEP" or "IGNORE", "reason": "Short explanation" }} ] }}
+    with exactly one item per numbered file path.
+    Rule: IGNORE generic administrative docs (mess menus, leave forms). KEEP anything historical, academic, or cultural.
+    """
+
+    key = make_key(GEMINI_MODEL, prompt, api="responses", temperature=0)
+    output_text = LLM_CACHE.get(key)
+
+    try:
+        if output_text is None:
+            resp = create_response(prompt)
+            output_text = response_text(resp)
+            items = json.loads(output_text)["decisions"]
+            LLM_CACHE.put(key, output_text)
+        else:
+            items = json.loads(output_text)["decisions"]
+    except Exception as e:
+        print(f"   [LLM Error] llm_check_relevance_batch failed: {e}")
+        return [None] * len(paths)
+
+    decisions = [None] * len(paths)
+    for item in items:
+        try:
+            index = int(item["id"]) - 1
+            verdict = str(item["decision"]).upper()
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < len(paths) and verdict in ("KEEP", "IGNORE"):
+            decisions[index] = {"decision": verdict, "reason": item.get("reason", ""), "source": "batch"}
+    return decisions
+
+
+def decide_relevance(paths, context_summary):
+    """
+    Gatekeeper for a list of (folder_name, filename): local rules first, then
+    batched LLM calls, then one call per file for anything a batch left out.
+    Each decision carries a "source" of "rule", "batch", "single" or "fallback".
+    """
+    decisions = [rule_check_relevance(name, folder) for folder, name in paths]
+    undecided = [i for i, d in enumerate(decisions) if d is None]
+
+    if RELEVANCE_BATCH_SIZE > 0:
+        for start in range(0, len(undecided), RELEVANCE_BATCH_SIZE):
+            batch = undecided[start:start + RELEVANCE_BATCH_SIZE]
+            answers = llm_check_relevance_batch([paths[i] for i in batch], context_summary)
+            for i, answer in zip(batch, answers):
+                decisions[i] = answer
+
+    source = "fallback" if RELEVANCE_BATCH_SIZE > 0 else "single"
+    for i in undecided:
+        if decisions[i] is None:
+            folder, name = paths[i]
+            decisions[i] = dict(llm_check_relevance(name, folder, context_summary), source=source)
+
+    return decisions
+
+
 def extract_oriented_chunks(text, categories):
     """
     Scans text for the specific 'match_phrases'. 
@@ -154,8 +296,8 @@ def extract_oriented_chunks(text, categories):
     """
     extracted_chunks = []
     
-    # Normalize text for easier matching
-    text_lower = text.lower()
+    # One compiled automaton finds every category's phrases in a single pass
+    matcher = get_matcher(categories)
     
     # Split by paragraphs (keeping empty lines as delimiters)
     paragraphs = text.split('\n\n')
@@ -164,17 +306,7 @@ def extract_oriented_chunks(text, categories):
         para_clean = para.strip()
         if len(para_clean) < 30: continue 
 
-        found_categories = []
-        
-        for cat in categories:
-            # Check for any of the specific phrases
-            matches = [phrase for phrase in cat['match_phrases'] if phrase.lower() in para_clean.lower()]
-            
-            if matches:
-                found_categories.append({
-                    "category": cat['category_name'],
-                    "matched_terms": matches
-                })
+        found_categories = matcher.match(para_clean)
         
         if found_categories:
             # OPTIONAL: Grab previous paragraph for context if it exists
@@ -182,6 +314,13 @@ def extract_oriented_chunks(text, categories):
             if i > 0:
                 context_para = paragraphs[i-1].strip() + "\n\n"
             
+            # Shift match offsets so they index into the combined chunk content
+            for tag in found_categories:
+                tag['offsets'] = [
+                    [(start + len(context_para), end + len(context_para)) for start, end in spans]
+                    for spans in tag['offsets']
+                ]
+            
             extracted_chunks.append({
                 "content": context_para + para_clean, # Combining context + hit
                 "tags": found_categories
@@ -191,84 +330,201 @@ def extract_oriented_chunks(text, categories):
 
 # --- 4. MAIN ORCHESTRATOR ---
 
-def main():
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
+def write_reports(jsonl_path, out_dir):
+    """The grouped JSON export and READABLE_REPORT.md, built from the JSONL on disk; returns their paths."""
+    json_path = os.path.join(out_dir, "ism_data_hunt_results.json")
+    md_path = os.path.join(out_dir, "READABLE_REPORT.md")
+    with GroupedEntries(jsonl_path) as grouped:
+        # Format 1: JSON for Code/GenAI
+        export_json(grouped, json_path)
+
+        # Format 2: Markdown Report for Human Reading
+        with open(md_path, 'w', encoding='utf-8') as f:
+            f.write("# IIT (ISM) Dhanbad Data Hunt Report\n\n")
+            for category, items in grouped:
+                f.write(f"## 📂 {category}\n")
+                for item in items:
+                    f.write(f"**Source:** `{item['folder_context']}/{item['source_file']}`\n")
+                    f.write(f"**Keywords:** {', '.join(item['matched_terms'])}\n")
+                    f.write(f"> {item['text_content'].replace(chr(10), ' ')}\n\n") # Replace newlines for blockquote
+                f.write("---\n")
+    return json_path, md_path
+
+def main(shard=None):
+    """
+    Scans every file under PARENT_DIRECTORY, or with `shard` = (i, N) only
+    the folders hashed to shard i, into OUTPUT_DIR/shard-i-of-N/ (see
+    merge_shards()).
+    """
+    out_dir = shard_dir(OUTPUT_DIR, shard) if shard else OUTPUT_DIR
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
         
-    print(f"🚀 Starting Data Hunt in: {PARENT_DIRECTORY}")
+    print(f"🚀 Starting Data Hunt in: {PARENT_DIRECTORY}" + (f" (shard {shard[0]}/{shard[1]})" if shard else ""))
     
     # Prepare summary for LLM
     context_summary = ", ".join([c['category_name'] for c in SEARCH_CONTEXT['categories']])
     
-    final_knowledge_base = {} # Structure: { Category: [ {File, Text} ] }
+    # Files unchanged since the last run are reused from the manifest
+    manifest = Manifest(
+        os.path.join(out_dir, MANIFEST_FILE),
+        config_fingerprint(SEARCH_CONTEXT['categories'], GEMINI_MODEL)
+    )
+    source_keys = [] # Every candidate file, in walk order
+    kept_files = [] # (file_path, file, folder_name, key) that passed the gatekeeper
+
+    candidates = [] # (file_path, file, folder_name, key) still needing a decision
 
-    # OS.WALK for Recursive Directory Scanning
+    # OS.WALK for Recursive Directory Scanning (sorted for a stable output order)
     for root, dirs, files in os.walk(PARENT_DIRECTORY):
+        dirs.sort()
         folder_name = os.path.basename(root)
+        # Shards split by folder, so a folder's files are always processed together
+        if not in_shard(os.path.relpath(root, PARENT_DIRECTORY), shard):
+            continue
         
-        for file in files:
+        for file in sorted(files):
             if not file.endswith(('.pdf', '.docx', '.txt')):
                 continue
                 
             file_path = os.path.join(root, file)
-            print(f"\nScanning: .../{folder_name}/{file}")
-            
-            # A. LLM GATEKEEPER
-            decision = llm_check_relevance(file, folder_name, context_summary)
-            
-            if decision['decision'] == 'IGNORE':
-                print(f"   ❌ Skipped: {decision['reason']}")
-                continue
-            
-            print(f"   ✅ Reading: {decision['reason']}")
-            
-            # B. CONTENT EXTRACTION
-            raw_text = read_file_content(file_path)
-            if not raw_text: continue
-            
-            relevant_chunks = extract_oriented_chunks(raw_text, SEARCH_CONTEXT['categories'])
+            key = os.path.relpath(file_path, PARENT_DIRECTORY)
+            source_keys.append(key)
+            if manifest.lookup(key, file_path) is None:
+                candidates.append((file_path, file, folder_name, key))
+
+    # A. GATEKEEPER (rules → batched LLM → per-file fallback)
+    with tracing.span("relevance", files=len(candidates)):
+        decisions = decide_relevance([(folder_name, file) for _, file, folder_name, _ in candidates], context_summary)
+    decided_by = {} # source -> count, for the summary line
+    decision_source = {} # key -> source, stored in the manifest
+
+    for (file_path, file, folder_name, key), decision in zip(candidates, decisions):
+        decided_by[decision['source']] = decided_by.get(decision['source'], 0) + 1
+        decision_source[key] = decision['source']
+        print(f"\nScanning: .../{folder_name}/{file}  [{decision['source']}]")
+        
+        if decision['decision'] == 'IGNORE':
+            print(f"   ❌ Skipped: {decision['reason']}")
+            manifest.record(key, file_path, [], decision="IGNORE", decided_by=decision['source'])
+            continue
+        
+        print(f"   ✅ Reading: {decision['reason']}")
+        kept_files.append((file_path, file, folder_name, key))
+
+    if decided_by:
+        print("\n🧭 Decisions by source: " + ", ".join(f"{k}={v}" for k, v in sorted(decided_by.items())))
+
+    manifest.forget_missing(source_keys)
+    print(f"\n♻️ {len(source_keys) - len(kept_files)} files reused or skipped, {len(kept_files)} to read.")
+
+    # B. CONTENT EXTRACTION (fanned out across processes, results in walk order)
+    print(f"\n📚 Parsing {len(kept_files)} files with {PARSE_WORKERS} workers...")
+    parse_start = time.perf_counter()
+    parsed = parse_files([path for path, _, _, _ in kept_files], separator="\n",
+                         workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT)
+    kept_keys = {key for _, _, _, key in kept_files}
+
+    # Entries stream to JSONL in walk order: reused files straight from the
+    # manifest, kept files as soon as their parse result arrives
+    jsonl_path = os.path.join(out_dir, "ism_data_hunt_results.jsonl")
+    with KnowledgeBaseWriter(jsonl_path) as writer, \
+            KnowledgeIndex(os.path.join(out_dir, KB_INDEX_FILE)) as index:
+        kept = iter(kept_files)
+
+        for rank, key in enumerate(source_keys):
+            if key in kept_keys:
+                file_path, file, folder_name, _ = next(kept)
+                result = next(parsed)
+                if result.error:
+                    # Not recorded, so the file is retried on the next run
+                    print(f"   [Error] Could not read {file_path}: {result.error} ({result.seconds:.2f}s)")
+                    continue
+                print(f"\nParsed: .../{folder_name}/{file} in {result.seconds:.2f}s")
+                
+                entries = []
+                raw_text = result.text
+                with tracing.span("match", path=key) as span:
+                    relevant_chunks = extract_oriented_chunks(raw_text, SEARCH_CONTEXT['categories']) if raw_text else []
+                    span.set(chunks=len(relevant_chunks))
             
-            if relevant_chunks:
-                print(f"   Found {len(relevant_chunks)} relevant sections.")
+                if relevant_chunks:
+                    print(f"   Found {len(relevant_chunks)} relevant sections.")
                 
-                # C. ORGANIZE DATA
-                for chunk in relevant_chunks:
-                    for tag in chunk['tags']:
-                        cat_name = tag['category']
-                        if cat_name not in final_knowledge_base:
-                            final_knowledge_base[cat_name] = []
-                        
-                        final_knowledge_base[cat_name].append({
-                            "source_file": file,
-                            "folder_context": folder_name,
-                            "matched_terms": tag['matched_terms'],
-                            "text_content": chunk['content']
-                        })
-            else:
-                print("   (No specific phrases found in text)")
+                    # C. ORGANIZE DATA
+                    for chunk in relevant_chunks:
+                        for tag in chunk['tags']:
+                            entries.append([tag['category'], {
+                                "source_file": file,
+                                "folder_context": folder_name,
+                                "matched_terms": tag['matched_terms'],
+                                "text_content": chunk['content']
+                            }])
+                elif raw_text:
+                    print("   (No specific phrases found in text)")
+
+                # Persisted immediately, so a crashed run resumes after this file
+                manifest.record(key, file_path, entries, decision="KEEP", decided_by=decision_source[key])
+
+            entries = manifest.entries(key)
+            for cat_name, entry in entries:
+                writer.add(cat_name, entry, source=key)
+            index.sync_source("website", key, entries, rank)
+        index.retain_sources("website", source_keys)
+
+    manifest.compact()
+    manifest.close()
+    print(f"\n⏱ Parsing stage took {time.perf_counter() - parse_start:.1f}s")
 
     # --- 5. SAVE OUTPUTS ---
-    
-    # Format 1: JSON for Code/GenAI
-    json_path = os.path.join(OUTPUT_DIR, "ism_data_hunt_results.json")
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(final_knowledge_base, f, indent=2)
-        
-    # Format 2: Markdown Report for Human Reading
-    md_path = os.path.join(OUTPUT_DIR, "READABLE_REPORT.md")
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write("# IIT (ISM) Dhanbad Data Hunt Report\n\n")
-        for category, items in final_knowledge_base.items():
-            f.write(f"## 📂 {category}\n")
-            for item in items:
-                f.write(f"**Source:** `{item['folder_context']}/{item['source_file']}`\n")
-                f.write(f"**Keywords:** {', '.join(item['matched_terms'])}\n")
-                f.write(f"> {item['text_content'].replace(chr(10), ' ')}\n\n") # Replace newlines for blockquote
-            f.write("---\n")
+    # Grouped by category on disk, so the full knowledge base is never held in memory
+    write_start = time.perf_counter()
+    json_path, md_path = write_reports(jsonl_path, out_dir)
+    tracing.add_span("write", time.perf_counter() - write_start, entries=writer.count)
 
     print(f"\n🎉 Extraction Complete!")
+    print(f"0. Streamed Entries: {jsonl_path} ({writer.count} entries)")
+    print(f"1. Machine Data: {json_path}")
+    print(f"2. Readable Report: {md_path}")
+    print(f"3. Full-text Index: {index.path} ({index.synced} files updated, {index.unchanged} unchanged)")
+    print(LLM_CACHE.summary())
+    tracing.finish()
+
+def merge_shards(count):
+    """
+    Combines the outputs of `--shard i/N` runs under OUTPUT_DIR into the
+    same JSONL, JSON, Markdown and index a single run writes: files in
+    walk order, each folder taken from one shard only.
+    """
+    dirs = shard_dirs(OUTPUT_DIR, count)
+    print(f"🧩 Merging {count} shards into {OUTPUT_DIR}")
+
+    jsonl_path = os.path.join(OUTPUT_DIR, "ism_data_hunt_results.jsonl")
+    with tracing.span("merge", shards=count):
+        entries, duplicates = merge_jsonl([os.path.join(d, "ism_data_hunt_results.jsonl") for d in dirs],
+                                          jsonl_path, walk_order_key)
+
+    write_start = time.perf_counter()
+    json_path, md_path = write_reports(jsonl_path, OUTPUT_DIR)
+    tracing.add_span("write", time.perf_counter() - write_start, entries=entries)
+
+    with KnowledgeIndex(os.path.join(OUTPUT_DIR, KB_INDEX_FILE)) as index:
+        keys = []
+        for rank, (key, key_entries) in enumerate(iter_sources(jsonl_path)):
+            index.sync_source("website", key, key_entries, rank)
+            keys.append(key)
+        index.retain_sources("website", keys)
+
+    print(f"0. Streamed Entries: {jsonl_path} ({entries} entries, {duplicates} duplicates dropped)")
     print(f"1. Machine Data: {json_path}")
     print(f"2. Readable Report: {md_path}")
+    print(f"3. Full-text Index: {index.path} ({index.synced} files updated, {index.unchanged} unchanged)")
+    tracing.finish()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Hunt IIT (ISM) knowledge in crawled PDF/DOCX/TXT files")
+    args = add_shard_arguments(parser).parse_args()
+    if args.merge is not None:
+        merge_shards(args.merge)
+    else:
+        main(args.shard)
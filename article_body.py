@@ -0,0 +1,64 @@
+from collections import namedtuple
+
+# --- CONFIGURATION ---
+MAX_LINK_DENSITY = 0.5            # Paragraphs with more of their text in links are never body text
+MIN_BODY_CHARS = 600              # Bodies shorter than this lower the confidence proportionally
+EDGE_SHARE = 0.1                  # First/last share of the page, where menus and footers live
+EDGE_WEIGHT = 0.7                 # Score multiplier for paragraphs in those edges
+
+ArticleBody = namedtuple("ArticleBody", ["paragraphs", "confidence", "container"])
+
+
+def paragraph_score(block, position):
+    """
+    Readability-style content score of one ParagraphBlock at relative
+    `position` (0 = first <p> of the page, 1 = last): text length and
+    commas count for it, link text and a place near the page edges
+    against it.
+    """
+    chars = len(block.text)
+    if not chars:
+        return 0.0
+    link_density = min(1.0, block.link_chars / chars)
+    score = (1 + block.text.count(",") + min(chars / 100, 3)) * (1 - link_density)
+    if position < EDGE_SHARE or position > 1 - EDGE_SHARE:
+        score *= EDGE_WEIGHT
+    return score
+
+
+def extract_body(blocks):
+    """
+    Picks the article body among a page's ParagraphBlocks: paragraphs are
+    scored, scores are summed per container (ancestor path) and the best
+    container's paragraphs below MAX_LINK_DENSITY are the body, in page
+    order.
+
+    The confidence (0–1) is the best container's share of all paragraph
+    score, scaled down for bodies under MIN_BODY_CHARS and for link-heavy
+    bodies: a page whose text sits in one dominant, plain-text container
+    scores close to 1.
+    """
+    if not blocks:
+        return ArticleBody([], 0.0, None)
+
+    last = max(1, len(blocks) - 1)
+    scores = [paragraph_score(block, i / last) for i, block in enumerate(blocks)]
+    totals = {}
+    for block, score in zip(blocks, scores):
+        totals[block.container] = totals.get(block.container, 0.0) + score
+
+    total = sum(totals.values())
+    if total <= 0:
+        return ArticleBody([], 0.0, None)
+    container = max(totals, key=totals.get)
+
+    body = [block for block in blocks
+            if block.container == container and block.text
+            and block.link_chars / len(block.text) < MAX_LINK_DENSITY]
+    chars = sum(len(block.text) for block in body)
+    if not chars:
+        return ArticleBody([], 0.0, container)
+
+    link_density = min(1.0, sum(block.link_chars for block in body) / chars)
+    confidence = (totals[container] / total) * min(1.0, chars / MIN_BODY_CHARS) * (1 - link_density)
+    return ArticleBody([block.text for block in body], round(confidence, 4), container)
@@ -1,28 +1,358 @@
+import os
+import re
+import time
+import queue
+import threading
 import requests
+import tracing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from llm_cache import make_key
+from mp3_frames import Mp3Concatenator
+from sentences import split_sentences
 
+ELEVEN_API_KEY = "Enter_Your_ElevenLabs_API_Key_Here"
+# Point this at a local stub to run offline
+ELEVEN_API_URL = os.environ.get("ELEVEN_API_URL", "https://api.elevenlabs.io/v1/text-to-speech")
+VOICE_ID = "EXAVITQu4vr4xnSDxMaL"
+ELEVEN_MODEL = "eleven_multilingual_v2"
+VOICE_SETTINGS = {"stability": 0.20, "similarity_boost": 0.75}
 
+# --- USER CONFIGURATION ---
+SCRIPT_FILE = "FINAL_2_MIN_VIDEO_SCRIPT.txt"   # Written by script.py
+OUTPUT_FILE = "narration.mp3"
+TTS_CONCURRENCY = 4               # Chunks synthesized in parallel
+MAX_CHUNK_CHARS = 800             # Sections longer than this are split between sentences
+TTS_CACHE_DIR = os.path.join(".cache", "tts")   # One MP3 per (chunk text, voice settings)
+STREAM_QUEUE_SIZE = 8             # Sentences waiting for synthesis before the producer is held back
 
-# Read the actual text from your file
-with open("final_script.txt", "r") as file:
-    script_text = file.read()
+SESSION = requests.Session()
 
-url = "https://api.elevenlabs.io/v1/text-to-speech/EXAVITQu4vr4xnSDxMaL"
 
-data = {
-    "text": script_text,
-    "model": "eleven_multilingual_v2",
-    "voice_settings": {"stability": 0.20, "similarity_boost": 0.75}
-}
+# ----------------------------------------------------
+# CHUNKING
+# ----------------------------------------------------
 
-headers = {
-    "xi-api-key": ELEVEN_API_KEY,
-    "Accept": "audio/mpeg"
-}
+def is_narrated(line):
+    """False for script lines that are layout, not narration: headings, the title and --- rules."""
+    line = line.strip()
+    return bool(line) and not line.startswith(("**", "🎬")) and line.strip("-") != ""
 
-response = requests.post(url, json=data, headers=headers)
 
-# Save result audio
-with open("narration.mp3", "wb") as f:
-    f.write(response.content)
+def narration_text(script_text):
+    """The script without its heading, title and rule lines, sections still blank-line separated."""
+    return "\n".join(line for line in script_text.splitlines() if not line.strip() or is_narrated(line))
 
-print("Audio saved as narration.mp3")
\ No newline at end of file
+
+def chunk_script(script_text, max_chars=MAX_CHUNK_CHARS):
+    """
+    Splits the script into synthesis chunks: one per section (blank-line
+    separated block), with long sections packed sentence by sentence into
+    chunks of at most `max_chars`. Editing a paragraph therefore only
+    changes the chunk(s) of that paragraph.
+    """
+    chunks = []
+    for section in re.split(r"\n\s*\n", narration_text(script_text)):
+        section = section.strip()
+        if not section:
+            continue
+        if len(section) <= max_chars:
+            chunks.append(section)
+            continue
+
+        current = ""
+        for sentence in split_sentences(section):
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+# ----------------------------------------------------
+# SYNTHESIS
+# ----------------------------------------------------
+
+def chunk_cache_path(text):
+    key = make_key(ELEVEN_MODEL, text, voice_id=VOICE_ID, voice_settings=VOICE_SETTINGS)
+    return os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+
+
+def synthesize_chunk(text):
+    """
+    Returns the path of the chunk's MP3 in the cache, synthesizing it first
+    if needed. The response is streamed to a temporary file as it arrives
+    and only renamed into the cache once complete.
+    """
+    path = chunk_cache_path(text)
+    if os.path.exists(path):
+        return path
+
+    data = {
+        "text": text,
+        "model": ELEVEN_MODEL,
+        "voice_settings": VOICE_SETTINGS
+    }
+
+    headers = {
+        "xi-api-key": ELEVEN_API_KEY,
+        "Accept": "audio/mpeg"
+    }
+
+    os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+    try:
+        with tracing.span("tts.request", model=ELEVEN_MODEL, chars=len(text)) as span, \
+                SESSION.post(f"{ELEVEN_API_URL}/{VOICE_ID}/stream", json=data, headers=headers, stream=True) as response:
+            span.set(status=response.status_code, retries=tracing.http_retries(response))
+            response.raise_for_status()
+            size = 0
+            with open(tmp_path, "wb") as f:
+                for block in response.iter_content(chunk_size=16 * 1024):
+                    f.write(block)
+                    size += len(block)
+            span.set(bytes=size)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def synthesize_script(chunks, out_path, concurrency=TTS_CONCURRENCY):
+    """
+    Synthesizes the chunks concurrently (at most `concurrency` requests in
+    flight) and appends their MP3 frames to `out_path` in script order as
+    soon as each one and all chunks before it are ready. Returns how many
+    chunks were synthesized and how many came from the cache.
+    """
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, concurrency))
+    SESSION.mount("https://", adapter)
+    SESSION.mount("http://", adapter)
+
+    paths = {}
+    cached = sum(1 for text in set(chunks) if os.path.exists(chunk_cache_path(text)))
+
+    with Mp3Concatenator(out_path) as out, ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        # Identical chunks (repeated lines) are synthesized once
+        futures = {pool.submit(synthesize_chunk, text): text for text in dict.fromkeys(chunks)}
+        next_chunk = 0
+        for future in as_completed(futures):
+            paths[futures[future]] = future.result()
+            while next_chunk < len(chunks) and chunks[next_chunk] in paths:
+                out.append_file(paths[chunks[next_chunk]])
+                next_chunk += 1
+
+    return len(futures) - cached, cached
+
+
+# ----------------------------------------------------
+# STREAMING (script.py → TTS)
+# ----------------------------------------------------
+
+class NarrationCancelled(Exception):
+    pass
+
+
+class StreamingNarrator:
+    """
+    Consumer end of the script → speech stream.
+
+    put() hands over one finished sentence; sentences wait in a bounded
+    queue (put() blocks while it is full, holding the producer back) and
+    are synthesized by `concurrency` workers. Their frames are appended to
+    `out_path` in sentence order and flushed at once, so the partial file
+    is playable from the first sentence on. cancel() stops the workers,
+    drops queued sentences and removes the partial output.
+    """
+
+    def __init__(self, out_path, concurrency=TTS_CONCURRENCY, max_pending=STREAM_QUEUE_SIZE):
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, concurrency))
+        SESSION.mount("https://", adapter)
+        SESSION.mount("http://", adapter)
+
+        self.started = time.perf_counter()
+        self.first_audio_seconds = None
+        self.sentences = 0
+        self.cancelled = threading.Event()
+
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._out = Mp3Concatenator(out_path)
+        self._ready = {}
+        self._next = 0
+        self._lock = threading.Lock()
+        self._error = None
+        self._workers = [threading.Thread(target=self._work, name=f"tts-{i}", daemon=True)
+                         for i in range(max(1, concurrency))]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def partial_path(self):
+        return self._out.partial_path
+
+    def put(self, sentence):
+        """Queues one sentence for synthesis; blocks while the queue is full."""
+        if self._error is not None:
+            raise self._error
+        item = (self.sentences, sentence)
+        self.sentences += 1
+        while True:
+            if self.cancelled.is_set():
+                raise NarrationCancelled()
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _work(self):
+        while not self.cancelled.is_set():
+            try:
+                item = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            index, sentence = item
+            try:
+                path = synthesize_chunk(sentence)
+                with self._lock:
+                    self._ready[index] = path
+                    while self._next in self._ready:
+                        self._out.append_file(self._ready.pop(self._next))
+                        self._out.flush()
+                        self._next += 1
+                        if self.first_audio_seconds is None:
+                            self.first_audio_seconds = time.perf_counter() - self.started
+            except Exception as e:
+                self._error = e
+                self.cancelled.set()
+
+    def close(self):
+        """Waits for every queued sentence, then moves the MP3 into place."""
+        for _ in self._workers:
+            self._put_stop()
+        for worker in self._workers:
+            worker.join()
+        if self._error is not None:
+            self._out.__exit__(type(self._error), self._error, None)
+            raise self._error
+        if self.cancelled.is_set():
+            self._out.__exit__(NarrationCancelled, None, None)
+            raise NarrationCancelled()
+        self._out.close()
+
+    def cancel(self):
+        """Stops synthesis now; queued sentences are dropped and no output is kept."""
+        self.cancelled.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        for worker in self._workers:
+            worker.join()
+        self._out.__exit__(NarrationCancelled, None, None)
+
+    def _put_stop(self):
+        while not self.cancelled.is_set():
+            try:
+                self._queue.put(None, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.cancel()
+
+
+class SentenceFeeder:
+    """
+    Turns streamed script text into whole narrated sentences for a
+    StreamingNarrator, skipping headings and rules.
+
+    The producer reports each new section with section_start(); rollback()
+    means the current section is being regenerated. Sentences the new
+    attempt repeats word for word were already spoken and are skipped. From
+    the first sentence that differs on, the new attempt is narrated; the
+    sentences already spoken cannot be taken back, so that divergence from
+    the final script is reported.
+    """
+
+    def __init__(self, narrator):
+        self.narrator = narrator
+        self._buffer = ""
+        self._spoken = []     # Sentences of the current section sent to the narrator
+        self._seen = 0        # Sentences of the current attempt so far
+        self._section = 0
+
+    def text(self, text):
+        self._buffer += text
+        lines = self._buffer.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            for sentence in split_sentences(line):
+                self._sentence(sentence)
+        # The last sentence of the unfinished line may still be growing
+        sentences = split_sentences(pending)
+        for sentence in sentences[:-1]:
+            self._sentence(sentence)
+        self._buffer = pending[pending.rindex(sentences[-1]):] if sentences else pending
+
+    def _sentence(self, sentence):
+        if not is_narrated(sentence):
+            return
+        sentence = sentence.strip()
+        if self._seen < len(self._spoken):
+            if sentence == self._spoken[self._seen]:
+                self._seen += 1
+                return
+            print(f"⚠️ Section {self._section}: the retry differs from the narration from sentence "
+                  f"{self._seen + 1} on; {len(self._spoken) - self._seen} sentence(s) already spoken "
+                  f"stay in {self.narrator.partial_path}")
+            del self._spoken[self._seen:]
+        self.narrator.put(sentence)
+        self._spoken.append(sentence)
+        self._seen += 1
+
+    def rollback(self):
+        self._buffer = ""
+        self._seen = 0
+
+    def section_start(self):
+        self.flush()
+        self._spoken = []
+        self._seen = 0
+        self._section += 1
+
+    def flush(self):
+        for sentence in split_sentences(self._buffer):
+            self._sentence(sentence)
+        self._buffer = ""
+
+
+def main():
+    # Read the actual text from your file (with STREAM_NARRATION, script.py narrates while it writes)
+    with open(SCRIPT_FILE, "r", encoding="utf-8") as file:
+        script_text = file.read()
+
+    chunks = chunk_script(script_text)
+    synthesized, cached = synthesize_script(chunks, OUTPUT_FILE)
+
+    print(f"🔊 {len(chunks)} chunks: {synthesized} synthesized, {cached} reused from {TTS_CACHE_DIR}")
+    print(f"Audio saved as {OUTPUT_FILE}")
+    tracing.finish()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: BeautifulSoup full-tree paragraph extraction vs. the streaming html_paragraphs extractor.
+
+Runs both over the checked-in index.html and a synthetic corpus of large,
+script-heavy pages. Each strategy runs in a fresh child process so its peak
+RSS can be read from the kernel; both must return identical paragraph lists.
+
+    python benchmarks/bench_html_paragraphs.py [--pages 200] [--repeat 20]
+"""
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FILLER = "the institute campus students research mining heritage department city news report jubilee".split()
+
+
+def make_page(rng):
+    """~200 KB page: inline scripts and styles, nested layout divs, navigation and paragraphs."""
+    parts = ["<!DOCTYPE html><html><head><title>News</title>"]
+    parts.append("<style>" + "".join(f".c{i}{{margin:{i}px}}" for i in range(800)) + "</style>")
+    parts.append("<script>var cfg = " + json.dumps({f"k{i}": "<p>not text</p>" * 3 for i in range(600)}) + ";</script>")
+    parts.append("</head><body><nav><ul>" + "".join(f"<li><a href='/s{i}'>Section {i}</a></li>" for i in range(80)) + "</ul></nav>")
+    for _ in range(rng.randint(40, 80)):
+        words = " ".join(rng.choice(FILLER) for _ in range(rng.randint(15, 90)))
+        parts.append(f"<div class='c{rng.randrange(800)}'><div><p>{words.capitalize()} <b>bold</b> &amp; <a href='#'>link</a>.")
+        if rng.random() < 0.3:
+            parts.append("<script>track('view')</script><noscript><p>enable js</p></noscript>")
+        parts.append("</div></div>" if rng.random() < 0.5 else "</p></div></div>")
+    parts.append("<footer><p>Copyright</p></footer></body></html>")
+    return "".join(parts)
+
+
+def make_corpus(root, pages, rng):
+    paths = []
+    for i in range(pages):
+        path = os.path.join(root, f"{i:05d}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_page(rng))
+        paths.append(path)
+    return paths
+
+
+def bs4_paragraphs(file_path):
+    """The original read_html_file extraction."""
+    from bs4 import BeautifulSoup
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        soup = BeautifulSoup(f.read(), "lxml")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.extract()
+    return [p.get_text(" ", strip=True) for p in soup.find_all("p")]
+
+
+def worker(method, list_path):
+    """Child-process entry point: extracts every listed file, prints elapsed time and a result digest."""
+    from html_paragraphs import extract_paragraphs
+    extract = bs4_paragraphs if method == "bs4" else extract_paragraphs
+
+    with open(list_path, encoding="utf-8") as f:
+        paths = f.read().splitlines()
+
+    digest = hashlib.sha256()
+    start = time.perf_counter()
+    for path in paths:
+        for paragraph in extract(path):
+            digest.update(paragraph.encode("utf-8") + b"\0")
+    print(json.dumps({"seconds": time.perf_counter() - start, "digest": digest.hexdigest()}))
+
+
+def measure(method, paths, tmp_dir):
+    list_path = os.path.join(tmp_dir, "files.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(paths))
+
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--worker", method, list_path],
+                            stdout=subprocess.PIPE, text=True)
+    out = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        raise SystemExit(f"{method} worker failed with exit code {proc.returncode}")
+
+    result = json.loads(out)
+    result["peak_rss_mb"] = usage.ru_maxrss / 1024   # ru_maxrss is in KiB on Linux
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200, help="synthetic pages to generate")
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the checked-in index.html")
+    parser.add_argument("--worker", nargs=2, metavar=("METHOD", "LIST"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(*args.worker)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpora = {
+            "index.html": [os.path.join(ROOT, "index.html")] * args.repeat,
+            "synthetic": make_corpus(tmp_dir, args.pages, random.Random(42)),
+        }
+
+        print(f"{'corpus':>11} {'method':>7} {'pages':>6} {'pages/s':>9} {'MB/s':>7} {'peak RSS MB':>12}")
+        for name, paths in corpora.items():
+            size_mb = sum(os.path.getsize(p) for p in paths) / 1e6
+            results = {}
+            for method in ("bs4", "stream"):
+                r = results[method] = measure(method, paths, tmp_dir)
+                print(f"{name:>11} {method:>7} {len(paths):>6} {len(paths) / r['seconds']:>9.1f} "
+                      f"{size_mb / r['seconds']:>7.1f} {r['peak_rss_mb']:>12.1f}")
+            assert results["bs4"]["digest"] == results["stream"]["digest"], f"paragraph lists differ on {name}"
+            print(f"{'':>11} speedup {results['bs4']['seconds'] / results['stream']['seconds']:.1f}x, identical output")
+
+
+if __name__ == "__main__":
+    main()
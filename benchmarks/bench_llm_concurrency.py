@@ -0,0 +1,97 @@
+"""
+Benchmark: extractorv2.main throughput vs. LLM concurrency.
+
+Generates a synthetic crawl of NNNNN_www_site_com/index.html folders, points
+llm_clean_article at the local fake chat-completions server (with a fixed
+per-request latency) and runs the extractor at several concurrency limits.
+The cache is disabled per run so every page costs one round-trip, and the
+resulting ism_news_extracted.json must be byte-identical across runs.
+
+    python benchmarks/bench_llm_concurrency.py [--pages 40] [--latency 0.25]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import hashlib
+import argparse
+import tempfile
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_llm_server import start_server  # noqa: E402
+
+PHRASES = ["Golden Jubilee", "Penman Auditorium", "Lord Irwin", "NVCTI", "Srijan", "Diamond Hostel"]
+FILLER = "the institute campus students research mining heritage department city news report".split()
+
+
+def make_corpus(root, pages, rng):
+    for i in range(pages):
+        folder = os.path.join(root, f"{i:05d}_www_site{i % 7}_com")
+        os.makedirs(folder)
+        paragraphs = []
+        for _ in range(rng.randint(4, 12)):
+            words = [rng.choice(FILLER) for _ in range(rng.randint(12, 40))]
+            if rng.random() < 0.5:
+                words.insert(rng.randrange(len(words)), rng.choice(PHRASES))
+            paragraphs.append(f"<p>{' '.join(words).capitalize()}.</p>")
+        with open(os.path.join(folder, "index.html"), "w", encoding="utf-8") as f:
+            f.write(f"<html><body><nav>menu</nav>{''.join(paragraphs)}<script>x()</script></body></html>")
+
+
+def run(extractorv2, corpus, out_dir, concurrency):
+    extractorv2.PARENT_DIRECTORY = corpus
+    extractorv2.OUTPUT_DIR = out_dir
+    extractorv2.LLM_CONCURRENCY = concurrency
+    extractorv2.LLM_CACHE = extractorv2.LLMCache(cache_dir=os.path.join(out_dir, "cache"))
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractorv2.main()
+    elapsed = time.perf_counter() - start
+
+    with open(os.path.join(out_dir, "ism_news_extracted.json"), "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return elapsed, digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.25, help="fake server seconds per request")
+    parser.add_argument("--concurrency", default="1,4,8,16")
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency)
+    os.environ["GROQ_API_URL"] = f"{base_url}/chat/completions"
+    import extractorv2
+
+    # Benchmark the concurrency, not Groq's free-tier limits
+    extractorv2.LLM_REQUESTS_PER_MINUTE = 100000
+    extractorv2.LLM_TOKENS_PER_MINUTE = 100000000
+
+    work = tempfile.mkdtemp(prefix="bench_llm_")
+    try:
+        corpus = os.path.join(work, "corpus")
+        make_corpus(corpus, args.pages, random.Random(7))
+
+        print(f"{'concurrency':>11} {'seconds':>8} {'pages/s':>8} {'requests':>9}  output")
+        baseline = None
+        for concurrency in [int(c) for c in args.concurrency.split(",")]:
+            before = server.request_count
+            elapsed, digest = run(extractorv2, corpus, os.path.join(work, f"out{concurrency}"), concurrency)
+            baseline = baseline or digest
+            same = "identical" if digest == baseline else "DIFFERS"
+            print(f"{concurrency:>11} {elapsed:>8.2f} {args.pages / elapsed:>8.1f} "
+                  f"{server.request_count - before:>9}  {same}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
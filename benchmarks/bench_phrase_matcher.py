@@ -0,0 +1,92 @@
+"""
+Benchmark: per-phrase substring checks vs. the compiled PhraseMatcher.
+
+Builds synthetic category sets of growing size on top of the real
+SEARCH_CONTEXT phrases and times both strategies over the same paragraphs.
+
+    python benchmarks/bench_phrase_matcher.py [--paragraphs 2000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phrase_matcher import PhraseMatcher  # noqa: E402
+from script import SEARCH_CONTEXT  # noqa: E402
+
+VOCAB = (
+    "institute mines dhanbad campus hostel heritage jubilee research department "
+    "students alumni festival engineering geology petroleum mining safety coal "
+    "lecture theatre observatory garden auditorium award director centenary"
+).split()
+
+
+def naive_match(text, categories):
+    """The original per-category, per-phrase lowercase substring scan."""
+    found = []
+    for cat in categories:
+        matches = [p for p in cat["match_phrases"] if p.lower() in text.lower()]
+        if matches:
+            found.append({"category": cat["category_name"], "matched_terms": matches})
+    return found
+
+
+def make_categories(n_phrases, rng):
+    categories = [dict(c, match_phrases=list(c["match_phrases"])) for c in SEARCH_CONTEXT["categories"]]
+    i = 0
+    while sum(len(c["match_phrases"]) for c in categories) < n_phrases:
+        phrase = " ".join(rng.choice(VOCAB) for _ in range(rng.randint(2, 4))) + f" {i}"
+        categories[i % len(categories)]["match_phrases"].append(phrase)
+        i += 1
+    return categories
+
+
+def make_paragraphs(count, rng):
+    real = [p for c in SEARCH_CONTEXT["categories"] for p in c["match_phrases"]]
+    paragraphs = []
+    for _ in range(count):
+        words = [rng.choice(VOCAB) for _ in range(rng.randint(60, 160))]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(real))
+        paragraphs.append(" ".join(words).capitalize() + ".")
+    return paragraphs
+
+
+def timed(fn, paragraphs):
+    start = time.perf_counter()
+    results = [fn(p) for p in paragraphs]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--sizes", default="62,250,1000,4000")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    paragraphs = make_paragraphs(args.paragraphs, rng)
+
+    print(f"{'phrases':>8} {'naive s':>9} {'automaton s':>12} {'compile s':>10} {'speedup':>8}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        categories = make_categories(size, rng)
+
+        start = time.perf_counter()
+        matcher = PhraseMatcher(categories)
+        compile_time = time.perf_counter() - start
+
+        naive_time, naive_results = timed(lambda p: naive_match(p, categories), paragraphs)
+        fast_time, fast_results = timed(matcher.match, paragraphs)
+
+        stripped = [[{k: v for k, v in tag.items() if k != "offsets"} for tag in tags] for tags in fast_results]
+        assert stripped == naive_results, "automaton and naive scan disagree"
+
+        total = sum(len(c["match_phrases"]) for c in categories)
+        print(f"{total:>8} {naive_time:>9.3f} {fast_time:>12.3f} {compile_time:>10.3f} {naive_time / fast_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: peak memory and time of script.extract_clean_data on fully loaded vs. streamed inputs.
+
+Writes a website text of mostly irrelevant paragraphs and a news export in
+the extractors' `{category: [entry, ...]}` format, then runs the matcher
+once on read()/json.load() inputs and once on iter_lines()/iter_news().
+Peak memory is measured with tracemalloc.
+
+    python benchmarks/bench_script_inputs.py [--paragraphs 300000] [--news 50000] [--relevant 0.02]
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import script  # noqa: E402
+
+FILLER = ("the institute campus students research mining heritage department city news report "
+          "faculty alumni building festival engineering laboratory library hostel award").split()
+
+
+def paragraph(rng, phrases, relevant):
+    words = [rng.choice(FILLER) for _ in range(rng.randint(30, 80))]
+    if relevant:
+        words.insert(rng.randrange(len(words)), rng.choice(phrases))
+    return " ".join(words).capitalize() + "."
+
+
+def write_inputs(work, paragraphs, news, relevant, rng):
+    phrases = [p for c in script.SEARCH_CONTEXT["categories"] for p in c["match_phrases"]]
+    categories = [c["category_name"] for c in script.SEARCH_CONTEXT["categories"]]
+
+    txt_path = os.path.join(work, "website_extracted_data.txt")
+    with open(txt_path, "w", encoding="utf-8") as f:
+        for _ in range(paragraphs):
+            f.write(paragraph(rng, phrases, rng.random() < relevant) + "\n")
+
+    grouped = {cat: [] for cat in categories}
+    for i in range(news):
+        grouped[rng.choice(categories)].append({"source_file": f"news/{i:06d}/index.html",
+                                                "matched_terms": [rng.choice(phrases)],
+                                                "text_content": paragraph(rng, phrases, True)})
+    json_path = os.path.join(work, "ism_news_extracted.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(grouped, f, indent=2)
+    return txt_path, json_path
+
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, sum(len(v) for v in out.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=300000)
+    parser.add_argument("--news", type=int, default=50000)
+    parser.add_argument("--relevant", type=float, default=0.02, help="Share of website paragraphs that match")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="bench_script_inputs_")
+    try:
+        txt_path, json_path = write_inputs(work, args.paragraphs, args.news, args.relevant, random.Random(42))
+        size = (os.path.getsize(txt_path) + os.path.getsize(json_path)) / 1e6
+        categories = script.SEARCH_CONTEXT["categories"]
+
+        def loaded():
+            with open(txt_path, "r", encoding="utf-8") as f:
+                text = f.read()
+            with open(json_path, "r", encoding="utf-8") as f:
+                news = json.load(f)
+            return script.extract_clean_data(text, news, categories)
+
+        def streamed():
+            return script.extract_clean_data(script.iter_lines(txt_path), script.iter_news(json_path), categories)
+
+        print(f"Inputs: {size:.1f} MB")
+        print(f"{'inputs':>10} {'seconds':>9} {'peak MB':>9} {'kept':>7}")
+        for name, run in (("loaded", loaded), ("streamed", streamed)):
+            elapsed, peak, kept = measure(run)
+            print(f"{name:>10} {elapsed:>9.2f} {peak / 1e6:>9.1f} {kept:>7}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: sharded extraction on local processes acting as nodes, checked against a single-node run.
+
+Generates a corpus and starts the fake API server, then for each extractor
+runs it once over everything and once as N concurrent `--shard i/N`
+processes (each in its own working directory, so caches start cold),
+merges the shards and compares the merged JSONL, JSON and Markdown with
+the single-node output byte for byte.
+
+    python benchmarks/bench_shards.py [--pages 200] [--docs 60] [--shards 4] [--latency 0.05]
+"""
+import os
+import sys
+import time
+import shutil
+import filecmp
+import argparse
+import tempfile
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from sharding import parse_shard  # noqa: E402
+
+# extractor -> (script, corpus subfolder, outputs compared after the merge)
+EXTRACTORS = {
+    "news": ("extractorv2.py", "news",
+             ["ism_news_extracted.jsonl", "ism_news_extracted.json", "REPORT.md"]),
+    "website": ("Data Extractor Website Crawls.py", "site",
+                ["ism_data_hunt_results.jsonl", "ism_data_hunt_results.json", "READABLE_REPORT.md"]),
+}
+
+
+def node(extractor, corpus, out_dir, mode):
+    """Child process: one extractor run ("all", "i/N" or "merge:N") with its paths pointed at the corpus."""
+    from run_suite import load_module
+
+    script, subfolder, _ = EXTRACTORS[extractor]
+    module = load_module(script)
+    module.PARENT_DIRECTORY = os.path.join(corpus, subfolder)
+    module.OUTPUT_DIR = out_dir
+    if mode == "all":
+        module.main()
+    elif mode.startswith("merge:"):
+        module.merge_shards(int(mode.split(":", 1)[1]))
+    else:
+        module.main(parse_shard(mode))
+
+
+def spawn(extractor, corpus, out_dir, mode, cwd, env):
+    os.makedirs(cwd, exist_ok=True)
+    log = open(os.path.join(cwd, f"{extractor}-{mode.replace('/', '-').replace(':', '-')}.log"), "w")
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--node", extractor, corpus, out_dir, mode],
+                            cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+    proc.log = log
+    return proc
+
+
+def wait_all(procs):
+    for proc in procs:
+        proc.wait()
+        proc.log.close()
+        if proc.returncode:
+            raise RuntimeError(f"node failed ({proc.returncode}), see {proc.log.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--docs", type=int, default=60)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--extractors", default="news,website")
+    parser.add_argument("--node", nargs=4, metavar=("EXTRACTOR", "CORPUS", "OUT", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.node:
+        node(*args.node)
+        return
+
+    from synthetic_corpus import generate
+    from fake_llm_server import start_server
+
+    work = tempfile.mkdtemp(prefix="bench_shards_")
+    try:
+        corpus = os.path.join(work, "corpus")
+        generate(corpus, args.pages, args.docs)
+        server, base_url = start_server(latency=args.latency)
+        env = dict(os.environ, GROQ_API_URL=f"{base_url}/chat/completions", OPENAI_BASE_URL=base_url,
+                   PYTHONUNBUFFERED="1")
+
+        print(f"{'extractor':>9} {'single s':>9} {'shards s':>9} {'merge s':>8}  outputs")
+        for extractor in [e for e in args.extractors.split(",") if e]:
+            single_out = os.path.join(work, extractor, "single", "out")
+            start = time.perf_counter()
+            wait_all([spawn(extractor, corpus, single_out, "all", os.path.join(work, extractor, "single"), env)])
+            single = time.perf_counter() - start
+
+            sharded_out = os.path.join(work, extractor, "sharded")
+            start = time.perf_counter()
+            wait_all([spawn(extractor, corpus, sharded_out, f"{i}/{args.shards}",
+                            os.path.join(work, extractor, f"node-{i}"), env) for i in range(args.shards)])
+            sharded = time.perf_counter() - start
+
+            start = time.perf_counter()
+            wait_all([spawn(extractor, corpus, sharded_out, f"merge:{args.shards}",
+                            os.path.join(work, extractor, "merge"), env)])
+            merged = time.perf_counter() - start
+
+            outputs = EXTRACTORS[extractor][2]
+            same = [name for name in outputs
+                    if filecmp.cmp(os.path.join(single_out, name), os.path.join(sharded_out, name), shallow=False)]
+            status = "identical" if len(same) == len(outputs) else \
+                f"DIFFER: {', '.join(n for n in outputs if n not in same)}"
+            print(f"{extractor:>9} {single:>9.2f} {sharded:>9.2f} {merged:>8.2f}  {status}")
+        server.shutdown()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
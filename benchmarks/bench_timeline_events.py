@@ -0,0 +1,85 @@
+"""
+Benchmark: the original per-sentence extract_events loop vs. the vectorized timeline_events batch.
+
+Generates documents of synthetic sentences (with abbreviations, initials,
+years and KEYWORDS) and times both over the same texts.
+
+    python benchmarks/bench_timeline_events.py [--sentences 500000] [--docs 200]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeline_events import events_frame  # noqa: E402
+from doc_extraction import KEYWORDS  # noqa: E402
+
+WORDS = ("the institute campus students research mining heritage city report faculty alumni "
+         "building festival laboratory library hostel award").split()
+NAMES = ["Prof. G.S. Marwaha", "W.H. Berry", "Dr. D. Penman", "Sh. R.K. Sinha"]
+
+
+def naive_extract_events(text):
+    """The original split-on-period loop, one keyword scan per sentence and keyword."""
+    extracted_events = []
+    text = re.sub(r'\s+', ' ', text)
+    for sentence in text.split('.'):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        years = re.findall(r'\b(18\d{2}|19\d{2}|20\d{2})\b', sentence)
+        has_keyword = any(k.lower() in sentence.lower() for k in KEYWORDS)
+        if years and has_keyword:
+            primary_year = int(years[0])
+            extracted_events.append({
+                "Year": primary_year,
+                "Event": sentence,
+                "GenAI_Prompt": f"Historical cinematic shot from {primary_year}, {sentence[:100]}..."
+            })
+    return extracted_events
+
+
+def make_docs(sentences, docs, rng):
+    out = [[] for _ in range(docs)]
+    for i in range(sentences):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(8, 25))]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(KEYWORDS))
+        if rng.random() < 0.3:
+            words += ["in", str(rng.randint(1850, 2024))]
+        if rng.random() < 0.1:
+            words.insert(0, rng.choice(NAMES))
+        out[i % docs].append(" ".join(words).capitalize() + ".")
+    return [" ".join(doc) for doc in out]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=500000)
+    parser.add_argument("--docs", type=int, default=200)
+    args = parser.parse_args()
+
+    texts = make_docs(args.sentences, args.docs, random.Random(42))
+
+    start = time.perf_counter()
+    naive = [event for text in texts for event in naive_extract_events(text)]
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = events_frame(texts, KEYWORDS)
+    fast_time = time.perf_counter() - start
+
+    # Initials no longer cut sentences short, so the vectorized engine finds whole events
+    cut = sum(1 for e in naive if re.search(r"\b[A-Z]$", e["Event"]))
+    print(f"{'engine':>10} {'seconds':>9} {'events':>8} {'sentences/s':>12}")
+    print(f"{'naive':>10} {naive_time:>9.3f} {len(naive):>8} {args.sentences / naive_time:>12.0f}  ({cut} cut at an initial)")
+    print(f"{'batch':>10} {fast_time:>9.3f} {len(frame):>8} {args.sentences / fast_time:>12.0f}")
+    print(f"Speedup: {naive_time / fast_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: cost of a tracing.span() around a tiny block, tracing off vs. on.
+
+    python benchmarks/bench_tracing.py [--spans 200000]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tracing  # noqa: E402
+
+
+def timed(n, use_span):
+    start = time.perf_counter()
+    for i in range(n):
+        if use_span:
+            with tracing.span("match", path="x") as span:
+                span.set(chunks=i)
+        else:
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--spans", type=int, default=200000)
+    args = parser.parse_args()
+
+    baseline = timed(args.spans, False)
+    disabled = timed(args.spans, True)
+
+    tracing.enable(tempfile.mkdtemp(prefix="bench_tracing_"), "bench_tracing")
+    enabled = timed(args.spans, True)
+
+    print(f"{'mode':>10} {'total s':>9} {'ns/span':>9}")
+    for mode, seconds in (("disabled", disabled), ("enabled", enabled)):
+        print(f"{mode:>10} {seconds:>9.3f} {(seconds - baseline) / args.spans * 1e9:>9.0f}")
+
+    base = tracing.finish()
+    print(f"Chrome trace size: {os.path.getsize(base + '.trace.json') / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
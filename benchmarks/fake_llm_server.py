@@ -0,0 +1,310 @@
+"""
+Local stand-in for the Groq chat-completions, OpenAI Responses and ElevenLabs text-to-speech endpoints.
+
+Lets the extractors, script.py and audio.py run offline:
+
+    python benchmarks/fake_llm_server.py --port 8765 --latency 0.5 --error-rate 0.02
+    GROQ_API_URL=http://127.0.0.1:8765/v1/chat/completions python extractorv2.py
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python "Data Extractor Website Crawls.py"
+    ELEVEN_API_URL=http://127.0.0.1:8765/v1/text-to-speech python audio.py
+
+With --record DIR the server instead forwards every request to the real
+API (keys travel in the clients' own headers) and stores the response;
+--replay DIR serves those recordings back, with their recorded latency
+unless --latency is given. Recordings are keyed by path and request body.
+"""
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Where --record forwards each endpoint; the request path is appended as-is
+UPSTREAMS = {
+    "/chat/completions": "https://api.groq.com/openai",
+    "/responses": "https://api.openai.com",
+    "/text-to-speech/": "https://api.elevenlabs.io",
+}
+FORWARDED_HEADERS = ["Authorization", "xi-api-key", "Content-Type", "Accept"]
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, mono: 417-byte frames of 26 ms
+_MP3_FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0xC4])
+_MP3_FRAME_LENGTH = 417
+
+
+def fake_completion(body):
+    """Builds a deterministic answer for a chat-completions request body."""
+    prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+
+    if body.get("response_format", {}).get("type") == "json_object":
+        try:
+            paragraphs, _ = json.JSONDecoder().raw_decode(prompt, prompt.index("["))
+        except ValueError:
+            paragraphs = []
+        if '"openings"' in prompt:
+            # Transition pass: leave every section opening as it is
+            content = json.dumps({"openings": []})
+        elif '"keep"' in prompt:
+            # llm_clean_window: keep every numbered paragraph
+            content = json.dumps({"keep": [p["id"] for p in paragraphs if isinstance(p, dict)]})
+        else:
+            # llm_clean_article: hand back the JSON list of input paragraphs as the article
+            content = json.dumps({"clean_text": "\n\n".join(str(p) for p in paragraphs)})
+    else:
+        # llm_finalize_script / finalize_section: echo the draft between the --- markers
+        parts = prompt.split("---")
+        content = parts[1].strip() if len(parts) >= 3 else prompt
+
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "model": body.get("model", "fake"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4
+        }
+    }
+
+
+def fake_completion_stream(body):
+    """The same answer as fake_completion, as server-sent events of a few words each."""
+    completion = fake_completion(body)
+    content = completion["choices"][0]["message"]["content"]
+    pieces = re.findall(r"\S+\s*|\s+", content) or [""]
+    events = []
+    for i in range(0, len(pieces), 4):
+        chunk = {
+            "id": completion["id"],
+            "object": "chat.completion.chunk",
+            "model": completion["model"],
+            "choices": [{"index": 0, "delta": {"content": "".join(pieces[i:i + 4])}, "finish_reason": None}]
+        }
+        events.append(f"data: {json.dumps(chunk)}\n\n")
+    final = {
+        "id": completion["id"],
+        "object": "chat.completion.chunk",
+        "model": completion["model"],
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        "x_groq": {"usage": completion["usage"]}
+    }
+    events.append(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n")
+    return "".join(events).encode("utf-8")
+
+
+def fake_response(body):
+    """
+    Builds a Responses API answer for the relevance gatekeeper: every file is
+    kept, answered per numbered path for batched prompts.
+    """
+    prompt = str(body.get("input", ""))
+    numbered = re.findall(r"^\s*(\d+)\. ", prompt, re.MULTILINE)
+    if numbered:
+        text = json.dumps({"decisions": [
+            {"id": int(n), "decision": "KEEP", "reason": "fake server keeps everything"} for n in numbered
+        ]})
+    else:
+        text = json.dumps({"decision": "KEEP", "reason": "fake server keeps everything"})
+    return {
+        "id": "resp-fake",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": body.get("model", "fake"),
+        "status": "completed",
+        "output": [{
+            "type": "message",
+            "id": "msg-fake",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": []}]
+        }],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": len(str(body.get("input", ""))) // 4,
+            "output_tokens": len(text) // 4,
+            "total_tokens": (len(str(body.get("input", ""))) + len(text)) // 4,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 0}
+        }
+    }
+
+
+def fake_speech(text):
+    """
+    Deterministic MP3 for a TTS request: an Info frame, then silence-like
+    frames at roughly 15 characters of text per second of audio.
+    """
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    info = bytearray(_MP3_FRAME_HEADER + bytes(_MP3_FRAME_LENGTH - 4))
+    info[4 + 17:4 + 21] = b"Info"
+    frames = [bytes(info)]
+    for i in range(max(1, int(len(text) / 15 / 0.026))):
+        frames.append(_MP3_FRAME_HEADER + bytes([seed[i % 32]]) * (_MP3_FRAME_LENGTH - 4))
+    return b"".join(frames)
+
+
+def recording_key(path, raw_body):
+    try:
+        body = json.dumps(json.loads(raw_body or b"{}"), sort_keys=True)
+    except ValueError:
+        body = raw_body.decode("utf-8", "replace")
+    return hashlib.sha256(f"{path}\n{body}".encode("utf-8")).hexdigest()
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            failing = server.error_rate and server.rng.random() < server.error_rate
+            if failing:
+                server.error_count += 1
+
+        if failing:
+            # Alternate rate-limit and server errors, like a struggling upstream
+            status = 429 if server.error_count % 2 else 500
+            self._send(status, {"error": {"message": "injected by fake server", "code": status}},
+                       extra_headers={"Retry-After": "0"})
+            return
+
+        if server.replay_dir:
+            self._replay(raw)
+        elif server.record_dir:
+            self._record(raw)
+        else:
+            if server.latency:
+                time.sleep(server.latency)
+            self._fake(json.loads(raw or b"{}"))
+
+    def _fake(self, body):
+        if self.path.endswith("/chat/completions") and body.get("stream"):
+            self._send(200, fake_completion_stream(body), content_type="text/event-stream")
+        elif self.path.endswith("/chat/completions"):
+            self._send(200, fake_completion(body))
+        elif self.path.endswith("/responses"):
+            self._send(200, fake_response(body))
+        elif "/text-to-speech/" in self.path:
+            self._send(200, fake_speech(body.get("text", "")), content_type="audio/mpeg")
+        else:
+            self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def _record(self, raw):
+        upstream = next((base for suffix, base in UPSTREAMS.items() if suffix in self.path), None)
+        if upstream is None:
+            self._send(404, {"error": {"message": f"no upstream for {self.path}"}})
+            return
+
+        headers = {name: self.headers[name] for name in FORWARDED_HEADERS if self.headers.get(name)}
+        request = urllib.request.Request(upstream + self.path, data=raw, headers=headers, method="POST")
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                status, content_type, data = response.status, response.headers.get("Content-Type"), response.read()
+        except urllib.error.HTTPError as e:
+            status, content_type, data = e.code, e.headers.get("Content-Type"), e.read()
+        seconds = time.perf_counter() - start
+
+        if status == 200:
+            key = recording_key(self.path, raw)
+            with open(os.path.join(self.server.record_dir, f"{key}.bin"), "wb") as f:
+                f.write(data)
+            with open(os.path.join(self.server.record_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+                json.dump({"path": self.path, "content_type": content_type, "seconds": seconds}, f)
+        self._send(status, data, content_type=content_type or "application/json")
+
+    def _replay(self, raw):
+        key = recording_key(self.path, raw)
+        meta_path = os.path.join(self.server.replay_dir, f"{key}.json")
+        if not os.path.exists(meta_path):
+            self._send(404, {"error": {"message": f"no recording for this {self.path} request"}})
+            return
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(self.server.replay_dir, f"{key}.bin"), "rb") as f:
+            data = f.read()
+        latency = meta["seconds"] if self.server.latency is None else self.server.latency
+        if latency:
+            time.sleep(latency)
+        self._send(200, data, content_type=meta["content_type"])
+
+    def _send(self, status, payload, content_type="application/json", extra_headers=None):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        # Written in pieces so streaming clients see the body arrive gradually
+        for i in range(0, len(data), 16 * 1024):
+            self.wfile.write(data[i:i + 16 * 1024])
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host="127.0.0.1", port=0, latency=0.0, error_rate=0.0, seed=0, record_dir=None, replay_dir=None):
+    """
+    Starts the fake server on a daemon thread; returns (server, base_url).
+
+    `error_rate` is the share of requests answered with a 429/500 (drawn
+    from a seeded RNG, so runs are repeatable). `latency` is slept before
+    every fake answer; in replay mode None means "as recorded".
+    """
+    server = ThreadingHTTPServer((host, port), FakeLLMHandler)
+    server.daemon_threads = True
+    server.latency = latency if latency is not None or replay_dir else 0.0
+    server.error_rate = error_rate
+    server.rng = random.Random(seed)
+    server.record_dir = record_dir
+    server.replay_dir = replay_dir
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.error_count = 0
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=None, help="seconds to sleep per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 429/500")
+    parser.add_argument("--seed", type=int, default=0)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="DIR", help="forward to the real APIs and store the responses")
+    mode.add_argument("--replay", metavar="DIR", help="answer from recorded responses")
+    args = parser.parse_args()
+
+    server, url = start_server(args.host, args.port, args.latency, args.error_rate, args.seed, args.record, args.replay)
+    mode = f"recording to {args.record}" if args.record else f"replaying {args.replay}" if args.replay else "fake answers"
+    print(f"Fake LLM server listening on {url} (chat/completions, responses, text-to-speech; {mode})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
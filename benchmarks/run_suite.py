@@ -0,0 +1,304 @@
+"""
+Offline benchmark suite: every pipeline stage against a synthetic corpus and the fake API server.
+
+Generates a corpus (benchmarks/synthetic_corpus.py), starts the fake
+chat-completions/responses/TTS server with the requested latency and error
+rate (or replays recorded real responses), then runs each stage in its own
+process from a scratch working directory, so caches start cold:
+
+    website   "Data Extractor Website Crawls.py" over site/
+    news      extractorv2.py over news/
+    timeline  doc_extraction.py over each site/ section
+    script    script.py on the news output + website_extracted_data.txt
+    audio     audio.py on the finalized script
+
+The report is JSON (per stage: wall time, items/s, latency percentiles of
+the stage's per-item calls, peak RSS, API requests and injected errors),
+written to --out or stdout, so runs can be diffed across versions.
+
+    python benchmarks/run_suite.py [--pages 200] [--docs 60] [--latency 0.05] [--error-rate 0] [--out report.json]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import importlib.util
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+STAGES = ["website", "news", "timeline", "script", "audio"]
+
+
+# ----------------------------------------------------
+# STAGE WORKER (runs in the child process)
+# ----------------------------------------------------
+
+def load_module(filename):
+    spec = importlib.util.spec_from_file_location(os.path.splitext(filename)[0].replace(" ", "_"),
+                                                  os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def instrument(module, names, latencies):
+    """Replaces module functions with wrappers recording each call's duration under its name."""
+    for name in names:
+        original = getattr(module, name)
+
+        def timed(*args, _original=original, _name=name, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _original(*args, **kwargs)
+            finally:
+                latencies.setdefault(_name, []).append(time.perf_counter() - start)
+
+        setattr(module, name, timed)
+
+
+def instrument_parse_results(module, latencies):
+    """Records the per-file parse time of every ParseResult a module's parse_files yields."""
+    original = module.parse_files
+
+    def parse_files(*args, **kwargs):
+        for result in original(*args, **kwargs):
+            latencies.setdefault("parse_document", []).append(result.seconds)
+            yield result
+
+    module.parse_files = parse_files
+
+
+def count_files(folder, suffixes):
+    return sum(1 for _, _, files in os.walk(folder) for f in files if f.endswith(suffixes))
+
+
+def run_stage(stage, corpus):
+    """Runs one stage in this process (cwd = the scratch dir); returns (items, latencies)."""
+    latencies = {}
+    out_dir = os.path.abspath("extracted_data")
+
+    if stage == "website":
+        module = load_module("Data Extractor Website Crawls.py")
+        module.PARENT_DIRECTORY = os.path.join(corpus, "site")
+        module.OUTPUT_DIR = out_dir
+        instrument(module, ["llm_check_relevance_batch", "llm_check_relevance"], latencies)
+        instrument_parse_results(module, latencies)
+        module.main()
+        return count_files(module.PARENT_DIRECTORY, (".pdf", ".docx", ".txt")), latencies
+
+    if stage == "news":
+        module = load_module("extractorv2.py")
+        module.PARENT_DIRECTORY = os.path.join(corpus, "news")
+        module.OUTPUT_DIR = out_dir
+        instrument(module, ["process_folder", "groq_json_completion"], latencies)
+        module.main()
+        return len(os.listdir(module.PARENT_DIRECTORY)), latencies
+
+    if stage == "timeline":
+        # doc_extraction reads one flat folder per run
+        module = load_module("doc_extraction.py")
+        instrument_parse_results(module, latencies)
+        instrument(module, ["extract_events"], latencies)
+        items = 0
+        site = os.path.join(corpus, "site")
+        for section in sorted(os.listdir(site)):
+            module.FOLDER_PATH = os.path.join(site, section)
+            module.OUTPUT_CSV = f"timeline_{section}.csv"
+            module.OUTPUT_DATASET = f"timeline_{section}"
+            module.main()
+            items += len(os.listdir(module.FOLDER_PATH))
+        return items, latencies
+
+    if stage == "script":
+        shutil.copy(os.path.join(corpus, "website_extracted_data.txt"), "website_extracted_data.txt")
+        module = load_module("script.py")
+        instrument(module, ["extract_indexed_data", "extract_clean_data", "llm_finalize_script"], latencies)
+        module.main()
+        return 1, latencies
+
+    if stage == "audio":
+        module = load_module("audio.py")
+        module.SCRIPT_FILE = "FINAL_2_MIN_VIDEO_SCRIPT.txt"
+        instrument(module, ["synthesize_chunk"], latencies)
+        module.main()
+        with open(module.SCRIPT_FILE, "r", encoding="utf-8") as f:
+            return len(module.chunk_script(f.read())), latencies
+
+    raise ValueError(f"unknown stage {stage}")
+
+
+def worker(stage, corpus, result_path):
+    start = time.perf_counter()
+    items, latencies = run_stage(stage, corpus)
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump({"seconds": time.perf_counter() - start, "items": items, "latencies": latencies}, f)
+
+
+# ----------------------------------------------------
+# SUITE (parent process)
+# ----------------------------------------------------
+
+def percentiles(values):
+    """Nearest-rank latency summary in milliseconds."""
+    ordered = sorted(values)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50": round(rank(50), 3),
+        "p90": round(rank(90), 3),
+        "p99": round(rank(99), 3),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+def measure(stage, corpus, work_dir, server, base_url):
+    """Runs one stage in a child process and builds its report entry."""
+    result_path = os.path.join(work_dir, f".{stage}_result.json")
+    log_path = os.path.join(work_dir, "logs", f"{stage}.log")
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    env = dict(os.environ,
+               GROQ_API_URL=f"{base_url}/chat/completions",
+               OPENAI_BASE_URL=base_url,
+               ELEVEN_API_URL=f"{base_url}/text-to-speech",
+               PYTHONUNBUFFERED="1")
+
+    requests_before, errors_before = server.request_count, server.error_count
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--worker", stage, corpus, result_path],
+                                cwd=work_dir, env=env, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    entry = {
+        "exit_code": proc.returncode,
+        "wall_seconds": round(wall, 3),
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),   # KiB on Linux; largest process of the stage
+        "requests": server.request_count - requests_before,
+        "injected_errors": server.error_count - errors_before,
+        "log": os.path.relpath(log_path, work_dir),
+    }
+    if proc.returncode == 0:
+        with open(result_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        entry["items"] = result["items"]
+        entry["seconds"] = round(result["seconds"], 3)
+        entry["items_per_second"] = round(result["items"] / result["seconds"], 3) if result["seconds"] else None
+        entry["latency_ms"] = {name: percentiles(values) for name, values in sorted(result["latencies"].items()) if values}
+    return entry
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_summary(report):
+    print(f"{'stage':>9} {'exit':>4} {'items':>6} {'items/s':>9} {'wall s':>8} {'RSS MB':>7} {'reqs':>5} {'errs':>5}",
+          file=sys.stderr)
+    for name, s in report["stages"].items():
+        rate = s.get("items_per_second")
+        print(f"{name:>9} {s['exit_code']:>4} {s.get('items', '-'):>6} {rate if rate is not None else '-':>9} "
+              f"{s['wall_seconds']:>8.2f} {s['peak_rss_mb']:>7.1f} {s['requests']:>5} {s['injected_errors']:>5}",
+              file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200, help="news crawl folders")
+    parser.add_argument("--docs", type=int, default=60, help="PDF/DOCX/TXT documents")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", type=float, default=None,
+                        help="fake API seconds per request (default 0.05; with --replay, as recorded)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of API requests failing with 429/500")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset, run in this order")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="DIR", help="proxy to the real APIs and record their responses")
+    mode.add_argument("--replay", metavar="DIR", help="serve previously recorded responses")
+    parser.add_argument("--workdir", help="keep corpus and outputs here instead of a temporary directory")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--worker", nargs=3, metavar=("STAGE", "CORPUS", "RESULT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(*args.worker)
+        return
+
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    from synthetic_corpus import generate
+    from fake_llm_server import start_server
+
+    latency = args.latency if args.latency is not None or args.replay else 0.05
+    work_dir = args.workdir or tempfile.mkdtemp(prefix="ism_bench_")
+    try:
+        corpus = os.path.join(work_dir, "corpus")
+        run_dir = os.path.join(work_dir, "run")
+        shutil.rmtree(run_dir, ignore_errors=True)
+        os.makedirs(run_dir)
+
+        print(f"Generating corpus in {corpus} ...", file=sys.stderr)
+        start = time.perf_counter()
+        shutil.rmtree(corpus, ignore_errors=True)
+        counts = generate(corpus, args.pages, args.docs, args.seed)
+        generate_seconds = time.perf_counter() - start
+
+        server, base_url = start_server(latency=latency, error_rate=args.error_rate, seed=args.seed,
+                                        record_dir=args.record, replay_dir=args.replay)
+        report = {
+            "suite": "ism-pipeline-offline",
+            "version": 1,
+            "git_commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "settings": {
+                "pages": args.pages, "docs": args.docs, "seed": args.seed, "latency": latency,
+                "error_rate": args.error_rate,
+                "mode": "record" if args.record else "replay" if args.replay else "fake",
+            },
+            "corpus": dict(counts, generate_seconds=round(generate_seconds, 3)),
+            "stages": {},
+        }
+
+        for stage in stages:
+            print(f"Running {stage} ...", file=sys.stderr)
+            report["stages"][stage] = measure(stage, corpus, run_dir, server, base_url)
+        server.shutdown()
+    finally:
+        if not args.workdir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_summary(report)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Report written to {args.out}", file=sys.stderr)
+    else:
+        print(text)
+    sys.exit(1 if any(s["exit_code"] for s in report["stages"].values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
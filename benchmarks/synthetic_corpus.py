@@ -0,0 +1,191 @@
+"""
+Synthetic corpus generator for the offline benchmarks.
+
+Writes, under OUT:
+    news/NNNNN_www_siteK_com/index.html | index.mhtml   crawled news pages (extractorv2)
+    site/<section>/*.pdf|.docx|.txt                      crawled documents (website extractor, timeline)
+    website_extracted_data.txt                           website text read by script.py
+
+Text mixes filler with the real SEARCH_CONTEXT phrases, years and timeline
+keywords, so every stage finds something to keep. Output only depends on
+the seed. PDF and DOCX files are written directly (no extra dependencies).
+
+    python benchmarks/synthetic_corpus.py OUT [--pages 200] [--docs 60] [--seed 42]
+"""
+import os
+import sys
+import base64
+import quopri
+import random
+import zipfile
+import argparse
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FILLER = ("the institute campus students research mining heritage department city news report "
+          "faculty alumni building festival engineering laboratory library hostel award").split()
+EVENTS = ["was established", "was inaugurated", "gained university status", "opened a new research department",
+          "celebrated its golden jubilee", "welcomed a new director", "expanded the campus"]
+
+
+def phrases():
+    from script import SEARCH_CONTEXT
+    return [p for c in SEARCH_CONTEXT["categories"] for p in c["match_phrases"]]
+
+
+def sentence(rng, vocab):
+    words = [rng.choice(FILLER) for _ in range(rng.randint(10, 30))]
+    if rng.random() < 0.5:
+        words.insert(rng.randrange(len(words)), rng.choice(vocab))
+    if rng.random() < 0.3:
+        words += ["in", str(rng.randint(1900, 2024)), "the", "institute", rng.choice(EVENTS)]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng, vocab, sentences=(2, 6)):
+    return " ".join(sentence(rng, vocab) for _ in range(rng.randint(*sentences)))
+
+
+# ----------------------------------------------------
+# FILE FORMATS
+# ----------------------------------------------------
+
+def news_html(rng, vocab):
+    body = "".join(f"<p>{escape(paragraph(rng, vocab))}</p>" for _ in range(rng.randint(4, 16)))
+    nav = "".join(f"<li><a href='/s{i}'>Section {i}</a></li>" for i in range(30))
+    return (f"<!DOCTYPE html><html><head><title>News</title><style>p{{margin:0}}</style>"
+            f"<script>var ads = {[rng.random() for _ in range(20)]};</script></head>"
+            f"<body><nav><ul>{nav}</ul></nav><article>{body}</article>"
+            f"<p>Subscribe</p><footer><p>Copyright {rng.randint(2000, 2024)} News Corp</p></footer></body></html>")
+
+
+def write_mhtml(path, url, html, rng):
+    boundary = "----MultipartBoundary--synthetic----"
+    image = base64.encodebytes(rng.randbytes(rng.randint(20_000, 80_000))).decode("ascii").replace("\n", "\r\n")
+    html_qp = quopri.encodestring(html.encode("utf-8")).decode("ascii").replace("\n", "\r\n")
+    parts = [
+        ("text/html; charset=\"utf-8\"", "quoted-printable", url, html_qp),
+        ("image/png", "base64", f"{url}/hero.png", image),
+        ("text/css", "quoted-printable", f"{url}/site.css", "p { margin: 0 }"),
+    ]
+    with open(path, "w", encoding="ascii", newline="") as f:
+        f.write(f"From: <Saved by Blink>\r\nSnapshot-Content-Location: {url}\r\nSubject: News\r\n"
+                f"MIME-Version: 1.0\r\nContent-Type: multipart/related;\r\n\ttype=\"text/html\";\r\n"
+                f"\tboundary=\"{boundary}\"\r\n\r\n")
+        for content_type, encoding, location, data in parts:
+            f.write(f"--{boundary}\r\nContent-Type: {content_type}\r\nContent-Transfer-Encoding: {encoding}\r\n"
+                    f"Content-Location: {location}\r\n\r\n{data}\r\n\r\n")
+        f.write(f"--{boundary}--\r\n")
+
+
+def write_pdf(path, pages):
+    """Minimal PDF with one Helvetica text stream per page; PyPDF2 extracts it line by line."""
+    def pdf_text(s):
+        return s.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        stream = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(f"({pdf_text(line)}) '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {len(objects)} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode("ascii")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(path, paragraphs):
+    """Minimal WordprocessingML package: content types, package rels and the document part."""
+    body = "".join(f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(p)}</w:t></w:r></w:p>" for p in paragraphs)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml",
+                   '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                   '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                   '<Default Extension="xml" ContentType="application/xml"/>'
+                   '<Override PartName="/word/document.xml" ContentType="application/'
+                   'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+        z.writestr("_rels/.rels",
+                   '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                   '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                   '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                   'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+        z.writestr("word/document.xml",
+                   '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                   '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                   f'<w:body>{body}</w:body></w:document>')
+
+
+# ----------------------------------------------------
+# CORPUS
+# ----------------------------------------------------
+
+def generate(out_dir, pages=200, docs=60, seed=42, mhtml_fraction=0.25):
+    """Writes the corpus under `out_dir`; returns a dict of file counts per kind."""
+    rng = random.Random(seed)
+    vocab = phrases()
+    counts = {"html": 0, "mhtml": 0, "pdf": 0, "docx": 0, "txt": 0}
+
+    for i in range(pages):
+        folder = os.path.join(out_dir, "news", f"{i:05d}_www_site{i % 17}_com")
+        os.makedirs(folder, exist_ok=True)
+        html = news_html(rng, vocab)
+        if rng.random() < mhtml_fraction:
+            write_mhtml(os.path.join(folder, "index.mhtml"), f"https://www.site{i % 17}.com/news/{i}", html, rng)
+            counts["mhtml"] += 1
+        else:
+            with open(os.path.join(folder, "index.html"), "w", encoding="utf-8") as f:
+                f.write(html)
+            counts["html"] += 1
+
+    sections = ["about", "history", "research", "student_life", "alumni", "admin_misc"]
+    for i in range(docs):
+        folder = os.path.join(out_dir, "site", sections[i % len(sections)])
+        os.makedirs(folder, exist_ok=True)
+        kind = ("pdf", "docx", "txt")[i % 3]
+        name = os.path.join(folder, f"doc_{i:04d}.{kind}")
+        paragraphs = [paragraph(rng, vocab) for _ in range(rng.randint(5, 30))]
+        if kind == "pdf":
+            lines = [p[j:j + 110] for p in paragraphs for j in range(0, len(p), 110)]
+            write_pdf(name, [lines[j:j + 60] for j in range(0, len(lines), 60)])
+        elif kind == "docx":
+            write_docx(name, paragraphs)
+        else:
+            with open(name, "w", encoding="utf-8") as f:
+                f.write("\n\n".join(paragraphs))
+        counts[kind] += 1
+
+    with open(os.path.join(out_dir, "website_extracted_data.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(paragraph(rng, vocab) for _ in range(max(20, docs))))
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out")
+    parser.add_argument("--pages", type=int, default=200, help="news crawl folders")
+    parser.add_argument("--docs", type=int, default=60, help="PDF/DOCX/TXT documents, in equal shares")
+    parser.add_argument("--mhtml-fraction", type=float, default=0.25, help="share of news pages saved as MHTML")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    counts = generate(args.out, args.pages, args.docs, args.seed, args.mhtml_fraction)
+    print(f"Wrote {sum(counts.values())} files to {args.out}: " + ", ".join(f"{n} {k}" for k, n in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
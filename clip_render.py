@@ -0,0 +1,313 @@
+import os
+import csv
+import json
+import time
+import heapq
+import random
+import hashlib
+import threading
+from collections import namedtuple
+import tracing
+from llm_cache import make_key
+
+# --- CONFIGURATION ---
+RENDER_CONCURRENCY = 4            # Clips rendered at once
+RENDER_RETRIES = 3                # Extra attempts for a clip whose render fails
+RETRY_BACKOFF = 2.0               # Seconds before the first retry, doubled for each further one
+
+# One clip per distinct prompt; `year` is the earliest year it stands for
+RenderJob = namedtuple("RenderJob", ["key", "prompt", "year", "events"])
+
+
+# ----------------------------------------------------
+# BACKENDS
+# ----------------------------------------------------
+
+class PlaceholderBackend:
+    """
+    Local stand-in for a text-to-video service: renders an uncompressed
+    YUV4MPEG2 (.y4m) clip of a moving gradient tinted by the prompt, so the
+    scheduler can be exercised without a GPU or an API key. `latency`
+    (seconds) and `failure_rate` simulate a remote renderer.
+
+    A backend is any object with `name`, `extension` and
+    render(prompt, params, out_path), which writes one clip to `out_path`
+    and raises on failure.
+    """
+
+    name = "placeholder"
+    extension = ".y4m"
+
+    def __init__(self, latency=0.0, failure_rate=0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+
+    def render(self, prompt, params, out_path):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise RuntimeError("placeholder render failed (simulated)")
+
+        width, height = params["width"] // 2 * 2, params["height"] // 2 * 2
+        fps, frames = params["fps"], max(1, round(params["fps"] * params["seconds"]))
+        tint = hashlib.sha256(f"{params.get('seed', 0)}:{prompt}".encode("utf-8")).digest()
+        chroma = (bytes([tint[0]]) * (width * height // 4)) + (bytes([tint[1]]) * (width * height // 4))
+        ramp = bytes(x * 255 // max(1, width - 1) for x in range(width)) * 2
+
+        with open(out_path, "wb") as f:
+            f.write(f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 C420jpeg\n".encode("ascii"))
+            for i in range(frames):
+                # The gradient pans one step per frame
+                shift = i * width // frames
+                row = ramp[shift:shift + width]
+                f.write(b"FRAME\n")
+                f.write(row * height)
+                f.write(chroma)
+
+
+BACKENDS = {"placeholder": PlaceholderBackend}
+
+
+def make_backend(name, **options):
+    """Instantiates the backend registered under `name` in BACKENDS."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown render backend {name!r}; known: {', '.join(BACKENDS)}")
+    return BACKENDS[name](**options)
+
+
+# ----------------------------------------------------
+# JOBS
+# ----------------------------------------------------
+
+def load_jobs(csv_path, backend, params):
+    """
+    Render jobs for the GenAI_Prompt column of a timeline CSV: identical
+    prompts become one job (keyed by backend, prompt and parameters),
+    earliest years first.
+    """
+    jobs = {}
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            prompt = (row.get("GenAI_Prompt") or "").strip()
+            if not prompt:
+                continue
+            year = int(row["Year"])
+            job = jobs.get(prompt)
+            if job is None:
+                jobs[prompt] = RenderJob(make_key(backend.name, prompt, **params), prompt, year, [row["Event"]])
+            else:
+                job.events.append(row["Event"])
+                if year < job.year:
+                    jobs[prompt] = job._replace(year=year)
+    return sorted(jobs.values(), key=lambda job: job.year)
+
+
+def clip_path(clip_dir, key, extension):
+    """Content address of a clip: one file per (backend, prompt, parameters) key."""
+    return os.path.join(clip_dir, key[:2], f"{key}{extension}")
+
+
+class JobJournal:
+    """
+    Append-only journal of render job outcomes, one JSON line per attempt
+    result; the last line for a key wins. Lines are fsynced as they are
+    written, so a restarted run knows which jobs finished and how often the
+    others failed. A torn final line from a crash is dropped on load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+        self._lock = threading.Lock()
+        self._load()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._journal = open(path, "ab")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    f.truncate(offset)
+                    break
+                try:
+                    record = json.loads(line)
+                    self.records[record["key"]] = record
+                except (ValueError, KeyError):
+                    pass
+                offset += len(line)
+
+    def record(self, key, **fields):
+        record = {"key": key, **fields}
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._journal.write(data)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self.records[key] = record
+        return record
+
+    def status(self, key):
+        record = self.records.get(key)
+        return record["status"] if record else None
+
+    def close(self):
+        self._journal.close()
+
+
+# ----------------------------------------------------
+# SCHEDULER
+# ----------------------------------------------------
+
+class RenderScheduler:
+    """
+    Runs render jobs on `concurrency` worker threads, earliest year first.
+
+    Clips already in `clip_dir` are not rendered again, whatever the
+    journal says. A failed render goes back into the queue after an
+    exponential backoff (its slot is free meanwhile) until it has had
+    `retries` extra attempts; then it is journalled as failed and the run
+    goes on. Because every outcome is journalled and clips are only moved
+    into the cache once complete, an interrupted run simply resumes: a job
+    that was retrying continues from its journalled attempt count, and one
+    that had given up gets a single new attempt.
+    """
+
+    def __init__(self, backend, params, clip_dir, journal, concurrency=RENDER_CONCURRENCY,
+                 retries=RENDER_RETRIES, backoff=RETRY_BACKOFF):
+        self.backend = backend
+        self.params = params
+        self.clip_dir = clip_dir
+        self.journal = journal
+        self.concurrency = max(1, concurrency)
+        self.retries = retries
+        self.backoff = backoff
+
+        self.rendered = 0
+        self.cached = 0
+        self.failed = 0
+        self.attempts = 0
+
+        self._heap = []
+        self._outstanding = 0
+        self._timers = []
+        self._cond = threading.Condition()
+
+    def path(self, job):
+        return clip_path(self.clip_dir, job.key, self.backend.extension)
+
+    def previous_attempts(self, job):
+        """Failed attempts the journal holds for `job` from earlier runs."""
+        record = self.journal.records.get(job.key) or {}
+        if record.get("status") in ("retrying", "failed"):
+            return record.get("attempts", 0)
+        return 0
+
+    def run(self, jobs):
+        """Renders every job; returns {key: clip path} for the ones that succeeded."""
+        clips = {}
+        for seq, job in enumerate(jobs):
+            path = self.path(job)
+            if os.path.exists(path):
+                if self.journal.status(job.key) != "done":
+                    self.journal.record(job.key, status="done", clip=path, attempts=0)
+                clips[job.key] = path
+                self.cached += 1
+            else:
+                heapq.heappush(self._heap, (job.year, seq, self.previous_attempts(job), job))
+        self._outstanding = len(self._heap)
+
+        workers = [threading.Thread(target=self._work, args=(clips,), name=f"render-{i}", daemon=True)
+                   for i in range(min(self.concurrency, max(1, self._outstanding)))]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        finally:
+            for timer in self._timers:
+                timer.cancel()
+        return clips
+
+    def _work(self, clips):
+        while True:
+            with self._cond:
+                while not self._heap and self._outstanding:
+                    self._cond.wait()
+                if not self._outstanding:
+                    self._cond.notify_all()
+                    return
+                year, seq, attempt, job = heapq.heappop(self._heap)
+
+            path = self.path(job)
+            try:
+                self._render(job, attempt, path)
+            except Exception as e:
+                self._failed(job, seq, attempt, e)
+                continue
+
+            self.journal.record(job.key, status="done", clip=path, attempts=attempt + 1)
+            with self._cond:
+                clips[job.key] = path
+                self.rendered += 1
+                self._outstanding -= 1
+                self._cond.notify_all()
+
+    def _render(self, job, attempt, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        with self._cond:
+            self.attempts += 1
+        try:
+            with tracing.span("render.clip", backend=self.backend.name, year=job.year, attempt=attempt):
+                self.backend.render(job.prompt, self.params, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _failed(self, job, seq, attempt, error):
+        if attempt < self.retries:
+            delay = self.backoff * 2 ** attempt
+            self.journal.record(job.key, status="retrying", attempts=attempt + 1, error=str(error))
+            timer = threading.Timer(delay, self._requeue, args=((job.year, seq, attempt + 1, job),))
+            timer.daemon = True
+            with self._cond:
+                self._timers.append(timer)
+            timer.start()
+            return
+
+        print(f"[RENDER ERROR] {job.year}: {job.prompt[:60]}... {error} (gave up after {attempt + 1} attempts)")
+        self.journal.record(job.key, status="failed", attempts=attempt + 1, error=str(error))
+        with self._cond:
+            self.failed += 1
+            self._outstanding -= 1
+            self._cond.notify_all()
+
+    def _requeue(self, item):
+        with self._cond:
+            heapq.heappush(self._heap, item)
+            self._cond.notify()
+
+
+def write_clip_index(jobs, clips, journal, index_path):
+    """
+    Chronological list of the shots for video assembly: year, prompt, the
+    events it illustrates and its clip (or the error of a failed render).
+    """
+    shots = []
+    for job in jobs:
+        shot = {"year": job.year, "prompt": job.prompt, "events": job.events}
+        if job.key in clips:
+            shot["clip"] = clips[job.key]
+        else:
+            shot["error"] = (journal.records.get(job.key) or {}).get("error")
+        shots.append(shot)
+
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(shots, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+    return shots
@@ -1,12 +1,15 @@
 import os
-import re
-import pandas as pd
-from PyPDF2 import PdfReader
-from docx import Document
+import time
+import tracing
+from timeline_events import events_frame
+from timeline_store import TimelineWriter, iter_chronological, export_csv
+from doc_parsing import parse_files, PARSE_WORKERS, PARSE_TIMEOUT
 
 # --- CONFIGURATION ---
 FOLDER_PATH = "path/to/your/documents_folder"  # <--- REPLACE THIS
-OUTPUT_CSV = "iit_ism_timeline.csv"
+OUTPUT_DATASET = "iit_ism_timeline"        # Parquet dataset, one partition per decade
+OUTPUT_CSV = "iit_ism_timeline.csv"        # Chronological CSV exported from the dataset; None to skip
+EVENT_BATCH_FILES = 200               # Parsed files mined together in one vectorized batch
 
 # Keywords that define "Relevant" information for your video
 # We only keep sentences that contain at least one of these concepts
@@ -16,83 +19,64 @@ KEYWORDS = [
     "golden jubilee", "centenary", "president", "director", "notable"
 ]
 
-def read_file(file_path):
-    """Reads text from PDF, DOCX, or TXT files."""
-    text = ""
-    try:
-        if file_path.endswith('.pdf'):
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                text += page.extract_text() + " "
-        elif file_path.endswith('.docx'):
-            doc = Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + " "
-        elif file_path.endswith('.txt'):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-    return text
-
-def extract_events(text):
-    """Extracts sentences that have a Year AND a relevant Keyword."""
-    extracted_events = []
-    
-    # Clean text: Remove extra newlines and spaces
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Split text into sentences (Simple split by period)
-    # For better results, use: nltk.tokenize.sent_tokenize(text)
-    sentences = text.split('.')
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence: continue
-        
-        # 1. FIND DATES: Regex for years between 1800 and 2099
-        years = re.findall(r'\b(18\d{2}|19\d{2}|20\d{2})\b', sentence)
-        
-        # 2. FILTER RELEVANCE: Check if any keyword exists
-        has_keyword = any(k.lower() in sentence.lower() for k in KEYWORDS)
-        
-        if years and has_keyword:
-            # We take the first year found as the primary timestamp
-            primary_year = int(years[0])
-            
-            # 3. GEN AI PREP: Create a basic prompt stub for the video generation
-            prompt_stub = f"Historical cinematic shot from {primary_year}, {sentence[:100]}..."
-            
-            extracted_events.append({
-                "Year": primary_year,
-                "Event": sentence,
-                "GenAI_Prompt": prompt_stub
-            })
-            
-    return extracted_events
+def extract_events(texts):
+    """
+    Extracts sentences that have a Year AND a relevant Keyword, as a
+    Year/Event/GenAI_Prompt DataFrame. `texts` is one document's text or a
+    list of them; a list is segmented and matched in one vectorized batch.
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    return events_frame(texts, KEYWORDS)
 
 # --- MAIN EXECUTION ---
-all_events = []
+def main():
+    # Parse all files in the folder across processes, then mine them in order
+    file_paths = [
+        os.path.join(FOLDER_PATH, filename)
+        for filename in sorted(os.listdir(FOLDER_PATH))
+        if os.path.isfile(os.path.join(FOLDER_PATH, filename))
+    ]
+
+    def mine(batch):
+        with tracing.span("match", files=len(batch)) as span:
+            events = extract_events(batch)
+            span.set(events=len(events))
+        with tracing.span("write", rows=len(events)):
+            writer.write(events)
+
+    start = time.perf_counter()
+    batch = []
+    # Each batch of files becomes one row group per decade, deduplicated by event hash
+    with TimelineWriter(OUTPUT_DATASET) as writer:
+        for result in parse_files(file_paths, separator=" ", workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT):
+            filename = os.path.basename(result.path)
+            if result.error:
+                print(f"Error reading {result.path}: {result.error}")
+                continue
+            print(f"Processing: {filename}... ({result.seconds:.2f}s)")
+            batch.append(result.text)
+            if len(batch) >= EVENT_BATCH_FILES:
+                mine(batch)
+                batch = []
+        if batch:
+            mine(batch)
+    print(f"Parsed {len(file_paths)} files in {time.perf_counter() - start:.1f}s")
+
+    if writer.rows:
+        print("\n--- Extraction Complete ---")
+        print(next(iter_chronological(OUTPUT_DATASET)).head())
+        print(f"\n{writer.rows} events saved to {OUTPUT_DATASET}/ ({writer.duplicates} duplicates dropped)")
 
-# Loop through all files in the folder
-for filename in os.listdir(FOLDER_PATH):
-    file_path = os.path.join(FOLDER_PATH, filename)
-    if os.path.isfile(file_path):
-        print(f"Processing: {filename}...")
-        raw_text = read_file(file_path)
-        events = extract_events(raw_text)
-        all_events.extend(events)
+        # Also saved as CSV for the next phase (Video Generation)
+        if OUTPUT_CSV:
+            with tracing.span("write", path=OUTPUT_CSV):
+                export_csv(OUTPUT_DATASET, OUTPUT_CSV)
+            print(f"Data saved to {OUTPUT_CSV}")
+    else:
+        print("No relevant events found. Check your keywords or document content.")
+    tracing.finish()
 
-# Create DataFrame and Sort Chronologically
-df = pd.DataFrame(all_events)
 
-if not df.empty:
-    df = df.sort_values(by="Year").drop_duplicates(subset=["Event"])
-    print("\n--- Extraction Complete ---")
-    print(df.head())
-    
-    # Save to CSV for the next phase (Video Generation)
-    df.to_csv(OUTPUT_CSV, index=False)
-    print(f"\nData saved to {OUTPUT_CSV}")
-else:
-    print("No relevant events found. Check your keywords or document content.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import os
+import time
+from collections import deque, namedtuple
+import multiprocessing
+from multiprocessing.connection import wait
+import tracing
+
+# --- CONFIGURATION ---
+PARSE_WORKERS = os.cpu_count() or 1    # Parser processes; 0 parses inline in this process
+PARSE_TIMEOUT = 120                    # Seconds one file may take before its worker is killed
+PARSE_AHEAD = 64                       # Files started past the oldest one not yet yielded; bounds buffered results
+
+ParseResult = namedtuple("ParseResult", ["path", "text", "seconds", "error"])
+
+
+# ----------------------------------------------------
+# SINGLE-FILE PARSING
+# ----------------------------------------------------
+
+def parse_document(file_path, separator="\n"):
+    """
+    Returns the text of a PDF, DOCX or TXT file; other extensions give "".
+
+    Every PDF page / DOCX paragraph is followed by `separator`. Pieces are
+    collected in a list and joined once, so long documents stay linear.
+    Errors propagate to the caller.
+    """
+    if file_path.endswith('.pdf'):
+        from PyPDF2 import PdfReader
+        parts = []
+        for page in PdfReader(file_path).pages:
+            t = page.extract_text()
+            if t:
+                parts.append(t)
+                parts.append(separator)
+        return "".join(parts)
+
+    elif file_path.endswith('.docx'):
+        from docx import Document
+        parts = []
+        for para in Document(file_path).paragraphs:
+            parts.append(para.text)
+            parts.append(separator)
+        return "".join(parts)
+
+    elif file_path.endswith('.txt'):
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+
+    return ""
+
+
+def _parse_timed(index, file_path, separator):
+    start = time.perf_counter()
+    try:
+        text, error = parse_document(file_path, separator), None
+    except Exception as e:
+        text, error = "", f"{type(e).__name__}: {e}"
+    return index, text, time.perf_counter() - start, error
+
+
+# ----------------------------------------------------
+# PROCESS POOL
+# ----------------------------------------------------
+
+def _worker_loop(conn, separator):
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        conn.send(_parse_timed(task[0], task[1], separator))
+
+
+class _Worker:
+    """One parser process with a private pipe, so it can be killed on its own."""
+
+    def __init__(self, ctx, separator):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_loop, args=(child_conn, separator), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None      # (index, path)
+        self.started = 0.0
+
+    def assign(self, index, path):
+        self.conn.send((index, path))
+        self.task = (index, path)
+        self.started = time.monotonic()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def parse_files(paths, separator="\n", workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT, ahead=PARSE_AHEAD):
+    """
+    Parses `paths` across a pool of processes and yields one ParseResult per
+    path, in input order. No file more than `ahead` places after the oldest
+    unyielded one is started, so a slow file holds back at most that many
+    finished results in memory.
+
+    A file that runs longer than `timeout` seconds has its worker killed and
+    replaced; its result carries an error instead of text. A worker that
+    crashes is replaced the same way.
+    """
+    paths = list(paths)
+
+    if workers <= 0:
+        for index, path in enumerate(paths):
+            _, text, seconds, error = _parse_timed(index, path, separator)
+            tracing.add_span("parse", seconds, path=path, error=error)
+            yield ParseResult(path, text, seconds, error)
+        return
+
+    ctx = multiprocessing.get_context()
+    ahead = max(ahead, workers)
+    pending = deque(enumerate(paths))
+    done = {}
+    next_out = 0
+    pool = [_Worker(ctx, separator) for _ in range(min(workers, len(paths)))]
+
+    try:
+        while next_out < len(paths):
+            for worker in pool:
+                if worker.task is None and pending and pending[0][0] < next_out + ahead:
+                    worker.assign(*pending.popleft())
+
+            busy = [w for w in pool if w.task is not None]
+            poll = None
+            if timeout:
+                oldest = min(w.started for w in busy)
+                poll = max(0.0, oldest + timeout - time.monotonic())
+
+            ready = wait([w.conn for w in busy], timeout=poll)
+
+            for i, worker in enumerate(pool):
+                if worker.task is None:
+                    continue
+                index, path = worker.task
+
+                if worker.conn in ready:
+                    try:
+                        _, text, seconds, error = worker.conn.recv()
+                    except (EOFError, OSError):
+                        seconds = time.monotonic() - worker.started
+                        text, error = "", f"parser process exited (code {worker.process.exitcode})"
+                        worker.kill()
+                        pool[i] = _Worker(ctx, separator)
+                    else:
+                        worker.task = None
+                    done[index] = ParseResult(path, text, seconds, error)
+                    # Timed inside the worker; recorded here on a per-worker track
+                    tracing.add_span("parse", seconds, thread=f"parse worker {i}", path=path, error=error)
+
+                elif timeout and time.monotonic() - worker.started >= timeout:
+                    seconds = time.monotonic() - worker.started
+                    worker.kill()
+                    pool[i] = _Worker(ctx, separator)
+                    done[index] = ParseResult(path, "", seconds, f"timed out after {timeout}s")
+                    tracing.add_span("parse", seconds, thread=f"parse worker {i}", path=path,
+                                     error=done[index].error)
+
+            while next_out in done:
+                yield done.pop(next_out)
+                next_out += 1
+    finally:
+        for worker in pool:
+            if worker.task is None:
+                worker.stop()
+            else:
+                worker.kill()
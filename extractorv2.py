@@ -1,18 +1,138 @@
 import os
 import json
-import re
-from PyPDF2 import PdfReader
-from docx import Document
-from bs4 import BeautifulSoup
+import argparse
+import threading
 import requests
+import tracing
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from doc_parsing import parse_document
+from html_paragraphs import extract_paragraph_blocks
+from article_body import extract_body
+from mhtml_reader import MhtmlFile
+from phrase_matcher import get_matcher
+from llm_cache import LLMCache, make_key
+from manifest import Manifest, config_fingerprint
+from kb_writer import KnowledgeBaseWriter, GroupedEntries, export_json
+from kb_index import KnowledgeIndex
+from sharding import add_shard_arguments, in_shard, shard_dir, shard_dirs, merge_jsonl, iter_sources
+from rate_limit import RateLimiter
+from token_budget import count_tokens, make_windows
 
 GROQ_API_KEY = "Enter_Your_Groq_API_Key_Here"
+# Point this at a local stub (e.g. benchmarks/fake_llm_server.py) to run offline
+GROQ_API_URL = os.environ.get("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+GROQ_MODEL = "llama3-70b-8192"
+
+# Responses are cached on disk by (model, prompt, params); reruns on an unchanged corpus are free
+LLM_CACHE = LLMCache()
+
+# Concurrency and Groq rate limits for the per-page cleaning calls
+LLM_CONCURRENCY = 4               # Pages cleaned in parallel (1 = strictly sequential)
+LLM_REQUESTS_PER_MINUTE = 30
+LLM_TOKENS_PER_MINUTE = 6000
+
+# Long pages are cleaned in overlapping windows of at most this many prompt tokens
+# (counted locally), sent concurrently. 0 sends each page in one prompt, as before.
+LLM_WINDOW_TOKENS = 3000
+LLM_WINDOW_OVERLAP = 1            # Paragraphs repeated between neighbouring windows
+
+# Pages whose article body the local text/link-density scorer finds with at least this
+# confidence (0-1) skip the LLM clean-up entirely. Above 1, every page goes to the LLM.
+LOCAL_CLEAN_CONFIDENCE = 0.6
+
+# Pooled keep-alive connections and the shared limiter; rebuilt by configure_llm_client()
+SESSION = requests.Session()
+RATE_LIMITER = RateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+WINDOW_POOL = ThreadPoolExecutor(max_workers=max(1, LLM_CONCURRENCY))
+
+TOKENS_SENT = 0                   # Prompt tokens sent to Groq this run (cache hits cost 0)
+CLEAN_PATHS = {"local": 0, "llm": 0}   # HTML pages cleaned by each path this run
+_tokens_lock = threading.Lock()
+
+
+def configure_llm_client():
+    """Sizes the connection pool and rate limiter from the settings above."""
+    global RATE_LIMITER, WINDOW_POOL
+    # Page threads and window threads can all be in flight at once
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, LLM_CONCURRENCY) * 2)
+    SESSION.mount("https://", adapter)
+    SESSION.mount("http://", adapter)
+    RATE_LIMITER = RateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+    WINDOW_POOL.shutdown(wait=False)
+    WINDOW_POOL = ThreadPoolExecutor(max_workers=max(1, LLM_CONCURRENCY))
+
+
+def groq_json_completion(prompt, required_key):
+    """
+    Cached, rate-limited Groq call in JSON mode. Returns the raw JSON content
+    and the prompt tokens actually sent (0 on a cache hit). Answers missing
+    `required_key` raise and are never cached.
+    """
+    params = {"temperature": 0, "response_format": {"type": "json_object"}}
+    messages = [{"role": "user", "content": prompt}]
+    sent = [0]
+
+    def call():
+        tokens = count_tokens(prompt)
+        waited = RATE_LIMITER.acquire(tokens)
+        if waited:
+            tracing.add_span("llm.rate_wait", waited, tokens=tokens)
+
+        with tracing.span("llm.request", api="groq", model=GROQ_MODEL, prompt_tokens=tokens) as span:
+            response = SESSION.post(
+                GROQ_API_URL,
+                headers={"Authorization": f"Bearer {GROQ_API_KEY}"},
+                json={"model": GROQ_MODEL, "messages": messages, **params}
+            )
+            sent[0] = tokens
+            span.set(status=response.status_code, retries=tracing.http_retries(response))
+
+            data = response.json()
+            usage = data.get("usage") or {}
+            span.set(prompt_tokens=usage.get("prompt_tokens", tokens),
+                     completion_tokens=usage.get("completion_tokens"))
+        cleaned = data["choices"][0]["message"]["content"]
+        json.loads(cleaned)[required_key]  # only well-formed answers are cached
+        return cleaned
+
+    try:
+        return LLM_CACHE.get_or_call(make_key(GROQ_MODEL, messages, **params), call), sent[0]
+    finally:
+        record_tokens_sent(sent[0])
+
+
+def record_tokens_sent(tokens):
+    global TOKENS_SENT
+    with _tokens_lock:
+        TOKENS_SENT += tokens
+
 
+def mark_failed(metadata, reason):
+    """Flags a page whose text is a fallback, so it is not recorded and is retried next run."""
+    if metadata is not None:
+        metadata["failed"] = reason
 
-def llm_clean_article(paragraphs):
+
+def record_clean_path(path):
+    with _tokens_lock:
+        CLEAN_PATHS[path] += 1
+
+
+def clean_paths_summary():
+    pages = sum(CLEAN_PATHS.values())
+    if not pages:
+        return "🧽 No HTML pages cleaned this run"
+    return (f"🧽 HTML pages cleaned: {CLEAN_PATHS['local']} locally ({CLEAN_PATHS['local'] / pages:.0%}), "
+            f"{CLEAN_PATHS['llm']} by the LLM ({CLEAN_PATHS['llm'] / pages:.0%}) "
+            f"at confidence threshold {LOCAL_CLEAN_CONFIDENCE}")
+
+
+def llm_clean_article(paragraphs, metadata=None):
     """
     Takes a list of paragraphs extracted from HTML and returns a clean article-only text.
-    Removes garbage, unrelated news, menus, ads, etc.
+    Removes garbage, unrelated news, menus, ads, etc. On an LLM error the raw
+    paragraphs are returned and `metadata` is marked failed.
     """
 
     prompt = f"""
@@ -43,29 +163,83 @@ def llm_clean_article(paragraphs):
     """
 
     try:
-        response = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            headers={"Authorization": f"Bearer {GROQ_API_KEY}"},
-            json={
-                "model": "llama3-70b-8192",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0,
-                "response_format": {"type": "json_object"}
-            }
-        )
-
-        data = response.json()
-        cleaned = data["choices"][0]["message"]["content"]
+        cleaned, _ = groq_json_completion(prompt, "clean_text")
         result = json.loads(cleaned)
         return result["clean_text"]
 
     except Exception as e:
         print(f"[LLM ERROR]: {e}")
+        mark_failed(metadata, "llm")
         return "\n".join(paragraphs)
 
+
+def compact_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def window_prompt(numbered):
+    """The cleaning prompt for one window of `{"id", "text"}` paragraphs."""
+    return f"""You are cleaning raw web-scraped news article paragraphs.
+Input paragraphs (JSON, in page order):
+{compact_json(numbered)}
+Task: keep ONLY paragraphs of the main article body. Drop menus, ads, related articles, "Also read", comments, category labels, author bios, navigation breadcrumbs, and dates/timestamps that are not part of the story.
+Output: a single JSON object {{"keep": [<ids of the article paragraphs, in order>]}}"""
+
+
+def llm_clean_window(paragraphs, first_id, metadata=None):
+    """
+    Cleans one window of a page. Paragraphs are numbered from `first_id` and
+    sent as compact JSON; returns (ids to keep, prompt tokens sent). On any
+    error the whole window is kept and `metadata` is marked failed.
+    """
+    numbered = [{"id": first_id + i, "text": p} for i, p in enumerate(paragraphs)]
+    prompt = window_prompt(numbered)
+
+    try:
+        cleaned, sent = groq_json_completion(prompt, "keep")
+        valid = {item["id"] for item in numbered}
+        return [i for i in json.loads(cleaned)["keep"] if i in valid], sent
+    except Exception as e:
+        print(f"[LLM ERROR]: {e}")
+        mark_failed(metadata, "llm")
+        return [item["id"] for item in numbered], count_tokens(prompt)
+
+
+def llm_clean_article_windowed(paragraphs, metadata=None):
+    """
+    Token-budgeted variant of llm_clean_article for long pages: the page is
+    split into overlapping windows whose whole prompt stays under
+    LLM_WINDOW_TOKENS, the windows are cleaned concurrently, and the kept
+    paragraphs are stitched back in page order (a paragraph in an overlap
+    is kept if either window keeps it).
+
+    Returns (clean_text, prompt tokens sent, number of windows).
+    """
+    if not paragraphs:
+        return "", 0, 0
+
+    # Budget what is actually sent: the instructions once, then every paragraph as its
+    # {"id","text"} JSON object plus the comma separating it from the next
+    overhead = count_tokens(window_prompt([]))
+    costs = [count_tokens(compact_json({"id": i, "text": p})) + 1 for i, p in enumerate(paragraphs)]
+    windows = make_windows(costs, max(1, LLM_WINDOW_TOKENS - overhead), LLM_WINDOW_OVERLAP)
+    results = WINDOW_POOL.map(lambda w: llm_clean_window(paragraphs[w[0]:w[1]], w[0], metadata), windows)
+
+    keep = set()
+    sent = 0
+    for ids, tokens in results:
+        keep.update(ids)
+        sent += tokens
+
+    clean_text = "\n\n".join(p for i, p in enumerate(paragraphs) if i in keep)
+    return clean_text, sent, len(windows)
+
 # --- USER CONFIGURATION ---
 PARENT_DIRECTORY = "newsarticle/html"
 OUTPUT_DIR = "./extracted_data"
+MANIFEST_FILE = "ism_news_manifest.jsonl"   # Per-file hashes + chunks, for incremental reruns
+INDEX_FILES = ["index.html", "index.mhtml", "index.mht"]   # Page looked for in each crawl folder, in order
+KB_INDEX_FILE = "ism_knowledge_index.sqlite"   # Full-text index shared with the website extractor, read by script.py
 
 # --- ENHANCED CONTEXT (UNCHANGED) ---
 SEARCH_CONTEXT = {
@@ -127,73 +301,74 @@ SEARCH_CONTEXT = {
 # FILE READERS (HTML + MHTML + Others)
 # ----------------------------------------------------
 
-def read_html_file(file_path):
-    """Extract readable text from HTML."""
+def read_html_file(file_path, metadata=None):
+    """Extract readable text from HTML. Read or LLM errors mark `metadata` as failed."""
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            soup = BeautifulSoup(f.read(), "lxml")
-        for tag in soup(["script", "style", "noscript"]):
-            tag.extract()
-        # Extract meaningful article paragraphs
-        paragraphs = [p.get_text(" ", strip=True) for p in soup.find_all("p")]
-
-        # Remove tiny junk paragraphs (< 30 chars)
-        paragraphs = [p for p in paragraphs if len(p) > 30]
+        # Extract meaningful article paragraphs, streamed without building a full tree,
+        # and remove tiny junk paragraphs (< 30 chars)
+        with tracing.span("parse.html", path=file_path) as span:
+            blocks = [b for b in extract_paragraph_blocks(file_path) if len(b.text) > 30]
+            paragraphs = [b.text for b in blocks]
+            span.set(paragraphs=len(paragraphs))
+
+        # Pages with one clear, plain-text body need no LLM to find it
+        with tracing.span("clean.local", path=file_path) as span:
+            body = extract_body(blocks)
+            span.set(confidence=body.confidence, kept=len(body.paragraphs))
+        if body.confidence >= LOCAL_CLEAN_CONFIDENCE:
+            record_clean_path("local")
+            print(f"   🧽 {file_path}: body found locally (confidence {body.confidence:.2f})")
+            return "\n\n".join(body.paragraphs)
 
         # Apply LLM cleaning to get the real article content
-        clean_text = llm_clean_article(paragraphs)
+        record_clean_path("llm")
+        with tracing.span("llm.clean", path=file_path, confidence=body.confidence) as span:
+            if LLM_WINDOW_TOKENS > 0:
+                clean_text, tokens, windows = llm_clean_article_windowed(paragraphs, metadata)
+                span.set(tokens_sent=tokens, windows=windows)
+                print(f"   🧮 {file_path}: {tokens} prompt tokens sent in {windows} window(s)")
+            else:
+                clean_text = llm_clean_article(paragraphs, metadata)
 
         return clean_text
 
     except Exception as e:
         print(f"   [Error] Could not read HTML {file_path}: {e}")
+        mark_failed(metadata, "read")
         return ""
 
 
-def read_mhtml_file(file_path):
-    """Extract readable text from MHTML."""
+def read_mhtml_file(file_path, metadata=None):
+    """
+    Extract readable text from MHTML: the paragraphs of its text/html part(s),
+    one per block. The page's original URL goes into `metadata["source_url"]`.
+    """
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            soup = BeautifulSoup(f.read(), "lxml")
-        for tag in soup(["script", "style", "noscript"]):
-            tag.extract()
-        return soup.get_text(separator=" ")
+        with tracing.span("parse.mhtml", path=file_path), MhtmlFile(file_path) as page:
+            if metadata is not None and page.source_url:
+                metadata["source_url"] = page.source_url
+            return "\n\n".join(page.paragraphs())
     except Exception as e:
         print(f"   [Error] Could not read MHTML {file_path}: {e}")
+        mark_failed(metadata, "read")
         return ""
 
 
-def read_file_content(file_path):
+def read_file_content(file_path, metadata=None):
     """Reads content from HTML/MHTML/PDF/DOCX/TXT."""
     try:
         if file_path.endswith(".html") or file_path.endswith(".htm"):
-            return read_html_file(file_path)
+            return read_html_file(file_path, metadata)
 
         elif file_path.endswith(".mhtml") or file_path.endswith(".mht"):
-            return read_mhtml_file(file_path)
-
-        elif file_path.endswith('.pdf'):
-            text = ""
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                t = page.extract_text()
-                if t:
-                    text += t + "\n"
-            return text
-
-        elif file_path.endswith('.docx'):
-            text = ""
-            doc = Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-            return text
-
-        elif file_path.endswith('.txt'):
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
+            return read_mhtml_file(file_path, metadata)
+
+        elif file_path.endswith(('.pdf', '.docx', '.txt')):
+            with tracing.span("parse", path=file_path):
+                return parse_document(file_path, separator="\n")
 
     except:
-        pass
+        mark_failed(metadata, "read")
 
     return ""
 
@@ -204,6 +379,7 @@ def read_file_content(file_path):
 
 def extract_oriented_chunks(text, categories):
     extracted_chunks = []
+    matcher = get_matcher(categories)
 
     paragraphs = text.split('\n\n')
 
@@ -213,19 +389,19 @@ def extract_oriented_chunks(text, categories):
         if len(para_clean) < 30:
             continue
 
-        found_categories = []
-
-        for cat in categories:
-            matches = [p for p in cat['match_phrases'] if p.lower() in para_clean.lower()]
-            if matches:
-                found_categories.append({
-                    "category": cat['category_name'],
-                    "matched_terms": matches
-                })
+        found_categories = matcher.match(para_clean)
 
         if found_categories:
             context_para = paragraphs[i - 1].strip() + "\n\n" if i > 0 else ""
 
+            # Offsets point into the chunk content, after the context paragraph
+            shift = len(context_para)
+            for tag in found_categories:
+                tag["offsets"] = [
+                    [(start + shift, end + shift) for start, end in spans]
+                    for spans in tag["offsets"]
+                ]
+
             extracted_chunks.append({
                 "content": context_para + para_clean,
                 "tags": found_categories
@@ -238,72 +414,207 @@ def extract_oriented_chunks(text, categories):
 # MAIN — SIMPLIFIED (NO LLM, NO RECURSIVE DECISION)
 # ----------------------------------------------------
 
-def main():
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
+def find_index_file(folder_path):
+    """Name of the crawl folder's page: index.html, or a saved index.mhtml/.mht."""
+    for name in INDEX_FILES:
+        if os.path.exists(os.path.join(folder_path, name)):
+            return name
+    return None
 
-    print(f"🚀 Starting Extraction in: {PARENT_DIRECTORY}")
 
-    final_knowledge_base = {}
+def process_folder(foldername, index_name, manifest):
+    """
+    Reads and matches one crawl folder's page, records the resulting
+    knowledge-base entries in the manifest and returns them. Entries of a
+    page that failed to read or clean (fallback text) are returned but not
+    recorded, so the folder is retried on the next run.
+    """
+    source_file = f"{foldername}/{index_name}"
+    index_file_path = os.path.join(PARENT_DIRECTORY, source_file)
+
+    print(f"\n📄 Reading: {source_file}")
+
+    entries = []
+    metadata = {}
+    with tracing.span("read", path=source_file) as span:
+        text = read_file_content(index_file_path, metadata)
+        span.set(chars=len(text))
+    if not text.strip():
+        print(f"   ❌ {foldername}: Empty or unreadable.")
+    else:
+        with tracing.span("match", path=source_file) as span:
+            chunks = extract_oriented_chunks(text, SEARCH_CONTEXT['categories'])
+            span.set(chunks=len(chunks))
 
-    # Iterate through subdirectories in PARENT_DIRECTORY
-    for foldername in os.listdir(PARENT_DIRECTORY):
+        if chunks:
+            print(f"   ✅ {foldername}: Found {len(chunks)} relevant sections.")
+        else:
+            print(f"   ⚠️ {foldername}: No category matches found.")
+
+        for chunk in chunks:
+            for tag in chunk['tags']:
+                entry = {"source_file": source_file}
+                if "source_url" in metadata:
+                    entry["source_url"] = metadata["source_url"]
+                entry["matched_terms"] = tag['matched_terms']
+                entry["text_content"] = chunk['content']
+                entries.append([tag['category'], entry])
+
+    if metadata.get("failed"):
+        print(f"   🔁 {foldername}: {metadata['failed']} error, not recorded; retried on the next run.")
+        return entries
+
+    # Persisted right away, so an interrupted run resumes after this folder
+    manifest.record(source_file, index_file_path, entries)
+    return entries
+
+
+def news_order_key(source_file):
+    """Sorts "folder/index.html" sources by folder name, as main() lists them."""
+    return source_file.split("/", 1)[0]
+
+
+def write_reports(jsonl_path, out_dir):
+    """The grouped JSON export and REPORT.md, built from the JSONL on disk; returns their paths."""
+    json_path = os.path.join(out_dir, "ism_news_extracted.json")
+    md_path = os.path.join(out_dir, "REPORT.md")
+
+    with GroupedEntries(jsonl_path) as grouped:
+        export_json(grouped, json_path)
+
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write("# Extracted IIT (ISM) Knowledge (News Articles)\n\n")
+            for category, items in grouped:
+                f.write(f"## 📂 {category}\n")
+                for item in items:
+                    f.write(f"**Source:** `{item['source_file']}`\n")
+                    if item.get("source_url"):
+                        f.write(f"**URL:** {item['source_url']}\n")
+                    f.write(f"**Matches:** {', '.join(item['matched_terms'])}\n")
+                    f.write(f"> {item['text_content'].replace(chr(10), ' ')}\n\n")
+                f.write("---\n")
+    return json_path, md_path
+
+
+def main(shard=None):
+    """
+    Extracts every crawl folder, or with `shard` = (i, N) only the folders
+    hashed to shard i, into OUTPUT_DIR/shard-i-of-N/ (see merge_shards()).
+    """
+    out_dir = shard_dir(OUTPUT_DIR, shard) if shard else OUTPUT_DIR
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+
+    print(f"🚀 Starting Extraction in: {PARENT_DIRECTORY}" + (f" (shard {shard[0]}/{shard[1]})" if shard else ""))
+
+    configure_llm_client()
+    manifest = Manifest(
+        os.path.join(out_dir, MANIFEST_FILE),
+        config_fingerprint(SEARCH_CONTEXT['categories'], GROQ_MODEL, LOCAL_CLEAN_CONFIDENCE)
+    )
+
+    # Sorted so the knowledge base comes out in the same order on every run
+    source_folders = []
+    index_names = {}
+    changed = set()
+    for foldername in sorted(os.listdir(PARENT_DIRECTORY)):
+        if not in_shard(foldername, shard):
+            continue
         folder_path = os.path.join(PARENT_DIRECTORY, foldername)
 
-        # Check if the folder contains an index.html file
+        # Check if the folder contains an index.html (or saved .mhtml) file
         if not os.path.isdir(folder_path):
             continue
 
-        index_file_path = os.path.join(folder_path, "index.html")
-        if not os.path.exists(index_file_path):
+        index_name = find_index_file(folder_path)
+        if index_name is None:
             print(f"   ⚠️ Skipping {foldername}: No index.html found.")
             continue
 
-        print(f"\n📄 Reading: {foldername}/index.html")
+        source_folders.append(foldername)
+        index_names[foldername] = index_name
+        if manifest.lookup(f"{foldername}/{index_name}", os.path.join(folder_path, index_name)) is None:
+            changed.add(foldername)
+
+    manifest.forget_missing(f"{foldername}/{index_names[foldername]}" for foldername in source_folders)
+    print(f"♻️ {len(source_folders) - len(changed)} unchanged folders reused, {len(changed)} new or changed.")
+
+    def extract(foldername):
+        # None for unchanged folders, whose entries come from the manifest
+        if foldername in changed:
+            return process_folder(foldername, index_names[foldername], manifest)
+        return None
+
+    # Folders are cleaned concurrently and recorded in the manifest as they finish;
+    # map() hands them back in folder order, so the JSONL streams out deterministically
+    # Every folder is synced into the full-text index too; unchanged ones only get their rank refreshed
+    jsonl_path = os.path.join(out_dir, "ism_news_extracted.jsonl")
+    with KnowledgeBaseWriter(jsonl_path) as writer, \
+            KnowledgeIndex(os.path.join(out_dir, KB_INDEX_FILE)) as index, \
+            ThreadPoolExecutor(max_workers=max(1, LLM_CONCURRENCY)) as pool:
+        source_files = []
+        for rank, (foldername, fresh) in enumerate(zip(source_folders, pool.map(extract, source_folders))):
+            source_file = f"{foldername}/{index_names[foldername]}"
+            entries = fresh if fresh is not None else manifest.entries(source_file)
+            for category, entry in entries:
+                writer.add(category, entry, source=source_file)
+            index.sync_source("news", source_file, entries, rank)
+            source_files.append(source_file)
+        index.retain_sources("news", source_files)
+
+    manifest.compact()
+    manifest.close()
+
+    # --- Save Outputs (grouped on disk, never held in memory) ---
+    with tracing.span("write", entries=writer.count):
+        json_path, md_path = write_reports(jsonl_path, out_dir)
 
-        text = read_file_content(index_file_path)
-        if not text.strip():
-            print("   ❌ Empty or unreadable.")
-            continue
+    print("\n🎉 Extraction Complete!")
+    print(f"Saved JSONL → {jsonl_path} ({writer.count} entries)")
+    print(f"Saved JSON → {json_path}")
+    print(f"Saved Markdown → {md_path}")
+    print(f"Indexed → {index.path} ({index.synced} sources updated, {index.unchanged} unchanged)")
+    print(clean_paths_summary())
+    print(LLM_CACHE.summary())
+    print(f"Prompt tokens sent: {TOKENS_SENT}")
+    tracing.finish()
 
-        chunks = extract_oriented_chunks(text, SEARCH_CONTEXT['categories'])
 
-        if chunks:
-            print(f"   ✅ Found {len(chunks)} relevant sections.")
-
-            for chunk in chunks:
-                for tag in chunk['tags']:
-                    category = tag['category']
-                    if category not in final_knowledge_base:
-                        final_knowledge_base[category] = []
-                    final_knowledge_base[category].append({
-                        "source_file": f"{foldername}/index.html",
-                        "matched_terms": tag['matched_terms'],
-                        "text_content": chunk['content']
-                    })
-        else:
-            print("   ⚠️ No category matches found.")
-
-    # --- Save Outputs ---
-    json_path = os.path.join(OUTPUT_DIR, "ism_news_extracted.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(final_knowledge_base, f, indent=2)
-
-    md_path = os.path.join(OUTPUT_DIR, "REPORT.md")
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write("# Extracted IIT (ISM) Knowledge (News Articles)\n\n")
-        for category, items in final_knowledge_base.items():
-            f.write(f"## 📂 {category}\n")
-            for item in items:
-                f.write(f"**Source:** `{item['source_file']}`\n")
-                f.write(f"**Matches:** {', '.join(item['matched_terms'])}\n")
-                f.write(f"> {item['text_content'].replace(chr(10), ' ')}\n\n")
-            f.write("---\n")
+def merge_shards(count):
+    """
+    Combines the outputs of `--shard i/N` runs under OUTPUT_DIR into the
+    same JSONL, JSON, Markdown and index a single run writes: sources in
+    folder order, each taken from one shard only.
+    """
+    dirs = shard_dirs(OUTPUT_DIR, count)
+    print(f"🧩 Merging {count} shards into {OUTPUT_DIR}")
 
-    print("\n🎉 Extraction Complete!")
+    jsonl_path = os.path.join(OUTPUT_DIR, "ism_news_extracted.jsonl")
+    with tracing.span("merge", shards=count):
+        entries, duplicates = merge_jsonl([os.path.join(d, "ism_news_extracted.jsonl") for d in dirs],
+                                          jsonl_path, news_order_key)
+
+    with tracing.span("write", entries=entries):
+        json_path, md_path = write_reports(jsonl_path, OUTPUT_DIR)
+
+    with KnowledgeIndex(os.path.join(OUTPUT_DIR, KB_INDEX_FILE)) as index:
+        source_files = []
+        for rank, (source_file, source_entries) in enumerate(iter_sources(jsonl_path)):
+            index.sync_source("news", source_file, source_entries, rank)
+            source_files.append(source_file)
+        index.retain_sources("news", source_files)
+
+    print(f"Saved JSONL → {jsonl_path} ({entries} entries, {duplicates} duplicates dropped)")
     print(f"Saved JSON → {json_path}")
     print(f"Saved Markdown → {md_path}")
+    print(f"Indexed → {index.path} ({index.synced} sources updated, {index.unchanged} unchanged)")
+    tracing.finish()
+
 
-       
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Extract IIT (ISM) knowledge from crawled news pages")
+    args = add_shard_arguments(parser).parse_args()
+    if args.merge is not None:
+        merge_shards(args.merge)
+    else:
+        main(args.shard)
@@ -0,0 +1,126 @@
+from collections import namedtuple
+from lxml import etree
+
+# --- CONFIGURATION ---
+CHUNK_SIZE = 64 * 1024          # Characters fed to the parser per step
+SKIP_TAGS = {"script", "style", "noscript"}
+
+# One <p> with what a boilerplate scorer needs: its text, how much of that
+# text is inside links, and the (tag, id, class) path of its ancestors
+ParagraphBlock = namedtuple("ParagraphBlock", ["text", "link_chars", "container"])
+
+
+def _text_pieces(element):
+    """
+    Yields the stripped text nodes under `element` in document order,
+    leaving out script/style/noscript subtrees and comments (but not the
+    text that follows them).
+    """
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in SKIP_TAGS:
+            yield from _text_pieces(child)
+        if child.tail:
+            yield child.tail
+
+
+def _paragraph_text(element):
+    # Same joining rule as BeautifulSoup's get_text(" ", strip=True)
+    return " ".join(s for s in (piece.strip() for piece in _text_pieces(element)) if s)
+
+
+def _link_chars(element):
+    """Characters of stripped text inside <a> elements under `element`."""
+    return sum(len(_paragraph_text(a)) for a in element.iter("a"))
+
+
+def _container(element):
+    path = []
+    parent = element.getparent()
+    while parent is not None:
+        path.append((parent.tag, parent.get("id", ""), parent.get("class", "")))
+        parent = parent.getparent()
+    return tuple(reversed(path))
+
+
+def _paragraph_block(element):
+    return ParagraphBlock(_paragraph_text(element), _link_chars(element), _container(element))
+
+
+def iter_chunks(file_path, chunk_size=CHUNK_SIZE):
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        for chunk in iter(lambda: f.read(chunk_size), ""):
+            yield chunk
+
+
+def iter_paragraphs(chunks, describe=_paragraph_text):
+    """
+    Streams the text of every <p> element, in document order, from an
+    iterable of HTML text chunks.
+
+    The chunks go through libxml2's HTML pull parser, the same parser
+    BeautifulSoup(..., "lxml") drives, so implicit paragraph closing works
+    the same way and the output equals
+        [p.get_text(" ", strip=True) for p in soup.find_all("p")]
+    after script/style/noscript have been removed. Nothing outside an open
+    paragraph is kept: finished elements are cleared as soon as they close,
+    so memory stays bounded by the largest single paragraph.
+
+    `describe(element)` turns each closed <p> into what is yielded (its
+    text by default); the element's ancestors are still attached then.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"), recover=True)
+    open_paragraphs = 0   # <p> elements currently open, outside skipped subtrees
+    pending = []          # Paragraphs in start order, held until the outermost one closes
+    skip_depth = 0        # Nesting depth inside script/style/noscript
+
+    def drain():
+        nonlocal open_paragraphs, skip_depth
+        for event, element in parser.read_events():
+            tag = element.tag
+            if event == "start":
+                if tag in SKIP_TAGS:
+                    skip_depth += 1
+                elif tag == "p" and not skip_depth:
+                    open_paragraphs += 1
+                    pending.append(element)
+                continue
+
+            if tag in SKIP_TAGS:
+                skip_depth -= 1
+            elif tag == "p" and not skip_depth:
+                open_paragraphs -= 1
+                if not open_paragraphs:
+                    # Malformed markup can nest paragraphs; report them in start order
+                    for paragraph in pending:
+                        yield describe(paragraph)
+                    pending.clear()
+
+            if not open_paragraphs:
+                # Nothing can still need this subtree; drop it and its finished siblings
+                element.clear(keep_tail=False)
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        pass
+    yield from drain()
+
+
+def extract_paragraphs(file_path):
+    """Returns the list of <p> texts of an HTML file (see iter_paragraphs)."""
+    return list(iter_paragraphs(iter_chunks(file_path)))
+
+
+def extract_paragraph_blocks(file_path):
+    """Returns a ParagraphBlock for every <p> of an HTML file, in document order."""
+    return list(iter_paragraphs(iter_chunks(file_path), describe=_paragraph_block))
@@ -0,0 +1,276 @@
+import re
+import json
+import sqlite3
+import hashlib
+from kb_writer import export_json
+
+# --- CONFIGURATION ---
+BUSY_TIMEOUT = 120.0        # Seconds a writer waits for the other extractor's transaction
+
+_YEAR_RE = re.compile(r"\b(18\d{2}|19\d{2}|20\d{2})\b")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    origin TEXT NOT NULL,
+    source TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (origin, source)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    origin TEXT NOT NULL,
+    source TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_by_source ON chunks (origin, source);
+CREATE TABLE IF NOT EXISTS tags (
+    chunk_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_by_category ON tags (category, chunk_id);
+CREATE INDEX IF NOT EXISTS tags_by_chunk ON tags (chunk_id);
+CREATE TABLE IF NOT EXISTS terms (
+    chunk_id INTEGER NOT NULL,
+    term TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS terms_by_term ON terms (term, chunk_id);
+CREATE INDEX IF NOT EXISTS terms_by_chunk ON terms (chunk_id);
+CREATE TABLE IF NOT EXISTS years (
+    chunk_id INTEGER NOT NULL,
+    year INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS years_by_year ON years (year, chunk_id);
+CREATE INDEX IF NOT EXISTS years_by_chunk ON years (chunk_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5 (text, terms, tokenize = 'unicode61');
+"""
+
+
+def entries_digest(entries):
+    """Fingerprint of one source's `[category, entry]` list, to skip unchanged sources."""
+    payload = json.dumps(entries, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fts_phrase(phrase):
+    """An FTS5 query matching `phrase` as a phrase (quotes escaped)."""
+    return '"' + phrase.replace('"', '""') + '"'
+
+
+class KnowledgeIndex:
+    """
+    SQLite store of knowledge-base entries with an FTS5 index over their text.
+
+    Entries are grouped by `origin` ("news", "website", "website_text") and
+    by source file. Each distinct chunk text of a source is stored once, with
+    one tag row per (category, entry) it was filed under, its matched terms
+    and the years it mentions. Sources are replaced as a whole and skipped
+    when their entries are unchanged, so the extractors can sync every source
+    on every run and only pay for what changed.
+
+    Every source is written in its own short transaction, so the two
+    extractors can sync into the same file concurrently: neither holds the
+    write lock while it parses or waits on the LLM between sources.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.synced = 0
+        self.unchanged = 0
+
+    # ---------------- writing ----------------
+
+    def digest(self, origin, source):
+        row = self.conn.execute("SELECT digest FROM sources WHERE origin = ? AND source = ?",
+                                (origin, source)).fetchone()
+        return row[0] if row else None
+
+    def sync_source(self, origin, source, entries, rank, digest=None):
+        """
+        Makes the index hold exactly `entries` (`[category, entry]` pairs) for
+        one source, at position `rank` in its origin's output order, and
+        commits. Returns True if the source had to be (re)written.
+        """
+        digest = digest or entries_digest(entries)
+        if self.digest(origin, source) == digest:
+            self.conn.execute("UPDATE sources SET rank = ? WHERE origin = ? AND source = ?", (rank, origin, source))
+            self.unchanged += 1
+            changed = False
+        else:
+            self._delete_source(origin, source)
+            self._insert(origin, source, entries)
+            self.conn.execute("INSERT INTO sources (origin, source, rank, digest) VALUES (?, ?, ?, ?)",
+                              (origin, source, rank, digest))
+            self.synced += 1
+            changed = True
+
+        self.commit()
+        return changed
+
+    def _insert(self, origin, source, entries):
+        chunk_ids = {}
+        chunk_terms = {}
+        for seq, (category, entry) in enumerate(entries):
+            text = entry["text_content"]
+            chunk_id = chunk_ids.get(text)
+            if chunk_id is None:
+                chunk_id = self.conn.execute("INSERT INTO chunks (origin, source, text) VALUES (?, ?, ?)",
+                                             (origin, source, text)).lastrowid
+                chunk_ids[text] = chunk_id
+                chunk_terms[chunk_id] = {}
+                self.conn.executemany("INSERT INTO years (chunk_id, year) VALUES (?, ?)",
+                                      [(chunk_id, int(y)) for y in dict.fromkeys(_YEAR_RE.findall(text))])
+            for term in entry.get("matched_terms", []):
+                chunk_terms[chunk_id].setdefault(term.lower(), term)
+            self.conn.execute("INSERT INTO tags (chunk_id, seq, category, entry) VALUES (?, ?, ?, ?)",
+                              (chunk_id, seq, category, json.dumps(entry, ensure_ascii=False)))
+
+        for text, chunk_id in chunk_ids.items():
+            terms = list(chunk_terms[chunk_id].values())
+            self.conn.executemany("INSERT INTO terms (chunk_id, term) VALUES (?, ?)",
+                                  [(chunk_id, t) for t in terms])
+            self.conn.execute("INSERT INTO chunks_fts (rowid, text, terms) VALUES (?, ?, ?)",
+                              (chunk_id, text, " | ".join(terms)))
+
+    def _delete_source(self, origin, source):
+        ids = [row[0] for row in self.conn.execute(
+            "SELECT id FROM chunks WHERE origin = ? AND source = ?", (origin, source))]
+        for table in ("tags", "terms", "years"):
+            self.conn.executemany(f"DELETE FROM {table} WHERE chunk_id = ?", [(i,) for i in ids])
+        self.conn.executemany("DELETE FROM chunks_fts WHERE rowid = ?", [(i,) for i in ids])
+        self.conn.execute("DELETE FROM chunks WHERE origin = ? AND source = ?", (origin, source))
+        self.conn.execute("DELETE FROM sources WHERE origin = ? AND source = ?", (origin, source))
+
+    def retain_sources(self, origin, present):
+        """Removes every source of `origin` that is not in `present`; returns how many."""
+        present = set(present)
+        gone = [s for (s,) in self.conn.execute("SELECT source FROM sources WHERE origin = ?", (origin,))
+                if s not in present]
+        for source in gone:
+            self._delete_source(origin, source)
+        self.commit()
+        return len(gone)
+
+    def has_origin(self, origin):
+        return self.conn.execute("SELECT 1 FROM sources WHERE origin = ? LIMIT 1", (origin,)).fetchone() is not None
+
+    def import_json(self, origin, json_path):
+        """
+        Loads a `{category: [entry, ...]}` export (as the extractors write it)
+        under `origin`, one source per `source_file`, in file order.
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            grouped = json.load(f)
+
+        by_source = {}
+        for category, items in grouped.items():
+            for entry in items:
+                by_source.setdefault(entry.get("source_file", ""), []).append([category, entry])
+
+        for rank, (source, entries) in enumerate(by_source.items()):
+            self.sync_source(origin, source, entries, rank)
+        self.retain_sources(origin, by_source)
+        self.commit()
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.conn.rollback()
+            self.conn.close()
+
+    # ---------------- querying ----------------
+
+    def category_entries(self, category, origins):
+        """
+        Entries filed under `category`, origin by origin in the given order,
+        then in each origin's output order (source rank, entry order).
+        """
+        for origin in origins:
+            rows = self.conn.execute(
+                "SELECT t.entry FROM tags t JOIN chunks c ON c.id = t.chunk_id "
+                "JOIN sources s ON s.origin = c.origin AND s.source = c.source "
+                "WHERE t.category = ? AND c.origin = ? ORDER BY s.rank, t.seq",
+                (category, origin))
+            for (entry,) in rows:
+                yield json.loads(entry)
+
+    def search(self, phrase=None, category=None, term=None, source=None, year=None, origin=None, limit=20):
+        """
+        Chunks matching every given filter: `phrase` through FTS5 (results
+        ranked by bm25), `category`, a matched `term`, `source` file, `year`
+        mentioned, or `origin`. Returns dicts with id, origin, source, text,
+        categories and (for phrase queries) rank.
+        """
+        joins, where, params = [], [], []
+        if phrase:
+            joins.append("JOIN chunks_fts f ON f.rowid = c.id")
+            where.append("chunks_fts MATCH ?")
+            params.append(fts_phrase(phrase))
+        if category:
+            where.append("EXISTS (SELECT 1 FROM tags t WHERE t.chunk_id = c.id AND t.category = ?)")
+            params.append(category)
+        if term:
+            where.append("EXISTS (SELECT 1 FROM terms m WHERE m.chunk_id = c.id AND m.term = ?)")
+            params.append(term)
+        if source:
+            where.append("c.source = ?")
+            params.append(source)
+        if year:
+            where.append("EXISTS (SELECT 1 FROM years y WHERE y.chunk_id = c.id AND y.year = ?)")
+            params.append(int(year))
+        if origin:
+            where.append("c.origin = ?")
+            params.append(origin)
+
+        rank = "bm25(chunks_fts)" if phrase else "NULL"
+        sql = (f"SELECT c.id, c.origin, c.source, c.text, {rank} FROM chunks c {' '.join(joins)} "
+               f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+               f"ORDER BY {'5' if phrase else 'c.id'} LIMIT ?")
+        results = []
+        for chunk_id, chunk_origin, chunk_source, text, score in self.conn.execute(sql, params + [limit]):
+            categories = [c for (c,) in self.conn.execute(
+                "SELECT DISTINCT category FROM tags WHERE chunk_id = ?", (chunk_id,))]
+            results.append({"id": chunk_id, "origin": chunk_origin, "source": chunk_source, "text": text,
+                            "categories": categories, "rank": score})
+        return results
+
+    def export_json(self, origin, json_path):
+        """Writes `origin`'s entries as the same `{category: [entry, ...]}` JSON the extractors export."""
+        export_json(IndexedEntries(self, origin), json_path)
+
+
+class IndexedEntries:
+    """
+    Grouped view of one origin for kb_writer.export_json: categories in
+    order of first appearance, entries in output order.
+    """
+
+    def __init__(self, index, origin):
+        self.index = index
+        self.origin = origin
+        self.categories = list(dict.fromkeys(
+            category for (category,) in index.conn.execute(
+                "SELECT t.category FROM tags t JOIN chunks c ON c.id = t.chunk_id "
+                "JOIN sources s ON s.origin = c.origin AND s.source = c.source "
+                "WHERE c.origin = ? ORDER BY s.rank, t.seq", (origin,))))
+
+    def __iter__(self):
+        for category in self.categories:
+            yield category, self.index.category_entries(category, [self.origin])
@@ -0,0 +1,220 @@
+import os
+import re
+import json
+import shutil
+import tempfile
+
+
+class KnowledgeBaseWriter:
+    """
+    Streams knowledge-base entries to a JSONL file, one `{"category", "entry"}`
+    object per line, instead of collecting them in one in-memory dict.
+
+    The grouped views (the classic `{category: [entry, ...]}` JSON and the
+    Markdown reports) are produced afterwards from the JSONL with an on-disk
+    group-by, so memory stays flat however large the corpus is.
+    """
+
+    def __init__(self, jsonl_path):
+        self.jsonl_path = jsonl_path
+        self.count = 0
+        self._tmp_path = f"{jsonl_path}.tmp"
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+
+    def add(self, category, entry, source=None):
+        """`source` (the input the entry came from) is kept for merging shard outputs."""
+        record = {"category": category, "entry": entry}
+        if source is not None:
+            record["source"] = source
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        """Finishes the JSONL; it only replaces the previous one once complete."""
+        self._file.close()
+        os.replace(self._tmp_path, self.jsonl_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # The previous JSONL stays; the unfinished one is dropped
+            self._file.close()
+            os.remove(self._tmp_path)
+
+
+def iter_jsonl(jsonl_path):
+    """Yields (category, entry) pairs from a knowledge-base JSONL file."""
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["category"], record["entry"]
+
+
+class GroupedEntries:
+    """
+    On-disk group-by of a knowledge-base JSONL file.
+
+    One pass spills every entry into a per-category file; categories keep
+    the order in which they first appeared and entries keep their order
+    within a category. Use as a context manager so the spill files go away.
+    """
+
+    def __init__(self, jsonl_path):
+        self._dir = tempfile.mkdtemp(prefix="kb_groupby_", dir=os.path.dirname(os.path.abspath(jsonl_path)))
+        self.categories = []
+        self._paths = {}
+
+        handles = {}
+        try:
+            with open(jsonl_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    category = json.loads(line)["category"]
+                    if category not in handles:
+                        path = os.path.join(self._dir, f"{len(self.categories)}.jsonl")
+                        self.categories.append(category)
+                        self._paths[category] = path
+                        handles[category] = open(path, "w", encoding="utf-8")
+                    handles[category].write(line if line.endswith("\n") else line + "\n")
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    def entries(self, category):
+        """Streams the entries of one category, in their original order."""
+        for _, entry in iter_jsonl(self._paths[category]):
+            yield entry
+
+    def __iter__(self):
+        for category in self.categories:
+            yield category, self.entries(category)
+
+    def cleanup(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+
+def export_json(grouped, json_path):
+    """
+    Writes the `{category: [entry, ...]}` export byte-for-byte as
+    `json.dump(..., indent=2)` would, one entry at a time.
+    """
+    tmp_path = f"{json_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        if not grouped.categories:
+            f.write("{}")
+        for i, (category, entries) in enumerate(grouped):
+            f.write("{\n" if i == 0 else ",\n")
+            f.write(f"  {json.dumps(category)}: [")
+            for j, entry in enumerate(entries):
+                f.write("\n    " if j == 0 else ",\n    ")
+                f.write(json.dumps(entry, indent=2).replace("\n", "\n    "))
+            f.write("\n  ]")
+        if grouped.categories:
+            f.write("\n}")
+    os.replace(tmp_path, json_path)
+
+
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+_NUMBER_TAIL = set("0123456789.eE+-") | {""}
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _JsonStream:
+    """Chunked reader over a JSON text that decodes one value at a time."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size):
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """The next non-whitespace character, not consumed ("" at the end of the file)."""
+        while True:
+            self.pos = _WHITESPACE_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, chars):
+        c = self.peek()
+        if not c or c not in chars:
+            found = repr(c) if c else "end of file"
+            raise ValueError(f"Expected one of {chars!r}, found {found}")
+        self.pos += 1
+        return c
+
+    def value(self):
+        """Decodes the next complete value, reading further chunks until it is whole."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                # A number could still continue in the next chunk ("2" of "2.5",
+                # "2." of "2.5e3"): it is whole only once a character that cannot
+                # extend it follows, or the file has ended
+                if self.eof or not (self.buf[end:end + 1] in _NUMBER_TAIL and _is_number(value)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill(size):
+                continue
+            size *= 2
+
+
+def iter_grouped_json(json_path, chunk_size=1 << 16):
+    """
+    Yields (category, entry) pairs from a `{category: [entry, ...]}` export
+    without loading it: the file is read in chunks and only one entry is
+    decoded at a time, so memory is bounded by the largest entry.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            category = stream.value()
+            stream.expect(":")
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.pos += 1
+            else:
+                while True:
+                    yield category, stream.value()
+                    if stream.expect(",]") == "]":
+                        break
+            if stream.expect(",}") == "}":
+                return
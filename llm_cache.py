@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+# --- CONFIGURATION ---
+CACHE_DIR = os.path.join(".cache", "llm")
+MAX_CACHE_BYTES = 512 * 1024 * 1024      # Evict least-recently-used entries above this size
+MAX_ENTRY_AGE = 30 * 24 * 60 * 60        # Entries unused for longer than this (seconds) count as misses
+
+
+def make_key(model, prompt, **params):
+    """
+    Content address of one LLM request: a SHA-256 over the model, the prompt
+    (a string or a messages list) and every generation parameter.
+    """
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    On-disk, content-addressed store of LLM responses.
+
+    Each entry is a small JSON file named by its key. A hit refreshes the
+    file's mtime, so eviction can drop the least recently used entries once
+    the cache grows past `max_bytes`. Entries whose mtime is more than
+    `max_age` seconds old (unused that long) are treated as misses and
+    removed, by get() and evict() alike.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_age=MAX_ENTRY_AGE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Returns the cached value for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                used = os.fstat(f.fileno()).st_mtime
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Age is time since last use (the mtime), as evict() measures it
+        now = time.time()
+        if self.max_age and now - used > self.max_age:
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        return entry["value"]
+
+    def put(self, key, value):
+        """Stores a JSON-serialisable `value` under `key`."""
+        path = self._path(key)
+        data = json.dumps({"created": time.time(), "value": value}, ensure_ascii=False)
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            # An overwritten entry's bytes leave the cache with it
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"   [Cache] Could not write {path}: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data.encode("utf-8")) - replaced
+            over_budget = self.max_bytes and self._size() > self.max_bytes
+
+        if over_budget:
+            self.evict()
+
+    def get_or_call(self, key, call):
+        """Returns the cached value, or runs `call()` and caches what it returns."""
+        value = self.get(key)
+        if value is None:
+            value = call()
+            self.put(key, value)
+        return value
+
+    def evict(self):
+        """Drops expired entries, then the least recently used until under budget."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        # Trim a little below the budget so the next few puts don't re-walk the tree
+        target = self.max_bytes * 0.9 if self.max_bytes else None
+
+        for mtime, size, path in entries:
+            expired = self.max_age and now - mtime > self.max_age
+            if not expired and (target is None or total <= target):
+                break
+            self._remove(path)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+        with self._lock:
+            self._total_bytes = total
+
+    def _size(self):
+        # Caller holds the lock; the directory is only walked once per process.
+        if self._total_bytes is None:
+            total = 0
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    try:
+                        total += os.path.getsize(os.path.join(root, name))
+                    except OSError:
+                        pass
+            self._total_bytes = total
+        return self._total_bytes
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = (100.0 * self.hits / total) if total else 0.0
+        return f"LLM cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), {self.evictions} evicted"
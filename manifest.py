@@ -0,0 +1,171 @@
+import os
+import json
+import hashlib
+import threading
+
+
+def file_sha256(file_path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def config_fingerprint(*parts):
+    """Hash of whatever settings change extraction output (phrases, models...)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Manifest:
+    """
+    Append-only journal of processed input files.
+
+    Each line records one file's size, mtime, content hash and the knowledge
+    base entries it produced, as `[category, entry]` pairs. Lines are flushed
+    as soon as a file is done, so a crashed run resumes where it stopped; the
+    last line for a key wins. The first line stores the config fingerprint:
+    when it changes, every previous record is discarded.
+
+    Only the stat/hash fields and each record's byte offset are held in
+    memory; entries are read back from the journal when asked for.
+    """
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.records = {}
+        self._lock = threading.Lock()
+        self._load()
+        self._journal = open(self.path, "ab")
+        self._reader = open(self.path, "rb")
+        if self._journal.tell() == 0:
+            self._append({"config": self.fingerprint})
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "rb+") as f:
+            header_line = f.readline()
+            try:
+                header = json.loads(header_line) if header_line.endswith(b"\n") else {}
+            except ValueError:
+                header = {}
+            if header.get("config") != self.fingerprint:
+                if header_line:
+                    print(f"   ♻️ Settings changed since {self.path} was written; reprocessing everything.")
+                f.truncate(0)
+                return
+
+            offset = f.tell()
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Drop the torn final line of an interrupted run before appending after it
+                    f.truncate(offset)
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if record is not None:
+                    if record.get("deleted"):
+                        self.records.pop(record["key"], None)
+                    else:
+                        self.records[record["key"]] = self._meta(record, offset)
+                offset += len(line)
+
+    @staticmethod
+    def _meta(record, offset):
+        meta = {k: v for k, v in record.items() if k != "entries"}
+        meta["offset"] = offset
+        return meta
+
+    def _append(self, record):
+        """Writes one journal line and returns its byte offset."""
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            offset = self._journal.tell()
+            self._journal.write(data)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        return offset
+
+    def _read(self, offset):
+        with self._lock:
+            self._reader.seek(offset)
+            return json.loads(self._reader.readline())
+
+    def lookup(self, key, file_path):
+        """
+        Returns the stored record if `file_path` is unchanged since it was
+        recorded under `key`, else None. Size and mtime are checked first;
+        the content hash is only computed when they differ.
+        """
+        record = self.records.get(key)
+        if record is None:
+            return None
+
+        st = os.stat(file_path)
+        if st.st_size == record["size"] and st.st_mtime_ns == record["mtime_ns"]:
+            return record
+
+        if st.st_size == record["size"] and file_sha256(file_path) == record["sha256"]:
+            # Touched but not modified: refresh the stat fields, keep the entries
+            full = dict(self._read(record["offset"]), mtime_ns=st.st_mtime_ns)
+            record = self._meta(full, self._append(full))
+            self.records[key] = record
+            return record
+
+        return None
+
+    def record(self, key, file_path, entries, **extra):
+        """Stores the entries produced from `file_path` and persists them immediately."""
+        st = os.stat(file_path)
+        full = {
+            "key": key,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": file_sha256(file_path),
+            "entries": entries,
+            **extra
+        }
+        record = self._meta(full, self._append(full))
+        with self._lock:
+            self.records[key] = record
+        return record
+
+    def forget_missing(self, present_keys):
+        """Drops records for input files that no longer exist."""
+        present = set(present_keys)
+        for key in [k for k in self.records if k not in present]:
+            del self.records[key]
+            self._append({"key": key, "deleted": True})
+
+    def entries(self, key):
+        """The `[category, entry]` pairs recorded for `key`, read from the journal."""
+        record = self.records.get(key)
+        return self._read(record["offset"])["entries"] if record else []
+
+    def compact(self):
+        """Rewrites the journal with only the live records."""
+        tmp_path = f"{self.path}.tmp"
+        with self._lock, open(tmp_path, "wb") as out:
+            out.write((json.dumps({"config": self.fingerprint}) + "\n").encode("utf-8"))
+            for record in self.records.values():
+                self._reader.seek(record["offset"])
+                line = self._reader.readline()
+                record["offset"] = out.tell()
+                out.write(line)
+
+        with self._lock:
+            self._journal.close()
+            self._reader.close()
+            os.replace(tmp_path, self.path)
+            self._journal = open(self.path, "ab")
+            self._reader = open(self.path, "rb")
+
+    def close(self):
+        self._journal.close()
+        self._reader.close()
@@ -0,0 +1,132 @@
+import mmap
+import codecs
+import binascii
+from collections import namedtuple
+from email.parser import BytesHeaderParser
+
+from html_paragraphs import iter_paragraphs
+
+# --- CONFIGURATION ---
+DECODE_BLOCK = 256 * 1024    # Encoded bytes decoded per step
+
+# One MIME part: its parsed headers and the byte range of its (still encoded) body
+MhtmlPart = namedtuple("MhtmlPart", ["headers", "start", "end"])
+
+
+def _header_block(buf, pos):
+    """Parses the header block starting at `pos`; returns (headers, body offset)."""
+    ends = [(i, len(sep)) for sep in (b"\r\n\r\n", b"\n\n") for i in [buf.find(sep, pos)] if i >= 0]
+    if not ends:
+        return BytesHeaderParser().parsebytes(buf[pos:]), len(buf)
+    end, sep_len = min(ends)
+    return BytesHeaderParser().parsebytes(buf[pos:end + sep_len]), end + sep_len
+
+
+class MhtmlFile:
+    """
+    Saved web page (.mhtml/.mht) read through a memory map.
+
+    MIME parts are located lazily by scanning for the multipart boundary;
+    only the parts that are asked for get decoded, so embedded images, fonts
+    and stylesheets are never copied out of the map. `source_url` is the
+    address the page was saved from, taken from the top-level headers.
+    """
+
+    def __init__(self, file_path):
+        self.path = file_path
+        self._file = open(file_path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{file_path} is empty")
+
+        self.headers, self._body_start = _header_block(self._map, 0)
+        url = self.headers.get("Snapshot-Content-Location") or self.headers.get("Content-Location")
+        self.source_url = "".join(str(url).split()) if url else None
+
+    def parts(self):
+        """Yields the MhtmlPart of every MIME part, in file order."""
+        buf = self._map
+        boundary = self.headers.get_param("boundary")
+        if self.headers.get_content_maintype() != "multipart" or not boundary:
+            yield MhtmlPart(self.headers, self._body_start, len(buf))
+            return
+
+        delimiter = b"--" + boundary.encode("ascii", "ignore")
+        pos = buf.find(delimiter, self._body_start)
+        while pos >= 0:
+            pos += len(delimiter)
+            if buf[pos:pos + 2] == b"--":
+                return    # Closing delimiter
+
+            line_end = buf.find(b"\n", pos)
+            if line_end < 0:
+                return
+            headers, start = _header_block(buf, line_end + 1)
+
+            next_pos = buf.find(b"\n" + delimiter, start)
+            end = next_pos if next_pos >= 0 else len(buf)
+            if end > start and buf[end - 1:end] == b"\r":
+                end -= 1
+            yield MhtmlPart(headers, start, end)
+
+            pos = next_pos + 1 if next_pos >= 0 else -1
+
+    def text_chunks(self, part):
+        """Decodes a text part block by block, undoing its transfer encoding and charset."""
+        encoding = (part.headers.get("Content-Transfer-Encoding") or "").strip().lower()
+        try:
+            decoder = codecs.getincrementaldecoder(part.headers.get_content_charset() or "utf-8")(errors="ignore")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+
+        pos, carry = part.start, b""
+        while pos < part.end:
+            stop = min(pos + DECODE_BLOCK, part.end)
+            if encoding == "quoted-printable" and stop < part.end:
+                # Cut after a line break (or before a trailing "=") so no =XX escape or soft break is split
+                newline = self._map.rfind(b"\n", pos, stop)
+                if newline >= pos:
+                    stop = newline + 1
+                else:
+                    escape = self._map.rfind(b"=", max(pos + 1, stop - 2), stop)
+                    if escape > pos:
+                        stop = escape
+            block = self._map[pos:stop]
+            pos = stop
+
+            if encoding == "quoted-printable":
+                data = binascii.a2b_qp(block)
+            elif encoding == "base64":
+                block = carry + block.translate(None, b" \t\r\n")
+                cut = len(block) - len(block) % 4
+                data, carry = binascii.a2b_base64(block[:cut]), block[cut:]
+            else:
+                data = block
+
+            text = decoder.decode(data)
+            if text:
+                yield text
+
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def html_parts(self):
+        return (part for part in self.parts() if part.headers.get_content_type() == "text/html")
+
+    def paragraphs(self):
+        """Streams the <p> texts of every text/html part (the page, then any frames)."""
+        for part in self.html_parts():
+            yield from iter_paragraphs(self.text_chunks(part))
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,158 @@
+import os
+from collections import namedtuple
+
+# kbps by [MPEG-1?][layer]; index 0 is "free format", which is not supported
+_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Hz by version bits: 0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1
+_SAMPLE_RATES = {0: [11025, 12000, 8000], 2: [22050, 24000, 16000], 3: [44100, 48000, 32000]}
+
+FrameHeader = namedtuple("FrameHeader", ["version", "layer", "sample_rate", "channels", "length"])
+
+
+def parse_header(data, pos):
+    """Decodes the 4-byte MPEG audio frame header at `pos`, or returns None if there isn't one."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+
+    version = (b1 >> 3) & 3
+    layer = 4 - ((b1 >> 1) & 3)          # Bits 11/10/01 are layers I/II/III
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 1
+
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if layer == 2 or mpeg1 else 576
+        length = samples // 8 * bitrate // sample_rate + padding
+
+    channels = 1 if b3 >> 6 == 3 else 2
+    return FrameHeader(version, layer, sample_rate, channels, length)
+
+
+def _id3v2_size(data):
+    """Length of a leading ID3v2 tag (header, body and optional footer), or 0."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for b in data[6:10]:
+        size = (size << 7) | (b & 0x7F)     # Syncsafe integer
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_info_frame(data, pos, header):
+    """True for the Xing/Info/VBRI header frame an encoder puts first: it carries no audio."""
+    if header.layer != 3:
+        return False
+    if header.version == 3:
+        side_info = 17 if header.channels == 1 else 32
+    else:
+        side_info = 9 if header.channels == 1 else 17
+    tag = data[pos + 4 + side_info:pos + 8 + side_info]
+    return tag in (b"Xing", b"Info") or data[pos + 36:pos + 40] == b"VBRI"
+
+
+def iter_frames(data):
+    """
+    Yields (offset, header) for every audio frame in an MP3 byte string.
+
+    ID3v2/ID3v1/APE tags and the Xing/Info/VBRI frame are skipped, and
+    garbage between frames is resynced past: a candidate header only counts
+    when the next frame header (or the end of data) follows right after it.
+    """
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    if end >= 32 and data[end - 32:end - 24] == b"APETAGEX":
+        end -= 32 + int.from_bytes(data[end - 20:end - 16], "little")
+    data = memoryview(data)[:end]
+
+    pos = _id3v2_size(data)
+    first = True
+    while pos + 4 <= end:
+        header = parse_header(data, pos)
+        if header is None or pos + header.length > end or (
+                pos + header.length < end and parse_header(data, pos + header.length) is None):
+            pos += 1
+            continue
+
+        if not (first and _is_info_frame(data, pos, header)):
+            yield pos, header
+        first = False
+        pos += header.length
+
+
+class Mp3Concatenator:
+    """
+    Builds one MP3 file by appending the frames of other MP3s, without
+    re-encoding. All parts must share a sample rate and channel count.
+    The output is written to a temporary file and only moved into place
+    by close(), so a failed run never leaves a half-written file behind.
+    """
+
+    def __init__(self, out_path):
+        self.out_path = out_path
+        self.frames = 0
+        self._format = None
+        self._tmp_path = f"{out_path}.tmp"
+        self._file = open(self._tmp_path, "wb")
+
+    def append(self, data):
+        view = memoryview(data)
+        for pos, header in iter_frames(data):
+            fmt = (header.sample_rate, header.channels)
+            if self._format is None:
+                self._format = fmt
+            elif fmt != self._format:
+                raise ValueError(f"MP3 part is {fmt[0]} Hz/{fmt[1]} ch, expected {self._format[0]} Hz/{self._format[1]} ch")
+            self._file.write(view[pos:pos + header.length])
+            self.frames += 1
+
+    def append_file(self, mp3_path):
+        with open(mp3_path, "rb") as f:
+            self.append(f.read())
+
+    @property
+    def partial_path(self):
+        """The file being written; every flushed frame in it is already playable."""
+        return self._tmp_path
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+        os.replace(self._tmp_path, self.out_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.remove(self._tmp_path)
+
+
+def concat_mp3(mp3_paths, out_path):
+    """Joins MP3 files frame by frame into `out_path`; returns the number of frames written."""
+    with Mp3Concatenator(out_path) as out:
+        for path in mp3_paths:
+            out.append_file(path)
+    return out.frames
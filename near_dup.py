@@ -0,0 +1,105 @@
+import re
+import zlib
+import numpy as np
+
+# --- CONFIGURATION ---
+DEFAULT_THRESHOLD = 0.8     # Estimated Jaccard similarity of word shingles that counts as a duplicate
+NUM_PERM = 128              # MinHash signature length
+SHINGLE_WORDS = 3
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _choose_rows(num_perm, threshold):
+    """
+    Rows per LSH band: the largest divisor r of `num_perm` whose banding
+    threshold (1/b)^(1/r) sits comfortably below `threshold`, so true
+    near-duplicates almost always share a band while unrelated texts rarely do.
+    """
+    best = 1
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0 and (rows / num_perm) ** (1 / rows) <= threshold * 0.9:
+            best = rows
+    return best
+
+
+class NearDuplicateFilter:
+    """
+    Streaming near-duplicate filter over short texts (MinHash + LSH banding).
+
+    Each text becomes a MinHash signature over its lowercase word shingles.
+    Signatures are cut into bands and bucketed, so a new text is only
+    compared with earlier representatives it shares a band with; the work
+    per text stays constant and a whole corpus is filtered in near-linear
+    time. A text whose estimated similarity to a representative reaches
+    `threshold` joins that representative's cluster, otherwise it becomes a
+    new representative. The first text of each cluster is the one kept.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, shingle_words=SHINGLE_WORDS, seed=1):
+        self.threshold = threshold
+        self.shingle_words = shingle_words
+        self.rows = _choose_rows(num_perm, threshold)
+        self.bands = num_perm // self.rows
+
+        # Multiply-shift universal hashing: h_i(x) = (a_i * x + b_i) mod 2^64 >> 32, a_i odd
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = []     # One uint32 signature per representative
+        self.sources = []         # Per representative: the sources of every text in its cluster
+        self.duplicates = 0
+
+    def signature(self, text):
+        words = _WORD_RE.findall(text.lower())
+        k = self.shingle_words
+        shingles = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        with np.errstate(over="ignore"):
+            permuted = (hashes[:, None] * self._a + self._b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def add(self, text, source=None):
+        """
+        Offers one text. Returns the index of its representative in
+        `sources` and whether the text is new (True) or a near-duplicate of
+        an earlier one (False); either way `source` is recorded.
+        """
+        sig = self.signature(text)
+        keys = [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+        candidates = sorted({rep for band, key in zip(self._buckets, keys) for rep in band.get(key, ())})
+        best, best_sim = None, 0.0
+        for rep in candidates:
+            sim = np.count_nonzero(self._signatures[rep] == sig) / len(sig)
+            if sim > best_sim:
+                best, best_sim = rep, sim
+
+        if best is not None and best_sim >= self.threshold:
+            self.sources[best].append(source)
+            self.duplicates += 1
+            return best, False
+
+        rep = len(self._signatures)
+        self._signatures.append(sig)
+        self.sources.append([source])
+        for band, key in zip(self._buckets, keys):
+            band.setdefault(key, []).append(rep)
+        return rep, True
+
+
+def dedupe(texts, sources=None, threshold=DEFAULT_THRESHOLD):
+    """
+    Keeps the first text of every near-duplicate cluster, in input order.
+    Returns (kept_texts, kept_sources) where kept_sources[i] lists the
+    sources of all texts folded into kept_texts[i].
+    """
+    flt = NearDuplicateFilter(threshold)
+    kept = []
+    for i, text in enumerate(texts):
+        _, is_new = flt.add(text, sources[i] if sources is not None else i)
+        if is_new:
+            kept.append(text)
+    return kept, flt.sources
@@ -0,0 +1,200 @@
+import os
+import json
+import pickle
+import hashlib
+from collections import deque
+
+# --- CONFIGURATION ---
+CACHE_DIR = os.path.join(".cache", "phrase_matcher")
+
+# Bump this when the compiled layout changes so stale pickles are rebuilt.
+AUTOMATON_VERSION = 1
+
+
+# ----------------------------------------------------
+# AHO-CORASICK AUTOMATON
+# ----------------------------------------------------
+
+class PhraseMatcher:
+    """
+    Case-insensitive multi-phrase matcher built from SEARCH_CONTEXT categories.
+
+    All phrases of all categories are compiled into one Aho-Corasick automaton,
+    so a paragraph is scanned once no matter how many phrases there are.
+    Matching follows the same rule as the old `phrase.lower() in text.lower()`
+    checks: a phrase hits anywhere in the text, overlaps included.
+    """
+
+    def __init__(self, categories):
+        self.categories = [
+            (cat["category_name"], list(cat["match_phrases"])) for cat in categories
+        ]
+
+        # One automaton entry per distinct lowered phrase; categories share hits.
+        self.phrases = []
+        phrase_ids = {}
+        for _, phrases in self.categories:
+            for phrase in phrases:
+                key = phrase.lower()
+                if key not in phrase_ids:
+                    phrase_ids[key] = len(self.phrases)
+                    self.phrases.append(key)
+        self._phrase_ids = phrase_ids
+
+        self._compile()
+
+    def _compile(self):
+        goto = [{}]
+        outputs = [[]]
+
+        for pid, phrase in enumerate(self.phrases):
+            if not phrase:
+                continue
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(pid)
+
+        # Breadth-first pass resolves failure links into a full DFA, so the
+        # scan loop is one dict lookup per character with no fallback chasing.
+        fail = [0] * len(goto)
+        delta = [dict(edges) for edges in goto]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                if state:
+                    f = fail[state]
+                    while f and ch not in goto[f]:
+                        f = fail[f]
+                    fail[nxt] = goto[f].get(ch, 0)
+            for ch, target in delta[fail[state]].items():
+                delta[state].setdefault(ch, target)
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+        self._lengths = [len(p) for p in self.phrases]
+
+    def find_all(self, text):
+        """
+        Yields (phrase_id, start, end) for every phrase occurrence in `text`.
+        Offsets index into the original `text`.
+        """
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        state = 0
+
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            for end, ch in enumerate(lowered, 1):
+                state = delta[state].get(ch, 0)
+                if outputs[state]:
+                    for pid in outputs[state]:
+                        yield pid, end - lengths[pid], end
+            return
+
+        # Rare case: lowercasing changed the length (e.g. "İ"), so map every
+        # lowered character back to the index of the character it came from.
+        origin = []
+        for i, ch in enumerate(text):
+            origin.extend([i] * len(ch.lower()))
+        for pos, ch in enumerate(lowered):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for pid in outputs[state]:
+                    yield pid, origin[pos + 1 - lengths[pid]], origin[pos] + 1
+
+    def match(self, text):
+        """
+        Returns the per-category tags for `text`:
+            [{"category": ..., "matched_terms": [...], "offsets": [[(start, end), ...], ...]}]
+
+        `matched_terms` keeps each category's `match_phrases` order, exactly as
+        the per-phrase substring checks produced it; `offsets` is parallel to it.
+        """
+        hits = {}
+        for pid, start, end in self.find_all(text):
+            hits.setdefault(pid, []).append((start, end))
+
+        if not hits and "" not in self._phrase_ids:
+            return []
+
+        tags = []
+        for category, phrases in self.categories:
+            matched, offsets = [], []
+            for phrase in phrases:
+                pid = self._phrase_ids[phrase.lower()]
+                if phrase and pid not in hits:
+                    continue
+                matched.append(phrase)
+                offsets.append(hits.get(pid, []))
+            if matched:
+                tags.append({
+                    "category": category,
+                    "matched_terms": matched,
+                    "offsets": offsets
+                })
+        return tags
+
+    def categories_for(self, text):
+        """Returns the names of the categories with at least one phrase in `text`."""
+        return [tag["category"] for tag in self.match(text)]
+
+
+# ----------------------------------------------------
+# DISK CACHE
+# ----------------------------------------------------
+
+def _fingerprint(categories):
+    payload = json.dumps(
+        [AUTOMATON_VERSION, [[c["category_name"], c["match_phrases"]] for c in categories]],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+_loaded = {}
+
+
+def get_matcher(categories, cache_dir=CACHE_DIR):
+    """
+    Returns the compiled matcher for `categories`, loading it from the
+    on-disk cache when the same phrase set was compiled before.
+    """
+    key = _fingerprint(categories)
+    if key in _loaded:
+        return _loaded[key]
+
+    path = os.path.join(cache_dir, f"{key}.pkl") if cache_dir else None
+    matcher = None
+
+    if path and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                matcher = pickle.load(f)
+        except Exception as e:
+            print(f"   [Matcher] Ignoring unreadable cache {path}: {e}")
+
+    if matcher is None:
+        matcher = PhraseMatcher(categories)
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"   [Matcher] Could not write cache {path}: {e}")
+
+    _loaded[key] = matcher
+    return matcher
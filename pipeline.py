@@ -0,0 +1,424 @@
+"""
+Runs the ISM centenary video pipeline as a DAG of memoized stages.
+
+    python pipeline.py                 # bring every stage up to date
+    python pipeline.py script          # one stage and whatever it depends on
+    python pipeline.py --list          # stages, their inputs/outputs and status
+    python pipeline.py --dry-run       # what would run, and why
+    python pipeline.py --force audio   # rerun audio even if up to date
+    python pipeline.py --jobs 1        # no parallel stages
+
+Each stage is one of the existing entry-point scripts, run in its own
+process. A stage is skipped, as with `make`, while its fingerprint (the
+content of its inputs, the code of the script and every local module it
+imports, and the environment variables it reads) and its outputs are
+unchanged since the last successful run. Stages that do not depend on
+each other run in parallel. State lives in .cache/pipeline/.
+
+Only the standard library is imported here; parsers and API clients are
+loaded by the stage processes that need them.
+"""
+import os
+import ast
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(ROOT, ".cache", "pipeline")
+STATE_FILE = os.path.join(STATE_DIR, "state.json")
+LOG_DIR = os.path.join(STATE_DIR, "logs")
+DEFAULT_JOBS = 2
+
+# A directory input: every file below `path` with one of `suffixes`
+DirInput = namedtuple("DirInput", ["path", "suffixes"])
+Stage = namedtuple("Stage", ["name", "script", "inputs", "outputs", "env", "description"])
+
+SKIP_DIRS = {".git", ".cache", "__pycache__"}
+
+
+# ----------------------------------------------------
+# STAGE DEFINITIONS
+# ----------------------------------------------------
+
+def script_constants(script):
+    """Module-level literal assignments of a script, read without importing it."""
+    with open(os.path.join(ROOT, script), "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                pass
+    return constants
+
+
+def define_stages():
+    """
+    The stages, with paths taken from each script's own configuration
+    constants so there is a single place to change them.
+    """
+    crawl = script_constants("Data Extractor Website Crawls.py")
+    news = script_constants("extractorv2.py")
+    script = script_constants("script.py")
+    audio = script_constants("audio.py")
+    render = script_constants("render.py")
+
+    # script.py matches against the full-text index. Both extractors and script.py itself
+    # sync into it, so it is no stage's output: it feeds the fingerprint, not the edges
+    script_inputs = [script["WEBSITE_TXT"], script["NEWS_JSON"]]
+    if script.get("KB_INDEX_FILE"):
+        script_inputs.append(script["KB_INDEX_FILE"])
+    script_outputs = [script["FINAL_SCRIPT_FILE"], script["SOURCES_FILE"]]
+    if script.get("STREAM_NARRATION") and script.get("FINALIZE_MODE") == "sections":
+        script_outputs.append(audio["OUTPUT_FILE"])
+
+    return [
+        Stage(
+            "website", "Data Extractor Website Crawls.py",
+            inputs=[DirInput(crawl["PARENT_DIRECTORY"], (".pdf", ".docx", ".txt"))],
+            outputs=[os.path.join(crawl["OUTPUT_DIR"], name) for name in
+                     ("ism_data_hunt_results.jsonl", "ism_data_hunt_results.json", "READABLE_REPORT.md")],
+            env=["OPENAI_BASE_URL"],
+            description="Relevance-filter crawled PDF/DOCX/TXT files into the data-hunt knowledge base"
+        ),
+        Stage(
+            "news", "extractorv2.py",
+            inputs=[DirInput(news["PARENT_DIRECTORY"], tuple("." + n.split(".", 1)[1] for n in news["INDEX_FILES"]))],
+            outputs=[os.path.join(news["OUTPUT_DIR"], name) for name in
+                     ("ism_news_extracted.jsonl", "ism_news_extracted.json", "REPORT.md")],
+            env=["GROQ_API_URL"],
+            description="Clean and categorise crawled news pages"
+        ),
+        Stage(
+            "script", "script.py",
+            inputs=script_inputs,
+            outputs=script_outputs,
+            env=["GROQ_API_URL"],
+            description="Draft and finalise the 2-minute narration script"
+        ),
+        Stage(
+            "audio", "audio.py",
+            inputs=[audio["SCRIPT_FILE"]],
+            outputs=[audio["OUTPUT_FILE"]],
+            env=["ELEVEN_API_URL"],
+            description="Synthesize the narration MP3"
+        ),
+        Stage(
+            "render", "render.py",
+            inputs=[render["TIMELINE_CSV"]],
+            outputs=[render["RENDER_INDEX"]],
+            env=[],
+            description="Render a clip for every distinct timeline GenAI_Prompt"
+        ),
+    ]
+
+
+def norm(path):
+    return os.path.normpath(path)
+
+
+def dependencies(stages):
+    """
+    stage name -> names of the stages producing any of its file inputs.
+    Directory inputs never create edges; stage outputs are left out of them.
+    """
+    producers = {norm(out): stage.name for stage in stages for out in stage.outputs}
+    deps = {}
+    for stage in stages:
+        deps[stage.name] = {producers[norm(inp)] for inp in stage.inputs
+                            if not isinstance(inp, DirInput) and norm(inp) in producers}
+        deps[stage.name].discard(stage.name)
+    return deps
+
+
+# ----------------------------------------------------
+# FINGERPRINTS
+# ----------------------------------------------------
+
+class FileHashes:
+    """
+    SHA-256 of files, remembered together with their size and mtime so an
+    unchanged file is never read twice across runs.
+    """
+
+    def __init__(self, known):
+        self.known = known      # path -> [size, mtime_ns, sha256]
+        self._lock = threading.Lock()
+
+    def sha256(self, path):
+        full = os.path.join(ROOT, path)
+        if not os.path.isfile(full):
+            return None
+        st = os.stat(full)
+        with self._lock:
+            entry = self.known.get(path)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+
+        h = hashlib.sha256()
+        with open(full, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        with self._lock:
+            self.known[path] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+
+def expand_inputs(stage, excluded):
+    """
+    The concrete input files of a stage and any missing ones. Files that
+    are outputs of a stage are left out of directory inputs: an extractor
+    scanning "./" must not depend on the script it feeds.
+    """
+    files, missing = [], []
+    for inp in stage.inputs:
+        if not isinstance(inp, DirInput):
+            (files if os.path.isfile(os.path.join(ROOT, inp)) else missing).append(norm(inp))
+            continue
+
+        top = os.path.join(ROOT, inp.path)
+        if not os.path.isdir(top):
+            missing.append(norm(inp.path) + os.sep)
+            continue
+        for root, dirs, names in os.walk(top):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for name in sorted(names):
+                path = norm(os.path.relpath(os.path.join(root, name), ROOT))
+                if name.endswith(inp.suffixes) and path not in excluded:
+                    files.append(path)
+    return files, missing
+
+
+def local_modules(script):
+    """The script plus every repo module it imports, transitively."""
+    seen, todo = set(), [script]
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        with open(os.path.join(ROOT, path), "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            names = []
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            for name in names:
+                candidate = name.split(".")[0] + ".py"
+                if os.path.isfile(os.path.join(ROOT, candidate)):
+                    todo.append(candidate)
+    return sorted(seen)
+
+
+def digest(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def fingerprint(stage, hashes, excluded):
+    """Per-component fingerprint of a stage, or (None, missing inputs) if it cannot run."""
+    files, missing = expand_inputs(stage, excluded)
+    if missing:
+        return None, missing
+    return {
+        "inputs": digest({path: hashes.sha256(path) for path in files}),
+        "code": digest({path: hashes.sha256(path) for path in local_modules(stage.script)}),
+        "config": digest({name: os.environ.get(name) for name in stage.env}),
+    }, []
+
+
+def stale_reason(stage, record, current, hashes, force):
+    """Why the stage must run, or None if it is up to date."""
+    if force:
+        return "forced"
+    if record is None:
+        return "never run"
+    for part in ("code", "config", "inputs"):
+        if record["fingerprint"][part] != current[part]:
+            return f"{part} changed"
+    for path, sha in record["outputs"].items():
+        if hashes.sha256(path) != sha:
+            return f"{path} missing or modified"
+    return None
+
+
+# ----------------------------------------------------
+# STATE
+# ----------------------------------------------------
+
+def load_state():
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"stages": {}, "files": {}}
+
+
+def save_state(state):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    tmp_path = f"{STATE_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, STATE_FILE)
+
+
+# ----------------------------------------------------
+# RUNNER
+# ----------------------------------------------------
+
+def run_script(stage):
+    """Runs one stage's script from the repo root, logging to .cache/pipeline/logs/<stage>.log."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{stage.name}.log")
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run([sys.executable, stage.script], cwd=ROOT, stdout=log, stderr=subprocess.STDOUT,
+                              env=dict(os.environ, PYTHONUNBUFFERED="1"))
+    return proc.returncode, time.perf_counter() - start, log_path
+
+
+def tail(path, lines=15):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return "".join(f.readlines()[-lines:])
+
+
+def select(stages, deps, targets):
+    """The targets plus everything upstream of them, in definition order."""
+    wanted, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(deps[name])
+    return [stage for stage in stages if stage.name in wanted]
+
+
+def run_pipeline(stages, deps, force=(), jobs=DEFAULT_JOBS, dry_run=False):
+    """
+    Brings the given stages up to date, starting each one as soon as the
+    stages it depends on have finished; stages named in `force` run
+    regardless. Returns True if nothing failed.
+    """
+    state = load_state()
+    hashes = FileHashes(state["files"])
+    excluded = {norm(out) for stage in define_stages() for out in stage.outputs}
+    by_name = {stage.name: stage for stage in stages}
+    lock = threading.Lock()
+
+    pending = list(by_name)
+    status = {}       # name -> "ran" | "fresh" | "failed" | "blocked" | "would run"
+
+    def settle(name):
+        """Decides, now that its dependencies are settled, whether a stage runs; then runs it."""
+        stage = by_name[name]
+        upstream = [status[d] for d in deps[name] if d in status]
+        if any(s in ("failed", "blocked") for s in upstream):
+            print(f"⏭️  {name}: skipped, an upstream stage failed")
+            return "blocked"
+
+        current, missing = fingerprint(stage, hashes, excluded)
+        if current is None:
+            if dry_run and any(s == "would run" for s in upstream):
+                print(f"🔸 {name}: would run (after {', '.join(sorted(deps[name]))})")
+                return "would run"
+            print(f"❌ {name}: missing input(s): {', '.join(missing)}")
+            return "failed"
+
+        with lock:
+            record = state["stages"].get(name)
+        reason = stale_reason(stage, record, current, hashes, name in force)
+        if reason is None and dry_run and any(s == "would run" for s in upstream):
+            reason = f"after {', '.join(sorted(d for d in deps[name] if status.get(d) == 'would run'))}"
+        if reason is None:
+            print(f"✅ {name}: up to date")
+            return "fresh"
+        if dry_run:
+            print(f"🔸 {name}: would run ({reason})")
+            return "would run"
+
+        print(f"▶️  {name}: running {stage.script} ({reason})")
+        code, seconds, log_path = run_script(stage)
+        if code != 0:
+            print(f"❌ {name}: exit code {code} after {seconds:.1f}s — last lines of {log_path}:\n{tail(log_path)}")
+            return "failed"
+
+        outputs = {norm(out): hashes.sha256(norm(out)) for out in stage.outputs}
+        # Inputs are re-fingerprinted after the run, so a stage that rewrites its own inputs stays consistent
+        current, _ = fingerprint(stage, hashes, excluded)
+        with lock:
+            state["stages"][name] = {"fingerprint": current, "outputs": outputs, "seconds": round(seconds, 2)}
+            save_state(state)
+        print(f"🏁 {name}: done in {seconds:.1f}s")
+        return "ran"
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        running = {}
+        while pending or running:
+            for name in list(pending):
+                if all(d in status or d not in by_name for d in deps[name]):
+                    pending.remove(name)
+                    running[pool.submit(settle, name)] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                status[running.pop(future)] = future.result()
+
+    if not dry_run:
+        with lock:
+            save_state(state)
+    return not any(s in ("failed", "blocked") for s in status.values())
+
+
+def list_stages(stages, deps):
+    state = load_state()
+    for stage in stages:
+        record = state["stages"].get(stage.name)
+        last = f"last run took {record['seconds']}s" if record else "never run"
+        print(f"{stage.name} — {stage.description} ({last})")
+        print(f"    script:  {stage.script}")
+        print(f"    after:   {', '.join(sorted(deps[stage.name])) or '-'}")
+        for inp in stage.inputs:
+            shown = f"{inp.path}  [{' '.join(inp.suffixes)}]" if isinstance(inp, DirInput) else inp
+            print(f"    input:   {shown}")
+        for out in stage.outputs:
+            print(f"    output:  {out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="\n".join(__doc__.strip().splitlines()[2:]))
+    parser.add_argument("stages", nargs="*", help="stages to bring up to date (default: all)")
+    parser.add_argument("--force", action="store_true", help="rerun the named stages (default: all) even if up to date")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS, help="stages run in parallel")
+    parser.add_argument("--dry-run", "-n", action="store_true", help="only report what would run")
+    parser.add_argument("--list", action="store_true", help="describe the stages and exit")
+    args = parser.parse_args()
+
+    stages = define_stages()
+    deps = dependencies(stages)
+    unknown = [name for name in args.stages if name not in deps]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(deps)})")
+
+    if args.list:
+        list_stages(stages, deps)
+        return
+
+    targets = args.stages or list(deps)
+    selected = select(stages, deps, targets)
+    ok = run_pipeline(selected, deps, force=set(targets) if args.force else set(), jobs=args.jobs, dry_run=args.dry_run)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import time
+import threading
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate_per_minute`.
+
+    The bucket holds at most `capacity` tokens (one minute's worth by
+    default), so a burst can spend up to a minute of budget at once and
+    then callers are paced at the steady rate.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount=1):
+        """
+        Takes `amount` tokens, going into debt if necessary, and returns how
+        many seconds the caller must wait before using them.
+        """
+        # A request larger than the whole bucket can never be satisfied; cap it
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, amount=1):
+        """Blocks until `amount` tokens are available, then takes them."""
+        wait = self.reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits for one API.
+
+    A limit of 0 or None disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=0):
+        """Blocks until one request carrying `tokens` tokens may be sent."""
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        if wait > 0:
+            time.sleep(wait)
+            with self._lock:
+                self.waited += wait
+        return wait
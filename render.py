@@ -0,0 +1,42 @@
+import os
+import time
+import tracing
+from clip_render import (RenderScheduler, JobJournal, make_backend, load_jobs, write_clip_index,
+                         RENDER_CONCURRENCY, RENDER_RETRIES)
+
+# --- CONFIGURATION ---
+TIMELINE_CSV = "iit_ism_timeline.csv"         # Written by doc_extraction.py
+RENDER_INDEX = "render_clips.json"            # Shots in chronological order, with their clips
+RENDER_BACKEND = "placeholder"                # Any name registered in clip_render.BACKENDS
+BACKEND_OPTIONS = {}                          # e.g. {"latency": 1.5} to simulate a remote renderer
+CLIP_PARAMS = {"width": 320, "height": 180, "fps": 8, "seconds": 3, "seed": 0}
+CLIP_DIR = os.path.join(".cache", "clips")    # One clip per (backend, prompt, parameters)
+JOBS_FILE = os.path.join(".cache", "render", "jobs.jsonl")   # Durable job state; a rerun resumes
+
+
+def main():
+    backend = make_backend(RENDER_BACKEND, **BACKEND_OPTIONS)
+    jobs = load_jobs(TIMELINE_CSV, backend, CLIP_PARAMS)
+    print(f"🎞️ {len(jobs)} distinct prompts to render with {backend.name}")
+
+    start = time.perf_counter()
+    journal = JobJournal(JOBS_FILE)
+    try:
+        scheduler = RenderScheduler(backend, CLIP_PARAMS, CLIP_DIR, journal,
+                                    concurrency=RENDER_CONCURRENCY, retries=RENDER_RETRIES)
+        with tracing.span("render", jobs=len(jobs)):
+            clips = scheduler.run(jobs)
+        write_clip_index(jobs, clips, journal, RENDER_INDEX)
+    finally:
+        journal.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"🎬 {scheduler.rendered} rendered, {scheduler.cached} reused from {CLIP_DIR}, {scheduler.failed} failed "
+          f"({scheduler.attempts} attempts) in {elapsed:.1f}s "
+          f"= {scheduler.rendered / max(elapsed, 1e-9):.2f} clips/s")
+    print(f"Shot list saved as {RENDER_INDEX}")
+    tracing.finish()
+
+
+if __name__ == "__main__":
+    main()
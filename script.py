@@ -1,13 +1,89 @@
+import os
 import json
 import re
+import time
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+import tracing
 from collections import defaultdict
+from phrase_matcher import get_matcher
+from llm_cache import LLMCache, make_key
+from near_dup import NearDuplicateFilter
+from kb_index import KnowledgeIndex
+from kb_writer import iter_grouped_json
+from sentences import split_sentences
+from sentence_rank import candidate_sentences, bm25_scores, select_sentences, word_count
+from manifest import file_sha256, config_fingerprint
+from audio import StreamingNarrator, SentenceFeeder, OUTPUT_FILE as NARRATION_FILE
 
 # ----------------------------
 # GROQ API CONFIG
 # ----------------------------
 
 GROQ_API_KEY = "gsk_..."   # <-- your real key
+GROQ_API_URL = os.environ.get("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+GROQ_MODEL = "llama3-70b-8192"
+
+# Finalized scripts are cached on disk, so an unchanged draft is never re-sent
+LLM_CACHE = LLMCache()
+
+# "sections" polishes INTRO, each category section and OUTRO concurrently, streamed
+# into the output file; "whole" sends the full draft in one call
+FINALIZE_MODE = "sections"
+SECTION_CONCURRENCY = 8
+SECTION_RETRIES = 2               # Extra attempts for a section whose call fails
+FINAL_SCRIPT_FILE = "FINAL_2_MIN_VIDEO_SCRIPT.txt"
+SOURCES_FILE = "script_sources.json"   # Inputs every kept paragraph stands for
+# Synthesize the narration sentence by sentence while the sections are still being written
+# (needs FINALIZE_MODE = "sections"; the transition pass is skipped so script and audio agree)
+STREAM_NARRATION = False
+
+def groq_chat(messages, **params):
+    """One non-streamed Groq chat completion; returns the message content."""
+    with tracing.span("llm.request", api="groq", model=GROQ_MODEL) as span:
+        response = requests.post(
+            GROQ_API_URL,
+            headers={"Authorization": f"Bearer {GROQ_API_KEY}"},
+            json={
+                "model": GROQ_MODEL,
+                "messages": messages,
+                **params
+            }
+        )
+        span.set(status=response.status_code, retries=tracing.http_retries(response))
+
+        result = response.json()
+        usage = result.get("usage") or {}
+        span.set(prompt_tokens=usage.get("prompt_tokens"), completion_tokens=usage.get("completion_tokens"))
+    return result["choices"][0]["message"]["content"]
+
+def groq_stream(messages, **params):
+    """Yields the content deltas of a streamed (server-sent events) Groq chat completion."""
+    with tracing.span("llm.request", api="groq", model=GROQ_MODEL, stream=True) as span, \
+            requests.post(
+                GROQ_API_URL,
+                headers={"Authorization": f"Bearer {GROQ_API_KEY}"},
+                json={"model": GROQ_MODEL, "messages": messages, "stream": True, **params},
+                stream=True
+            ) as response:
+        span.set(status=response.status_code, retries=tracing.http_retries(response))
+        response.raise_for_status()
+
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            payload = line[5:].strip()
+            if payload == "[DONE]":
+                break
+            chunk = json.loads(payload)
+            usage = (chunk.get("x_groq") or {}).get("usage") or chunk.get("usage")
+            if usage:
+                span.set(prompt_tokens=usage.get("prompt_tokens"), completion_tokens=usage.get("completion_tokens"))
+            choices = chunk.get("choices") or []
+            delta = choices[0].get("delta", {}).get("content") if choices else None
+            if delta:
+                yield delta
 
 def llm_finalize_script(raw_script):
     """
@@ -36,19 +112,11 @@ Draft Script:
 ---
 """
 
-    try:
-        response = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            headers={"Authorization": f"Bearer {GROQ_API_KEY}"},
-            json={
-                "model": "llama3-70b-8192",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.2
-            }
-        )
+    messages = [{"role": "user", "content": prompt}]
 
-        result = response.json()
-        final_text = result["choices"][0]["message"]["content"]
+    try:
+        final_text = LLM_CACHE.get_or_call(make_key(GROQ_MODEL, messages, temperature=0.2),
+                                           lambda: groq_chat(messages, temperature=0.2))
         return final_text
 
     except Exception as e:
@@ -56,6 +124,262 @@ Draft Script:
         return raw_script
 
 
+# ----------------------------
+# SECTION-WISE FINALIZATION
+# ----------------------------
+
+SECTION_SEPARATOR = "\n\n---\n\n"
+
+def split_sections(raw_script):
+    """
+    The rendered TEMPLATE as [(heading, body)]: INTRO (with the title), the
+    six category sections and OUTRO. Heading lines are the **bold** / 🎬 ones.
+    """
+    sections = []
+    for block in raw_script.strip().split("\n---\n"):
+        lines = [l for l in block.strip().splitlines() if l.strip()]
+        heading = "\n\n".join(l for l in lines if l.startswith(("**", "🎬")))
+        body = "\n".join(l for l in lines if not l.startswith(("**", "🎬")))
+        sections.append((heading, body))
+    return sections
+
+class OrderedSectionWriter:
+    """
+    Writes sections produced concurrently to one file in section order.
+
+    Text of the section at the head is written (and flushed) as it arrives;
+    later sections are buffered until every section before them is done.
+    A section that has to be retried is rolled back with restart(): the
+    head section by truncating the file to where it began.
+
+    An optional `listener` sees the file's text as it is written:
+    text(chunk), section_start() when the next section reaches the head,
+    rollback() when the head section is restarted and flush() on close.
+    If it raises (e.g. narration was cancelled), `cancelled` is set and
+    the section workers stop.
+    """
+
+    def __init__(self, path, count, separator=SECTION_SEPARATOR, listener=None):
+        self.path = path
+        self.count = count
+        self.separator = separator
+        self.started = time.perf_counter()
+        self.first_section_seconds = None
+        self.listener = listener
+        self.cancelled = threading.Event()
+
+        self._file = open(path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._head = 0
+        self._head_offset = 0
+        self._buffers = [[] for _ in range(count)]
+        self._done = [False] * count
+
+    def write(self, index, text):
+        with self._lock:
+            if index == self._head:
+                self._emit(text)
+            else:
+                self._buffers[index].append(text)
+
+    def restart(self, index):
+        with self._lock:
+            if index == self._head:
+                self._file.seek(self._head_offset)
+                self._file.truncate()
+                if self.listener:
+                    self.listener.rollback()
+            self._buffers[index].clear()
+
+    def finish(self, index):
+        with self._lock:
+            self._done[index] = True
+            while self._head < self.count and self._done[self._head]:
+                if self._head == 0:
+                    self.first_section_seconds = time.perf_counter() - self.started
+                self._head += 1
+                if self._head < self.count:
+                    if self.listener:
+                        self.listener.section_start()
+                    self._emit(self.separator)
+                    self._head_offset = self._file.tell()
+                    self._emit("".join(self._buffers[self._head]))
+                    self._buffers[self._head].clear()
+
+    def _emit(self, text):
+        if not text:
+            return
+        self._file.write(text)
+        self._file.flush()
+        if self.listener:
+            try:
+                self.listener.text(text)
+            except BaseException:
+                self.cancelled.set()
+                raise
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def close(self):
+        self._file.close()
+        if self.listener and not self.cancelled.is_set():
+            self.listener.flush()
+
+def finalize_section(index, heading, body, out):
+    """
+    Polishes one section with a streamed Groq call, writing tokens to `out`
+    as they arrive. A failed or empty answer is retried up to
+    SECTION_RETRIES times, then the draft body is kept. Returns the body.
+    """
+    if not body.strip() or body.strip() == "Data not available.":
+        out.write(index, f"{heading}\n{body}")
+        out.finish(index)
+        return body
+
+    prompt = f"""
+You are an expert documentary scriptwriter polishing ONE section of a 2-minute documentary about IIT(ISM) Dhanbad.
+Section: {heading}
+
+Improve the narration: smooth and cohesive, tight sentences, no redundancy.
+Keep every fact and roughly the same length. DO NOT add fictional content.
+Return ONLY the improved narration, without the heading.
+
+Draft:
+---
+{body}
+---
+"""
+    messages = [{"role": "user", "content": prompt}]
+    key = make_key(GROQ_MODEL, messages, temperature=0.2, section=True)
+
+    text = LLM_CACHE.get(key)
+    for attempt in range(SECTION_RETRIES + 1):
+        if text is not None or out.cancelled.is_set():
+            break
+        out.restart(index)
+        out.write(index, f"{heading}\n")
+        parts = []
+        try:
+            with tracing.span("llm.section", section=index, attempt=attempt):
+                for delta in groq_stream(messages, temperature=0.2):
+                    if out.cancelled.is_set():
+                        return body
+                    parts.append(delta)
+                    out.write(index, delta)
+            if "".join(parts).strip():
+                text = "".join(parts).strip()
+                LLM_CACHE.put(key, text)
+            else:
+                print(f"[LLM ERROR] section {index}: empty answer (attempt {attempt + 1})")
+        except Exception as e:
+            if out.cancelled.is_set():
+                return body
+            print(f"[LLM ERROR] section {index}: {e} (attempt {attempt + 1})")
+
+    if out.cancelled.is_set():
+        return body
+    if text is None:
+        text = body
+    out.restart(index)
+    out.write(index, f"{heading}\n{text}")
+    out.finish(index)
+    return text
+
+def first_sentence(text):
+    return (split_sentences(text) or [""])[0]
+
+def last_sentence(text):
+    return (split_sentences(text) or [""])[-1]
+
+def smooth_transitions(bodies):
+    """
+    Lightweight pass over the section boundaries only: the LLM sees the last
+    sentence before and the first sentence after each boundary and may
+    rewrite that opening sentence to flow on. Returns the updated bodies.
+    """
+    boundaries = [
+        {"section": i, "previous": last_sentence(bodies[i - 1]), "opening": first_sentence(bodies[i])}
+        for i in range(1, len(bodies)) if bodies[i - 1].strip() and bodies[i].strip()
+    ]
+    if not boundaries:
+        return bodies
+
+    prompt = f"""You are smoothing the transitions between sections of a documentary narration.
+For each boundary you get the last sentence of the previous section and the opening sentence of the next one:
+{json.dumps(boundaries, ensure_ascii=False, indent=1)}
+Rewrite an opening sentence only where the jump is abrupt: keep its facts and length, add no fiction.
+Output: a single JSON object {{"openings": [{{"section": <number>, "text": "<rewritten opening sentence>"}}]}}"""
+    messages = [{"role": "user", "content": prompt}]
+    params = {"temperature": 0.2, "response_format": {"type": "json_object"}}
+
+    def call():
+        content = groq_chat(messages, **params)
+        json.loads(content)["openings"]  # only well-formed answers are cached
+        return content
+
+    try:
+        answer = json.loads(LLM_CACHE.get_or_call(make_key(GROQ_MODEL, messages, **params), call))["openings"]
+    except Exception as e:
+        print("[LLM ERROR] transitions:", e)
+        return bodies
+
+    bodies = list(bodies)
+    openings = {b["section"]: b["opening"] for b in boundaries}
+    for item in answer if isinstance(answer, list) else []:
+        if not isinstance(item, dict):
+            continue
+        i, new = item.get("section"), item.get("text")
+        if i in openings and isinstance(new, str) and new.strip():
+            bodies[i] = bodies[i].replace(openings[i], new.strip(), 1)
+    return bodies
+
+def finalize_script_sections(raw_script, out_path=FINAL_SCRIPT_FILE, concurrency=SECTION_CONCURRENCY,
+                             listener=None, transitions=True):
+    """
+    Section-wise llm_finalize_script: every section is polished concurrently
+    and streamed into `out_path` in order, then one transition pass smooths
+    the boundaries and the file is rewritten with the result. Returns the
+    final script. `listener` is passed on to OrderedSectionWriter; with
+    transitions=False the streamed text is final.
+    """
+    sections = split_sections(raw_script)
+    out = OrderedSectionWriter(out_path, len(sections), listener=listener)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            try:
+                futures = [pool.submit(finalize_section, i, heading, body, out)
+                           for i, (heading, body) in enumerate(sections)]
+                bodies = [f.result() for f in futures]
+            except BaseException:
+                # Interrupted or the listener failed: queued sections never start and
+                # running ones stop at their next delta, before the pool waits for them
+                pool.shutdown(wait=False, cancel_futures=True)
+                out.cancel()
+                raise
+    finally:
+        out.close()
+    streamed_seconds = time.perf_counter() - out.started
+
+    if not transitions:
+        first = out.first_section_seconds
+        print(f"⏱ First section written after {first:.2f}s, all {len(sections)} streamed in {streamed_seconds:.2f}s")
+        return SECTION_SEPARATOR.join(f"{heading}\n{body}" for (heading, _), body in zip(sections, bodies))
+
+    with tracing.span("llm.transitions"):
+        bodies = smooth_transitions(bodies)
+    final_script = SECTION_SEPARATOR.join(f"{heading}\n{body}" for (heading, _), body in zip(sections, bodies))
+
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(final_script)
+    os.replace(tmp_path, out_path)
+
+    first = out.first_section_seconds
+    print(f"⏱ First section written after {first:.2f}s, all {len(sections)} streamed in {streamed_seconds:.2f}s, "
+          f"total with transitions {time.perf_counter() - out.started:.2f}s")
+    return final_script
+
 
 # ----------------------------
 # CATEGORY DEFINITIONS
@@ -114,17 +438,29 @@ SEARCH_CONTEXT = {
 
 
 
+# ----------------------------
+# INPUTS
+# ----------------------------
+
+WEBSITE_TXT = "website_extracted_data.txt"
+NEWS_JSON = "extracted_data/ism_news_extracted.json"
+# Full-text index the extractors sync into; None rescans WEBSITE_TXT and NEWS_JSON on every run
+KB_INDEX_FILE = "extracted_data/ism_knowledge_index.sqlite"
+INDEX_ORIGINS = ["website_text", "news"]   # Index origins read, in this order
+
 # ----------------------------
 # FILE LOADERS
 # ----------------------------
 
-def load_txt(path):
+def iter_lines(path):
+    """The file's lines, read lazily: only one line is held at a time."""
     with open(path, "r", encoding="utf-8") as f:
-        return f.read()
+        for line in f:
+            yield line.rstrip("\n")
 
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+def iter_news(path):
+    """(category, entry) pairs of the news export, decoded one entry at a time."""
+    yield from iter_grouped_json(path)
 
 
 
@@ -132,34 +468,116 @@ def load_json(path):
 # CLEAN + EXTRACT
 # ----------------------------
 
+# Paragraphs of one category whose estimated word-shingle (Jaccard) similarity
+# reaches this are treated as copies of each other; 1.0 only folds identical wording
+NEAR_DUP_THRESHOLD = 0.8
+
 def clean_paragraph(p):
     p = re.sub(r"\s+", " ", p)
     return p.strip() if len(p.strip()) >= 40 else ""
 
-def paragraph_relevant(paragraph, phrases):
-    return any(p.lower() in paragraph.lower() for p in phrases)
+def extract_clean_data(website_text, news_json, categories, sources=None):
+    """
+    Groups the website paragraphs and news chunks by category. Both inputs
+    are consumed as streams: `website_text` is an iterable of lines (or one
+    string) and `news_json` of (category, entry) pairs (or the loaded
+    `{category: [entry, ...]}` dict), so only kept paragraphs stay in
+    memory. Within each
+    category, near-duplicates (the same story syndicated across outlets,
+    re-crawled pages...) are folded into their first occurrence. If a
+    `sources` dict is given, sources[category][i] lists where every copy of
+    out[category][i] came from.
+    """
+    out = defaultdict(list)
+    filters = defaultdict(lambda: NearDuplicateFilter(NEAR_DUP_THRESHOLD))
+    matcher = get_matcher(categories)
 
-def extract_clean_data(website_text, news_json, categories):
+    def add(cat, p, source):
+        _, is_new = filters[cat].add(p, source)
+        if is_new:
+            out[cat].append(p)
 
-    out = defaultdict(list)
+    if isinstance(website_text, str):
+        website_text = website_text.split("\n")
+    if isinstance(news_json, dict):
+        news_json = ((cat, entry) for cat, items in news_json.items() for entry in items)
 
     # Website text
-    for para in website_text.split("\n"):
+    for para in website_text:
         p = clean_paragraph(para)
         if not p:
             continue
 
-        for cat in categories:
-            if paragraph_relevant(p, cat["match_phrases"]):
-                out[cat["category_name"]].append(p)
+        for cat_name in matcher.categories_for(p):
+            add(cat_name, p, "website")
 
     # News JSON
-    for cat, items in news_json.items():
-        for entry in items:
+    for cat, entry in news_json:
+        p = clean_paragraph(entry["text_content"])
+        if p:
+            add(cat, p, entry.get("source_file", "news"))
+
+    if sources is not None:
+        for cat, flt in filters.items():
+            sources[cat] = flt.sources
+
+    dropped = sum(flt.duplicates for flt in filters.values())
+    print(f"🧹 Dropped {dropped} near-duplicate paragraphs (similarity ≥ {NEAR_DUP_THRESHOLD})")
+
+    return out
+
+def index_website_text(index, path, categories):
+    """
+    Files the relevant paragraphs of the website text in the index under
+    origin "website_text" (source "website"). Skipped while the file and
+    the categories are unchanged; returns True if it was (re)indexed.
+    """
+    digest = config_fingerprint(file_sha256(path), categories)
+    if index.digest("website_text", "website") == digest:
+        return False
+
+    matcher = get_matcher(categories)
+    entries = []
+    for para in iter_lines(path):
+        p = clean_paragraph(para)
+        if not p:
+            continue
+        for tag in matcher.match(p):
+            entries.append([tag["category"], {
+                "source_file": "website",
+                "matched_terms": tag["matched_terms"],
+                "text_content": p
+            }])
+
+    index.sync_source("website_text", "website", entries, 0, digest=digest)
+    index.commit()
+    return True
+
+def extract_indexed_data(index, categories, sources=None):
+    """
+    Same result as extract_clean_data, read from the knowledge index: one
+    indexed lookup per category instead of rescanning every paragraph.
+    """
+    out = defaultdict(list)
+    filters = defaultdict(lambda: NearDuplicateFilter(NEAR_DUP_THRESHOLD))
+
+    for cat_obj in categories:
+        cat = cat_obj["category_name"]
+        for entry in index.category_entries(cat, INDEX_ORIGINS):
             p = clean_paragraph(entry["text_content"])
-            if p:
+            if not p:
+                continue
+            _, is_new = filters[cat].add(p, entry.get("source_file", "news"))
+            if is_new:
                 out[cat].append(p)
 
+    if sources is not None:
+        for cat, flt in filters.items():
+            sources[cat] = flt.sources
+
+    dropped = sum(flt.duplicates for flt in filters.values())
+    print(f"🧹 Dropped {dropped} near-duplicate paragraphs (similarity ≥ {NEAR_DUP_THRESHOLD})")
+
     return out
 
 
@@ -211,24 +629,55 @@ A century later, IIT(ISM) continues to honour its heritage while driving innovat
 This is the legacy of ISM — an institution built on courage, knowledge, and exploration.
 """
 
-def summarize_for_script(text_list, max_sentences=2):
+# Narration length the draft is cut to before the LLM polish
+TARGET_SECONDS = 120
+WORDS_PER_SECOND = 2.5
+
+def narrated_words(text):
+    """Words a narrator reads: headings (**...**), rules and the title line don't count."""
+    lines = [l for l in text.splitlines() if l.strip() and not l.startswith(("**", "---", "🎬"))]
+    return sum(word_count(l) for l in lines)
+
+def section_word_budget(categories):
+    """Words left for each category section once the fixed intro/outro is read."""
+    fixed = narrated_words(TEMPLATE.format(**{c["category_name"]: "" for c in categories}))
+    total = int(TARGET_SECONDS * WORDS_PER_SECOND)
+    return max(0, (total - fixed) // max(1, len(categories)))
+
+def summarize_for_script(text_list, phrases, word_budget):
+    """
+    The category's most relevant sentences, BM25-ranked against its
+    `match_phrases`, that fit `word_budget` words, kept in document order.
+    """
     if not text_list:
         return "Data not available."
 
-    combined = " ".join(text_list)
-    sentences = re.split(r"(?<=[.!?])\s+", combined)
-    clean = [s.strip() for s in sentences if len(s.strip()) > 30]
+    sentences = candidate_sentences(text_list)
+    chosen = select_sentences(sentences, bm25_scores(sentences, phrases), word_budget)
+    if not chosen:
+        # Nothing mentions the phrases: fall back to the opening sentences that fit
+        used = 0
+        for s in sentences:
+            if used + word_count(s) > word_budget:
+                break
+            chosen.append(s)
+            used += word_count(s)
 
-    return " ".join(clean[:max_sentences])
+    return " ".join(chosen) if chosen else "Data not available."
 
 def generate_raw_script(cleaned):
     replace_map = {}
+    budget = section_word_budget(SEARCH_CONTEXT["categories"])
 
     for cat_obj in SEARCH_CONTEXT["categories"]:
         cat = cat_obj["category_name"]
-        replace_map[cat] = summarize_for_script(cleaned.get(cat, []))
+        replace_map[cat] = summarize_for_script(cleaned.get(cat, []), cat_obj["match_phrases"], budget)
 
-    return TEMPLATE.format(**replace_map)
+    raw_script = TEMPLATE.format(**replace_map)
+    words = narrated_words(raw_script)
+    print(f"📝 Draft: {words} narrated words ≈ {words / WORDS_PER_SECOND:.0f}s "
+          f"(target {TARGET_SECONDS}s, {budget} words per section)")
+    return raw_script
 
 
 
@@ -237,23 +686,58 @@ def generate_raw_script(cleaned):
 # ----------------------------
 
 def main():
-    website_text = load_txt("website_extracted_data.txt")
-    news_json = load_json("extracted_data/ism_news_extracted.json")
-
-    cleaned_data = extract_clean_data(
-        website_text,
-        news_json,
-        SEARCH_CONTEXT["categories"]
-    )
+    sources = {}
+    if KB_INDEX_FILE:
+        os.makedirs(os.path.dirname(KB_INDEX_FILE) or ".", exist_ok=True)
+        with KnowledgeIndex(KB_INDEX_FILE) as index:
+            with tracing.span("read"):
+                # News written before the extractors kept an index is imported once
+                if not index.has_origin("news") and os.path.exists(NEWS_JSON):
+                    index.import_json("news", NEWS_JSON)
+                if index_website_text(index, WEBSITE_TXT, SEARCH_CONTEXT["categories"]):
+                    print(f"📇 Indexed {WEBSITE_TXT}")
+
+            with tracing.span("match"):
+                cleaned_data = extract_indexed_data(index, SEARCH_CONTEXT["categories"], sources)
+    else:
+        # Both files are read while they are matched, line by line and entry by entry
+        with tracing.span("match"):
+            cleaned_data = extract_clean_data(
+                iter_lines(WEBSITE_TXT),
+                iter_news(NEWS_JSON),
+                SEARCH_CONTEXT["categories"],
+                sources
+            )
+
+    # Which inputs every kept paragraph stands for
+    with open(SOURCES_FILE, "w", encoding="utf-8") as f:
+        json.dump({cat: [{"text": p, "sources": sources[cat][i]} for i, p in enumerate(paras)]
+                   for cat, paras in cleaned_data.items()}, f, indent=2, ensure_ascii=False)
 
     raw_script = generate_raw_script(cleaned_data)
-    final_script = llm_finalize_script(raw_script)
-
-    with open("FINAL_2_MIN_VIDEO_SCRIPT.txt", "w", encoding="utf-8") as f:
-        f.write(final_script)
+    if FINALIZE_MODE == "sections" and STREAM_NARRATION:
+        # Every finished sentence goes to TTS at once; the MP3 grows (and plays) as the script is written
+        with tracing.span("llm.finalize", mode="sections", narrate=True), \
+                StreamingNarrator(NARRATION_FILE) as narrator:
+            print(f"🔊 Narrating into {narrator.partial_path} while the script is written")
+            final_script = finalize_script_sections(raw_script, listener=SentenceFeeder(narrator), transitions=False)
+        print(f"🔊 {narrator.sentences} sentences narrated into {NARRATION_FILE}; "
+              f"first audio after {narrator.first_audio_seconds or 0:.2f}s")
+    elif FINALIZE_MODE == "sections":
+        # Streams straight into FINAL_SCRIPT_FILE while the sections are polished
+        with tracing.span("llm.finalize", mode="sections"):
+            final_script = finalize_script_sections(raw_script)
+    else:
+        with tracing.span("llm.finalize", mode="whole"):
+            final_script = llm_finalize_script(raw_script)
+
+        with tracing.span("write"), open(FINAL_SCRIPT_FILE, "w", encoding="utf-8") as f:
+            f.write(final_script)
 
     print("\n🎉 FINAL SCRIPT GENERATED!\n")
     print(final_script)
+    print(LLM_CACHE.summary())
+    tracing.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+import re
+import numpy as np
+from sentences import split_sentences
+
+# --- CONFIGURATION ---
+BM25_K1 = 1.5
+BM25_B = 0.75
+MIN_SENTENCE_WORDS = 5      # Shorter sentences are never selected
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def candidate_sentences(texts, min_chars=30):
+    """Sentences of `texts` longer than `min_chars`, in order, exact repeats dropped."""
+    seen = set()
+    out = []
+    for text in texts:
+        for s in split_sentences(text):
+            if len(s) > min_chars and s not in seen:
+                seen.add(s)
+                out.append(s)
+    return out
+
+
+def word_count(text):
+    """Words of `text` as every word budget here counts them."""
+    return len(_WORD_RE.findall(text))
+
+
+def query_terms(phrases):
+    """Distinct lowercase words of the query phrases."""
+    return list(dict.fromkeys(w for p in phrases for w in _WORD_RE.findall(p.lower())))
+
+
+def term_matrix(sentences):
+    """
+    Sparse term-frequency matrix of `sentences` in coordinate form: parallel
+    arrays (row, term id, count), plus the vocabulary and each row's length.
+    """
+    vocab = {}
+    rows, cols = [], []
+    lengths = np.zeros(len(sentences), dtype=np.int64)
+    for i, sentence in enumerate(sentences):
+        words = _WORD_RE.findall(sentence.lower())
+        lengths[i] = len(words)
+        rows.extend([i] * len(words))
+        cols.extend(vocab.setdefault(w, len(vocab)) for w in words)
+
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, vocab, lengths
+
+    # Collapse repeated (row, term) pairs into counts
+    width = len(vocab)
+    keys, counts = np.unique(np.asarray(rows, dtype=np.int64) * width + np.asarray(cols), return_counts=True)
+    return keys // width, keys % width, counts, vocab, lengths
+
+
+def bm25_scores(sentences, phrases, k1=BM25_K1, b=BM25_B):
+    """BM25 score of every sentence for the bag of words of `phrases` (0 for no overlap)."""
+    n = len(sentences)
+    if n == 0:
+        return np.zeros(0)
+
+    rows, cols, tf, vocab, lengths = term_matrix(sentences)
+    qids = np.array([vocab[t] for t in query_terms(phrases) if t in vocab], dtype=np.int64)
+    if qids.size == 0:
+        return np.zeros(n)
+
+    hit = np.isin(cols, qids)
+    rows, cols, tf = rows[hit], cols[hit], tf[hit].astype(float)
+
+    df = np.bincount(cols, minlength=len(vocab)).astype(float)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    norm = k1 * (1 - b + b * lengths / max(lengths.mean(), 1e-9))
+    contrib = idf[cols] * tf * (k1 + 1) / (tf + norm[rows])
+    return np.bincount(rows, weights=contrib, minlength=n)
+
+
+def select_sentences(sentences, scores, word_budget):
+    """
+    Highest-scoring sentences whose words fit `word_budget`, returned in
+    their original order. The first batch of candidates (k, enough to fill
+    the budget with the shortest sentences) is found with argpartition
+    rather than a full sort; the rest are only ranked if the budget still
+    has room after that batch.
+    """
+    words = np.array([word_count(s) for s in sentences], dtype=np.int64)
+    candidates = np.flatnonzero((scores > 0) & (words >= MIN_SENTENCE_WORDS))
+    if candidates.size == 0 or word_budget <= 0:
+        return []
+
+    k = min(candidates.size, word_budget // MIN_SENTENCE_WORDS + 1)
+    split = np.argpartition(-scores[candidates], k - 1)
+    batches = [candidates[split[:k]], candidates[split[k:]]]
+
+    chosen, used = [], 0
+    for batch in batches:
+        # Best first; equal scores keep document order
+        for i in batch[np.lexsort((batch, -scores[batch]))]:
+            if used + words[i] <= word_budget:
+                chosen.append(i)
+                used += words[i]
+        if word_budget - used < MIN_SENTENCE_WORDS:
+            break
+    return [sentences[i] for i in sorted(chosen)]
@@ -0,0 +1,28 @@
+import re
+
+# Titles, honorifics and short forms whose trailing period never ends a sentence,
+# plus single-letter initials ("W.H. Berry", "Prof. G.S. Marwaha")
+ABBREVIATIONS = [
+    "Prof", "Dr", "Mr", "Mrs", "Ms", "Sr", "Jr", "St", "Sh", "Shri", "Smt", "Hon", "Rev", "Lt", "Col",
+    "Gen", "Capt", "Maj", "Govt", "Dept", "Univ", "Inst", "Assoc", "Asst", "No", "Nos", "Vol", "Ph",
+    "Ltd", "Co", "Corp", "Inc", "Bros", "vs", "viz", "approx", "Jan", "Feb", "Mar", "Apr", "Jun", "Jul",
+    "Aug", "Sep", "Sept", "Oct", "Nov", "Dec"
+]
+
+# Protected periods are swapped for a private-use character while splitting
+PROTECT = "\ue000"
+ABBREV_RE = re.compile(r"\b(" + "|".join(ABBREVIATIONS) + r"|[A-Za-z])\.")
+# A boundary is whitespace after ., !, ? or … (optionally closed by a quote or
+# bracket) that is followed by something able to start a sentence
+BOUNDARY_RE = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"'”’)\]]))\s+(?=[\"'“‘(\[]?[A-Z0-9])")
+
+
+def split_sentences(text):
+    """
+    Sentences of `text`, in order and stripped, punctuation kept.
+    Abbreviations and initials do not end a sentence. Every sentence is a
+    substring of `text` (whitespace inside it is left as it was).
+    """
+    protected = ABBREV_RE.sub(r"\1" + PROTECT, text)
+    pieces = (piece.replace(PROTECT, ".").strip() for piece in BOUNDARY_RE.split(protected))
+    return [piece for piece in pieces if piece]
@@ -0,0 +1,106 @@
+import os
+import re
+import json
+import heapq
+import hashlib
+import argparse
+from kb_writer import KnowledgeBaseWriter
+
+def parse_shard(text):
+    """`"i/N"` (0 <= i < N) as a (i, N) tuple; raises argparse.ArgumentTypeError otherwise."""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", text)
+    if not match or not int(match.group(1)) < int(match.group(2)):
+        raise argparse.ArgumentTypeError(f"expected i/N with 0 <= i < N, got {text!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def add_shard_arguments(parser):
+    """The --shard i/N and --merge N options shared by the extractors."""
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--shard", type=parse_shard, metavar="i/N",
+                      help="process only the crawl folders of shard i (0-based) of N")
+    mode.add_argument("--merge", type=int, metavar="N",
+                      help="combine the N shard outputs under OUTPUT_DIR into the final reports")
+    return parser
+
+
+def shard_of(name, count):
+    """Stable shard of a folder name: the same on every node, run and Python version."""
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def in_shard(name, shard):
+    """True if folder `name` belongs to `shard` ((i, N), or None for everything)."""
+    return shard is None or shard_of(name, shard[1]) == shard[0]
+
+
+def shard_dir(output_dir, shard):
+    index, count = shard
+    return os.path.join(output_dir, f"shard-{index}-of-{count}")
+
+
+def shard_dirs(output_dir, count):
+    """The N shard directories under `output_dir`; raises if any is missing."""
+    if count < 1:
+        raise ValueError(f"shard count must be at least 1, got {count}")
+    dirs = [shard_dir(output_dir, (i, count)) for i in range(count)]
+    missing = [d for d in dirs if not os.path.isdir(d)]
+    if missing:
+        raise FileNotFoundError(f"{len(missing)} of {count} shards missing: {', '.join(missing)}")
+    return dirs
+
+
+def walk_order_key(relpath):
+    """
+    Sort key reproducing the order os.walk (with sorted dirs and files)
+    visits `relpath`: a directory's files come before its subdirectories.
+    """
+    parts = relpath.replace(os.sep, "/").split("/")
+    return [(1, d) for d in parts[:-1]] + [(0, parts[-1])]
+
+
+def _records(jsonl_path, shard=0):
+    """(source, shard, category, entry) of a shard's JSONL, in file order."""
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                entry = record["entry"]
+                yield record.get("source", entry.get("source_file", "")), shard, record["category"], entry
+
+
+def merge_jsonl(jsonl_paths, out_path, order_key):
+    """
+    k-way merge of shard JSONL files (each already in source order) into
+    one JSONL in the order a single run over all folders writes, by
+    `order_key(source)`; ties keep shard order. A source found in more
+    than one shard (e.g. left over from a different N) is taken from the
+    first only; its copies are adjacent in the merge, so no set of seen
+    sources is kept. Returns (entries written, duplicates dropped).
+    """
+    streams = [_records(path, shard) for shard, path in enumerate(jsonl_paths)]
+    merged = heapq.merge(*streams, key=lambda record: order_key(record[0]))
+    duplicates = 0
+    last_source, last_shard = None, None
+    with KnowledgeBaseWriter(out_path) as writer:
+        for source, shard, category, entry in merged:
+            if source == last_source and shard != last_shard:
+                duplicates += 1
+                continue
+            last_source, last_shard = source, shard
+            writer.add(category, entry, source=source)
+    return writer.count, duplicates
+
+
+def iter_sources(jsonl_path):
+    """(source, [[category, entry], ...]) for each run of one source in a merged JSONL."""
+    source, entries = None, []
+    for record_source, _, category, entry in _records(jsonl_path):
+        if entries and record_source != source:
+            yield source, entries
+            entries = []
+        source = record_source
+        entries.append([category, entry])
+    if entries:
+        yield source, entries
@@ -0,0 +1,62 @@
+import re
+import pandas as pd
+from sentences import PROTECT, ABBREV_RE, BOUNDARY_RE
+
+COLUMNS = ["Year", "Event", "GenAI_Prompt"]
+YEAR_PATTERN = r"\b(18\d{2}|19\d{2}|20\d{2})\b"
+PROMPT_PREFIX = "Historical cinematic shot from "
+PROMPT_CHARS = 100
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def keyword_pattern(keywords):
+    """One case-insensitive alternation matching any keyword as a substring."""
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered), re.IGNORECASE)
+
+
+def sentence_series(texts):
+    """
+    sentences.split_sentences over every text of `texts` at once, as a
+    Series (index = position of the source text), with the same
+    abbreviation-aware boundary rules applied as vectorized string
+    operations. Whitespace is collapsed and a sentence's final period is
+    dropped, as the timeline's Event text expects.
+    """
+    texts = pd.Series(list(texts), dtype="object")
+    if texts.empty:
+        return pd.Series([], dtype="object")
+
+    protected = (texts.fillna("")
+                 .str.replace(_WHITESPACE_RE, " ", regex=True)
+                 .str.replace(ABBREV_RE, r"\1" + PROTECT, regex=True))
+    sentences = protected.str.split(BOUNDARY_RE, regex=True).explode()
+    sentences = (sentences.str.replace(PROTECT, ".", regex=False)
+                 .str.strip()
+                 .str.replace(r"\.$", "", regex=True))
+    return sentences[sentences.str.len() > 0]
+
+
+def events_frame(texts, keywords):
+    """
+    Year/Event/GenAI_Prompt frame of every sentence in `texts` that names
+    a year (1800–2099) and contains at least one of `keywords`. The first
+    year of a sentence is its timestamp. All matching runs as vectorized
+    string operations over the whole batch of sentences.
+    """
+    sentences = sentence_series(texts)
+    if sentences.empty:
+        return pd.DataFrame(columns=COLUMNS)
+
+    # Keyword filter first: it is the cheaper test and drops most sentences
+    sentences = sentences[sentences.str.contains(keyword_pattern(keywords), regex=True)]
+    years = sentences.str.extract(YEAR_PATTERN, expand=False)
+    found = years.notna()
+    sentences, years = sentences[found], years[found]
+
+    return pd.DataFrame({
+        "Year": years.astype(int).to_numpy(),
+        "Event": sentences.to_numpy(),
+        "GenAI_Prompt": (PROMPT_PREFIX + years + ", " + sentences.str[:PROMPT_CHARS] + "...").to_numpy()
+    }, columns=COLUMNS)
@@ -0,0 +1,125 @@
+import os
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from timeline_events import COLUMNS
+
+SCHEMA = pa.schema([
+    ("Year", pa.int32()),
+    ("Event", pa.string()),
+    ("GenAI_Prompt", pa.string()),
+    ("event_hash", pa.uint64()),
+])
+PART_FILE = "part-0.parquet"
+
+
+def event_hashes(events):
+    """Stable 64-bit hash of each event text (the same on every run and machine)."""
+    return pd.util.hash_pandas_object(events.reset_index(drop=True), index=False).to_numpy()
+
+
+class TimelineWriter:
+    """
+    Streams timeline rows into a Parquet dataset partitioned by decade:
+    `<dataset>/decade=1920/part-0.parquet`, one row group per write().
+
+    Rows whose event text was already written (by 64-bit hash) are dropped
+    as they arrive, so no frame ever has to hold the whole timeline. The
+    dataset is built next to its final location and only replaces the
+    previous one on close().
+    """
+
+    def __init__(self, dataset_dir):
+        self.dataset_dir = dataset_dir
+        self.rows = 0
+        self.duplicates = 0
+        self._tmp_dir = f"{dataset_dir}.tmp"
+        self._writers = {}
+        self._seen = set()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+        os.makedirs(self._tmp_dir)
+
+    def write(self, frame):
+        """Appends one batch (Year/Event/GenAI_Prompt); returns how many rows were new."""
+        if frame.empty:
+            return 0
+
+        hashes = event_hashes(frame["Event"])
+        fresh = [h not in self._seen for h in hashes.tolist()]
+        frame = frame.assign(event_hash=hashes)[fresh]
+        # Repeats inside the batch itself; the first occurrence wins, as drop_duplicates did
+        frame = frame[~frame["event_hash"].duplicated()]
+        self.duplicates += len(fresh) - len(frame)
+        self._seen.update(frame["event_hash"].tolist())
+
+        # Sorted per row group, so a decade reads back nearly in order
+        frame = frame.sort_values(by="Year", kind="stable")
+        for decade, rows in frame.groupby(frame["Year"] // 10 * 10, sort=True):
+            table = pa.Table.from_pandas(rows, schema=SCHEMA, preserve_index=False)
+            self._writer(int(decade)).write_table(table)
+
+        self.rows += len(frame)
+        return len(frame)
+
+    def _writer(self, decade):
+        if decade not in self._writers:
+            folder = os.path.join(self._tmp_dir, f"decade={decade}")
+            os.makedirs(folder, exist_ok=True)
+            self._writers[decade] = pq.ParquetWriter(os.path.join(folder, PART_FILE), SCHEMA)
+        return self._writers[decade]
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        shutil.rmtree(self.dataset_dir, ignore_errors=True)
+        os.replace(self._tmp_dir, self.dataset_dir)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # The previous dataset stays; the unfinished one is dropped
+            for writer in self._writers.values():
+                writer.close()
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+
+def decades(dataset_dir):
+    """The dataset's decade partitions, oldest first."""
+    found = []
+    for name in os.listdir(dataset_dir):
+        if name.startswith("decade=") and os.path.isdir(os.path.join(dataset_dir, name)):
+            found.append(int(name.split("=", 1)[1]))
+    return sorted(found)
+
+
+def read_decade(dataset_dir, decade, columns=COLUMNS):
+    """One decade of the timeline as a DataFrame, in chronological order."""
+    table = pq.read_table(os.path.join(dataset_dir, f"decade={decade}", PART_FILE), columns=list(columns))
+    return table.to_pandas().sort_values(by="Year", kind="stable").reset_index(drop=True)
+
+
+def iter_chronological(dataset_dir, columns=COLUMNS):
+    """
+    Yields the timeline decade by decade, oldest first. Only one decade is
+    ever in memory; within it, rows of a year keep their document order.
+    """
+    for decade in decades(dataset_dir):
+        yield read_decade(dataset_dir, decade, columns)
+
+
+def export_csv(dataset_dir, csv_path):
+    """Writes the timeline as one chronological CSV, a decade at a time; returns the row count."""
+    tmp_path = f"{csv_path}.tmp"
+    rows = 0
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        pd.DataFrame(columns=COLUMNS).to_csv(f, index=False)
+        for frame in iter_chronological(dataset_dir):
+            frame.to_csv(f, index=False, header=False)
+            rows += len(frame)
+    os.replace(tmp_path, csv_path)
+    return rows
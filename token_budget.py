@@ -0,0 +1,45 @@
+import re
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text):
+    """
+    Local estimate of how many tokens `text` costs, without a tokenizer
+    download: every punctuation mark is one token and words cost one token
+    per ~5 characters, which tracks Llama/GPT BPE counts closely on English.
+    """
+    return sum(1 + (len(piece) - 1) // 5 for piece in _PIECE_RE.findall(text))
+
+
+def make_windows(token_counts, budget, overlap=1):
+    """
+    Splits items (with the given token counts) into windows of consecutive
+    indices whose totals stay under `budget`. Each window after the first
+    repeats the last `overlap` items of the previous one for context. An item
+    that alone exceeds the budget gets a window of its own.
+
+    Returns a list of (start, end) index ranges, end exclusive.
+    """
+    n = len(token_counts)
+
+    def fill(start):
+        end, total = start, 0
+        while end < n and (end == start or total + token_counts[end] <= budget):
+            total += token_counts[end]
+            end += 1
+        return end
+
+    windows = []
+    covered = 0   # Items [0, covered) have been placed in a window
+    while covered < n:
+        start = max(covered - overlap, 0) if windows else 0
+        end = fill(start)
+        if end <= covered:
+            # The overlap alone filled the budget; start fresh without it
+            start = covered
+            end = fill(start)
+        windows.append((start, end))
+        covered = end
+
+    return windows
@@ -0,0 +1,206 @@
+import os
+import sys
+import json
+import time
+import atexit
+import multiprocessing
+import threading
+
+# --- CONFIGURATION ---
+# Set ISM_TRACE to a directory to record spans; unset, every span is a shared no-op.
+TRACE_DIR = os.environ.get("ISM_TRACE")
+SUMMARY_TOP = 15                  # Rows in the end-of-run table of top time consumers
+
+_TRACER = None
+
+
+class _NoopSpan:
+    """What span() returns while tracing is off: nothing is timed or stored."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """One timed region; attributes can be added while it is open with set()."""
+
+    __slots__ = ("tracer", "name", "attrs", "start")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer.add(self.name, self.start, end - self.start, self.attrs)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """
+    In-memory span store for one process.
+
+    Spans are kept as plain tuples (name, start ns, duration ns, thread,
+    attrs) and only turned into JSON when exported, so an open span costs
+    two clock reads and one list append.
+    """
+
+    def __init__(self, process_name):
+        self.process_name = process_name
+        self.pid = os.getpid()
+        self.origin = time.perf_counter_ns()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, name, start, duration, attrs, thread=None):
+        record = (name, start, duration, thread or threading.current_thread().name, attrs)
+        with self._lock:
+            self.spans.append(record)
+
+    def export_jsonl(self, path):
+        """One JSON object per span, times in milliseconds from the start of the run."""
+        with open(path, "w", encoding="utf-8") as f:
+            for name, start, duration, thread, attrs in self.spans:
+                f.write(json.dumps({
+                    "name": name,
+                    "start_ms": round((start - self.origin) / 1e6, 3),
+                    "duration_ms": round(duration / 1e6, 3),
+                    "thread": thread,
+                    **attrs
+                }, ensure_ascii=False, default=str) + "\n")
+
+    def export_chrome(self, path):
+        """Chrome trace_event JSON (complete "X" events), for chrome://tracing or Perfetto."""
+        threads = {}
+        events = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                   "args": {"name": self.process_name}}]
+        for name, start, duration, thread, attrs in self.spans:
+            if thread not in threads:
+                threads[thread] = len(threads) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": threads[thread],
+                               "args": {"name": thread}})
+            events.append({
+                "name": name,
+                "cat": name.split(".")[0],
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": duration / 1000,
+                "pid": self.pid,
+                "tid": threads[thread],
+                "args": attrs
+            })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
+
+    def summary(self, top=SUMMARY_TOP):
+        """Table of the span names that took the most total time, plus LLM token/retry totals."""
+        wall = (time.perf_counter_ns() - self.origin) / 1e9
+        stats = {}
+        for name, _, duration, _, attrs in self.spans:
+            s = stats.setdefault(name, {"count": 0, "total": 0, "max": 0, "errors": 0,
+                                        "prompt_tokens": 0, "completion_tokens": 0, "retries": 0})
+            s["count"] += 1
+            s["total"] += duration
+            s["max"] = max(s["max"], duration)
+            s["errors"] += bool(attrs.get("error")) or (attrs.get("status") or 0) >= 400
+            s["prompt_tokens"] += attrs.get("prompt_tokens") or 0
+            s["completion_tokens"] += attrs.get("completion_tokens") or 0
+            s["retries"] += attrs.get("retries") or 0
+
+        lines = [f"⏱ Trace summary ({len(self.spans)} spans, {wall:.1f}s wall; "
+                 f"span time overlaps across threads)",
+                 f"{'span':<24} {'count':>7} {'total s':>9} {'mean ms':>9} {'max ms':>9} {'errors':>6}"]
+        ranked = sorted(stats.items(), key=lambda item: item[1]["total"], reverse=True)
+        for name, s in ranked[:top]:
+            lines.append(f"{name:<24} {s['count']:>7} {s['total'] / 1e9:>9.2f} "
+                         f"{s['total'] / s['count'] / 1e6:>9.1f} {s['max'] / 1e6:>9.1f} {s['errors']:>6}")
+
+        for name, s in ranked:
+            if s["prompt_tokens"] or s["completion_tokens"] or s["retries"]:
+                lines.append(f"{name}: {s['prompt_tokens']} prompt + {s['completion_tokens']} completion tokens, "
+                             f"{s['retries']} retries")
+        return "\n".join(lines)
+
+
+def enable(trace_dir, process_name=None):
+    """Starts recording spans; they are written to `trace_dir` by finish()."""
+    global _TRACER, TRACE_DIR
+    TRACE_DIR = trace_dir
+    _TRACER = Tracer(process_name or os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0])
+    return _TRACER
+
+
+def span(name, **attrs):
+    """
+    Context manager timing the enclosed block as a span called `name`
+    (dotted, e.g. "llm.request"; the first part is the Chrome category).
+    Yields an object whose set(**attrs) adds attributes before it closes.
+    """
+    if _TRACER is None:
+        return _NOOP
+    return Span(_TRACER, name, attrs)
+
+
+def add_span(name, seconds, thread=None, **attrs):
+    """Records a span that has just ended after `seconds`, e.g. work timed in another process."""
+    if _TRACER is None:
+        return
+    duration = int(seconds * 1e9)
+    _TRACER.add(name, time.perf_counter_ns() - duration, duration, attrs, thread)
+
+
+def http_retries(response):
+    """Retries urllib3 made for a `requests` response (0 when no Retry policy is mounted)."""
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    return len(retries.history) if retries is not None else 0
+
+
+def finish():
+    """
+    Writes <process>-<pid>.jsonl and <process>-<pid>.trace.json under the
+    trace directory and prints the summary table. Safe to call more than
+    once; a no-op while tracing is off.
+    """
+    global _TRACER
+    tracer = _TRACER
+    if tracer is None:
+        return None
+    _TRACER = None
+
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    base = os.path.join(TRACE_DIR, f"{tracer.process_name.replace(' ', '_')}-{tracer.pid}")
+    tracer.export_jsonl(f"{base}.jsonl")
+    tracer.export_chrome(f"{base}.trace.json")
+
+    print(tracer.summary())
+    print(f"Trace written to {base}.jsonl and {base}.trace.json")
+    return base
+
+
+# Parser worker processes re-import this module under "spawn"; only the main process traces
+if TRACE_DIR and multiprocessing.parent_process() is None:
+    enable(TRACE_DIR)
+    # Runs that crash or never reach finish() still leave their trace behind
+    atexit.register(finish)